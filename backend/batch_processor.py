@@ -0,0 +1,323 @@
+import os
+import glob
+import json
+import time
+import logging
+import importlib.util
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from backend.data_handler import DataHandler
+from backend.partial_summary import PartialSummary
+from backend.plotter import Plotter
+
+class BatchProcessor:
+    OUTPUT_FORMATS = ("json", "parquet")
+    CHART_TOP_N = 20
+    PARTIAL_SUMMARY_FILE = "partial_summary.json.gz"
+
+    @staticmethod
+    def resolve_folders(patterns):
+        """
+        Expand folder paths and glob patterns into a sorted list of folders.
+
+        Args:
+            patterns (list): Folder paths or glob patterns (e.g. "archive/*")
+
+        Returns:
+            list: Unique folder paths, in sorted order
+        """
+        folders = set()
+        for pattern in patterns:
+            matches = glob.glob(pattern) if glob.has_magic(pattern) else [pattern]
+            if not matches:
+                logging.warning("No folders matched pattern: %s", pattern)
+            for match in matches:
+                if os.path.isdir(match):
+                    folders.add(os.path.normpath(match))
+                else:
+                    logging.warning("Skipping non-folder path: %s", match)
+        return sorted(folders)
+
+    @staticmethod
+    def process_folder(folder_path, deduplicate=True):
+        """
+        Process a single vehicle folder. Runs inside a worker process.
+
+        Args:
+            folder_path (str): Path to the folder containing CSV files
+            deduplicate (bool): Skip duplicate files and drop overlapping rows
+
+        Returns:
+            dict: Folder summaries along with timing and size information
+        """
+        start = time.perf_counter()
+        result = {
+            "folder": folder_path,
+            "status": "ok",
+            "error": None,
+            "bytes": 0,
+            "ecl_rows": 0,
+            "ecf_rows": 0,
+            "dmp_rows": 0,
+            "seconds": 0.0,
+            "ecl_freq_summary": pd.DataFrame(),
+            "dmp_freq_summary": pd.DataFrame(),
+            "partial_summary": None,
+        }
+        try:
+            dh = DataHandler(folder_path, show_progress=False, deduplicate=deduplicate, drop_overlaps=deduplicate)
+            # Bytes parsed (uncompressed size for archive members)
+            result["bytes"] = sum(f["bytes"] for f in dh.stats.files)
+            result["ecl_rows"] = len(dh.ecl)
+            result["ecf_rows"] = len(dh.ecf)
+            result["dmp_rows"] = len(dh.dmp)
+            result["ecl_freq_summary"] = dh.ecl_freq_summary
+            result["dmp_freq_summary"] = BatchProcessor.dmp_summary_to_frame(dh.dmp_freq_summary)
+            # Serialized so only a few KB cross the process boundary
+            result["partial_summary"] = dh.partial_summary().to_bytes()
+        except Exception as e:
+            logging.error("Error processing folder %s: %s", folder_path, e)
+            result["status"] = "failed"
+            result["error"] = str(e)
+        result["seconds"] = time.perf_counter() - start
+        return result
+
+    @staticmethod
+    def dmp_summary_to_frame(dmp_freq_summary):
+        """
+        Convert the DMP FILL/VENT totals series into a two column dataframe.
+
+        Args:
+            dmp_freq_summary (pd.Series): Totals indexed by column name
+
+        Returns:
+            pd.DataFrame: Dataframe with 'Column' and 'Frequency' columns
+        """
+        if dmp_freq_summary is None or dmp_freq_summary.empty:
+            return pd.DataFrame(columns=["Column", "Frequency"])
+        return pd.DataFrame({
+            "Column": dmp_freq_summary.index.astype(str),
+            "Frequency": dmp_freq_summary.values.astype("int64"),
+        })
+
+    @staticmethod
+    def write_fleet_summaries(fleet, output_dir, output_format):
+        """
+        Write the fleet summaries of a merged PartialSummary.
+
+        Args:
+            fleet (PartialSummary): Summary merged over all folders
+            output_dir (str): Destination directory
+            output_format (str): 'json' or 'parquet'
+
+        Returns:
+            tuple: (fleet ECL frequency, fleet DMP totals) dataframes, for charts
+        """
+        fleet_ecl = fleet.ecl_frequency().sort_values(
+            by=["Frequency", "Description"], ascending=[False, True], ignore_index=True
+        )
+        fleet_dmp = BatchProcessor.dmp_summary_to_frame(fleet.dmp_frequency()).sort_values(
+            by=["Frequency", "Column"], ascending=[False, True], ignore_index=True
+        )
+        BatchProcessor.write_frame(fleet_ecl, os.path.join(output_dir, "fleet_ecl_frequency"), output_format)
+        BatchProcessor.write_frame(fleet_dmp, os.path.join(output_dir, "fleet_dmp_frequency"), output_format)
+        BatchProcessor.write_frame(fleet.ecf_frequency(), os.path.join(output_dir, "fleet_ecf_frequency"), output_format)
+        BatchProcessor.write_frame(fleet.activation_summary(), os.path.join(output_dir, "fleet_valve_activations"), output_format)
+        BatchProcessor.write_frame(fleet.channel_statistics(), os.path.join(output_dir, "fleet_channel_statistics"), output_format)
+        fleet.save(os.path.join(output_dir, f"fleet_{BatchProcessor.PARTIAL_SUMMARY_FILE}"))
+        return fleet_ecl, fleet_dmp
+
+    @staticmethod
+    def merge_partials(paths, output_dir, output_format="json"):
+        """
+        Merge saved partial summaries (e.g. from earlier runs or other
+        machines) into fleet summaries without reading any log files.
+
+        Args:
+            paths (list): Partial summary files, or directories searched
+                recursively for them
+            output_dir (str): Directory receiving the fleet outputs
+            output_format (str): 'json' or 'parquet'
+
+        Returns:
+            dict: Number of summaries merged and the fleet row counts
+
+        Raises:
+            ValueError: If the output format is not supported
+        """
+        if output_format not in BatchProcessor.OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output format: {output_format}")
+        files = []
+        for path in paths:
+            if os.path.isdir(path):
+                files += sorted(glob.glob(os.path.join(path, "**", BatchProcessor.PARTIAL_SUMMARY_FILE), recursive=True))
+            else:
+                files.append(path)
+        partials = [PartialSummary.load(path) for path in files]
+        fleet = PartialSummary.combine(partials)
+        os.makedirs(output_dir, exist_ok=True)
+        BatchProcessor.write_fleet_summaries(fleet, output_dir, output_format)
+        return {
+            "merged": sum(partial is not None for partial in partials),
+            "failed": sum(partial is None for partial in partials),
+            "parts": fleet.parts,
+            "rows": fleet.rows,
+        }
+
+    @staticmethod
+    def write_frame(df, path_without_ext, output_format):
+        """
+        Write a dataframe as JSON records or Parquet.
+
+        Args:
+            df (pd.DataFrame): Dataframe to write
+            path_without_ext (str): Destination path without extension
+            output_format (str): 'json' or 'parquet'
+
+        Returns:
+            str: Path of the written file
+        """
+        path = f"{path_without_ext}.{output_format}"
+        if output_format == "parquet":
+            df.to_parquet(path, index=False)
+        else:
+            df.to_json(path, orient="records", indent=2)
+        return path
+
+    @staticmethod
+    def chart_jobs(name_prefix, ecl_summary, dmp_summary, title_suffix):
+        """
+        Build Plotter chart jobs for one folder (or the fleet).
+
+        Args:
+            name_prefix (str): Output file prefix, relative to the output directory
+            ecl_summary (pd.DataFrame): ECL frequency summary
+            dmp_summary (pd.DataFrame): DMP totals with 'Column' and 'Frequency'
+            title_suffix (str): Appended to chart titles
+
+        Returns:
+            list: Chart job dicts for Plotter.render_batch
+        """
+        jobs = []
+        if not ecl_summary.empty:
+            top = ecl_summary.nlargest(BatchProcessor.CHART_TOP_N, "Frequency")
+            jobs.append({
+                "kind": "bar",
+                "name": f"{name_prefix}ecl_frequency",
+                "labels": top["Description"].tolist(),
+                "values": top["Frequency"].tolist(),
+                "title": f"ECL Frequency - {title_suffix}",
+            })
+        if not dmp_summary.empty:
+            jobs.append({
+                "kind": "pie",
+                "name": f"{name_prefix}dmp_frequency",
+                "labels": dmp_summary["Column"].tolist(),
+                "values": dmp_summary["Frequency"].tolist(),
+                "title": f"DMP FILL/VENT Totals - {title_suffix}",
+            })
+        return jobs
+
+    @staticmethod
+    def run(folders, output_dir, output_format="json", max_workers=None, on_result=None, chart_format=None,
+            deduplicate=True):
+        """
+        Process many vehicle folders across a worker pool and write summaries.
+
+        Args:
+            folders (list): Folder paths to process
+            output_dir (str): Directory receiving per-folder and fleet outputs
+            output_format (str): 'json' or 'parquet'
+            max_workers (int): Worker process count (defaults to CPU count)
+            on_result (callable): Called with each folder result as it finishes
+            chart_format (str): 'png' or 'svg' to also render charts, None to skip
+            deduplicate (bool): Skip duplicate files and drop overlapping rows per folder
+
+        Returns:
+            dict: Fleet report with per-folder timing and overall throughput
+
+        Raises:
+            ValueError: If the output or chart format is not supported
+            ImportError: If Parquet output is requested without pyarrow
+        """
+        if output_format not in BatchProcessor.OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output format: {output_format}")
+        if chart_format is not None and chart_format not in Plotter.IMAGE_FORMATS:
+            raise ValueError(f"Unsupported chart format: {chart_format}")
+        if output_format == "parquet" and importlib.util.find_spec("pyarrow") is None:
+            raise ImportError("Parquet output requires the 'pyarrow' package")
+
+        os.makedirs(output_dir, exist_ok=True)
+        start = time.perf_counter()
+        results = []
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(BatchProcessor.process_folder, folder, deduplicate) for folder in folders]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                if on_result is not None:
+                    on_result(result)
+
+        results.sort(key=lambda r: r["folder"])
+        wall_seconds = time.perf_counter() - start
+
+        # Per-folder outputs, named after the folder (suffixed on collisions)
+        used_names = set()
+        folder_reports = []
+        chart_jobs = []
+        for result in results:
+            name = os.path.basename(result["folder"]) or "root"
+            base_name, suffix = name, 1
+            while name in used_names:
+                suffix += 1
+                name = f"{base_name}_{suffix}"
+            used_names.add(name)
+
+            folder_dir = os.path.join(output_dir, name)
+            os.makedirs(folder_dir, exist_ok=True)
+            if result["status"] == "ok":
+                BatchProcessor.write_frame(result["ecl_freq_summary"], os.path.join(folder_dir, "ecl_frequency"), output_format)
+                BatchProcessor.write_frame(result["dmp_freq_summary"], os.path.join(folder_dir, "dmp_frequency"), output_format)
+                with open(os.path.join(folder_dir, BatchProcessor.PARTIAL_SUMMARY_FILE), "wb") as f:
+                    f.write(result["partial_summary"])
+                chart_jobs += BatchProcessor.chart_jobs(f"{name}/", result["ecl_freq_summary"], result["dmp_freq_summary"], name)
+
+            report = {k: v for k, v in result.items() if not k.endswith("_summary")}
+            report["output_dir"] = folder_dir
+            report["mb_per_second"] = (result["bytes"] / 1e6) / result["seconds"] if result["seconds"] > 0 else 0.0
+            with open(os.path.join(folder_dir, "summary.json"), "w") as f:
+                json.dump(report, f, indent=2)
+            folder_reports.append(report)
+
+        # Fleet-level outputs, merged from the per-folder partial summaries
+        ok_results = [r for r in results if r["status"] == "ok"]
+        fleet = PartialSummary.combine(PartialSummary.from_bytes(r["partial_summary"]) for r in ok_results)
+        fleet_ecl, fleet_dmp = BatchProcessor.write_fleet_summaries(fleet, output_dir, output_format)
+
+        chart_seconds = 0.0
+        if chart_format is not None:
+            chart_jobs += BatchProcessor.chart_jobs("fleet_", fleet_ecl, fleet_dmp, "Fleet")
+            chart_start = time.perf_counter()
+            Plotter.render_batch(chart_jobs, output_dir, chart_format, max_workers)
+            chart_seconds = time.perf_counter() - chart_start
+
+        total_bytes = sum(r["bytes"] for r in results)
+        fleet_report = {
+            "folders": len(results),
+            "succeeded": len(ok_results),
+            "failed": len(results) - len(ok_results),
+            "total_bytes": total_bytes,
+            "total_ecl_rows": sum(r["ecl_rows"] for r in results),
+            "total_dmp_rows": sum(r["dmp_rows"] for r in results),
+            "wall_seconds": wall_seconds,
+            "folders_per_second": len(results) / wall_seconds if wall_seconds > 0 else 0.0,
+            "mb_per_second": (total_bytes / 1e6) / wall_seconds if wall_seconds > 0 else 0.0,
+            "charts_rendered": len(chart_jobs) if chart_format is not None else 0,
+            "chart_seconds": chart_seconds,
+            "per_folder": folder_reports,
+        }
+        with open(os.path.join(output_dir, "fleet_report.json"), "w") as f:
+            json.dump(fleet_report, f, indent=2)
+
+        return fleet_report
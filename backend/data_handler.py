@@ -1,136 +1,341 @@
+import os
 import glob
+import time
 import pandas as pd
 import logging
-from tqdm import tqdm
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from backend.utils.logging_config import configure_logging
 from backend.utils.folder_validator import FolderValidator
 from backend.utils.file_classifier import FileClassifier
 from backend.utils.file_types import FileClasses
+from backend.utils.file_source import FileSource
+from backend.utils.archive_reader import ArchiveReader, ArchiveMember
+from backend.utils.overlap_filter import OverlapFilter
+from backend.utils.parquet_dataset import ParquetDataset
+from backend.utils.ingestion_stats import IngestionStats
+from backend.utils.exceptions import IngestionCancelled
 from backend.data_processors.ecl_processor import ECLProcessor
-from backend.data_processors.ecf_processor import ECFProcessor
 from backend.data_processors.dmp_processor import DMPProcessor
+from backend.data_processors.diagnostic_decoder import DiagnosticDecoder
+from backend.data_processors.dmp_stitcher import DMPStitcher
 
 class DataHandler:
-    def __init__(self, folder_path):
+    DEFAULT_MAX_WORKERS = 4
+    # Column naming the file (relative to the folder) each row was read from
+    SOURCE_COLUMN = "Source File"
+
+    def __init__(self, folder_path=None, show_progress=True, profile=False, trace_memory=False, files=None,
+                 max_workers=None, deduplicate=True, drop_overlaps=True, progress_callback=None, cancel_event=None):
         """
         Initialize DataHandler with robust folder path validation.
         
         Args:
             folder_path (str): Path to the folder containing CSV files
+            show_progress (bool): Show a console progress bar while reading files
+            profile (bool): Capture a cProfile report of ingestion in self.stats;
+                files are then read on the calling thread, where the profiler runs
+            trace_memory (bool): Capture peak memory with tracemalloc in self.stats
+            files (list): In-memory file-like objects (e.g. uploaded files) to read
+                instead of a folder; their `name` attribute is used in logs and stats
+            max_workers (int): Threads decompressing and parsing files in parallel
+                (defaults to min(DEFAULT_MAX_WORKERS, CPU count))
+            deduplicate (bool): Skip files whose content repeats an earlier file
+            drop_overlaps (bool): Drop ECL events and DMP samples already read
+                from another file (e.g. overlapping exports of the same unit)
+            progress_callback (callable): Called with a dict after each file is
+                merged: 'file', 'type', 'status', 'bytes', 'rows', 'seconds',
+                'done', 'total' and the file's merged 'ecl', 'ecf' and 'dmp' rows
+            cancel_event (threading.Event): Stops reading further files once set;
+                the handler is then left empty with `cancelled` set
         
         Raises:
             FileNotFoundError: If the folder does not exist
             PermissionError: If there are permission issues accessing the folder
+            ValueError: If neither folder_path nor files is given
         """
         configure_logging()
         try:
-            # Validate folder path
-            FolderValidator.validate_folder(folder_path)
+            if files is None:
+                if folder_path is None:
+                    raise ValueError("Either folder_path or files must be given")
+                # Validate folder path
+                FolderValidator.validate_folder(folder_path)
             
             self.__folder_path = folder_path
+            self.__show_progress = show_progress
+            self.__profile = profile
+            self.__trace_memory = trace_memory
+            self.__max_workers = max_workers or min(self.DEFAULT_MAX_WORKERS, os.cpu_count() or 1)
+            self.__deduplicate = deduplicate
+            self.__drop_overlaps = drop_overlaps
+            self.__progress_callback = progress_callback
+            self.__cancel_event = cancel_event
+            self.cancelled = False
+            self.stats = IngestionStats(profile, trace_memory)
+            self.__query_cache = OrderedDict()
+            self.__query_lock = threading.Lock()
+            self.__dmp_filter = None
             self.ecl = pd.DataFrame()
             self.ecf = pd.DataFrame()
             self.dmp = pd.DataFrame()
             self.ecl_freq_summary = pd.DataFrame()
             self.filtered_dmp = pd.DataFrame()
             self.dmp_freq_summary = pd.Series()
+            self.valve_activations = pd.DataFrame()
+            self.valve_activation_summary = pd.DataFrame()
+            self.dmp_timeline = pd.DataFrame()
+            self.dmp_segments = pd.DataFrame()
+            self.dmp_transitions = pd.DataFrame()
+            self.diagnostic_flags = pd.DataFrame()
+            self.diagnostic_freq_summary = pd.Series(dtype="int64")
             
-            # Set csv folder
-            self.set_folder(folder_path)
+            # Set csv folder (or in-memory files)
+            if files is None:
+                self.set_folder(folder_path)
+            else:
+                self.set_files(files)
             
-        except (FileNotFoundError, PermissionError, NotADirectoryError) as e:
-            logging.error(f"Initialization error: {e}")
+        except (FileNotFoundError, PermissionError, NotADirectoryError, ValueError) as e:
+            logging.error("Initialization error: %s", e)
             raise
 
     def __read_csv_from_folder(self, folder_path):
         """
         Read and merge CSV files from folder with comprehensive error handling.
         
+        Compressed CSVs (.csv.gz, .csv.xz, .csv.zst) and .zip/.tar archives in
+        the folder are streamed through ArchiveReader without extracting them.
+        
         Args:
             folder_path (str): Path to the folder containing CSV files
         
         Returns:
             tuple: Merged ECL, ECF, and DMP dataframes
         """
-        merged_df_ecl = pd.DataFrame()
-        merged_df_ecf = pd.DataFrame()
-        merged_dmp = pd.DataFrame()
         try:
-            csv_files = glob.glob(f"{folder_path}/*.csv")
-            logging.info(f'CSV Files found: {csv_files}')
-
-            if len(csv_files) == 0 or csv_files == None:
-                logging.warning(f"No CSV files found in folder: {folder_path}")
-                return merged_df_ecl, merged_df_ecf, merged_dmp
-
-            for csv_file_path in tqdm(csv_files, desc="Reading Files"):
-                try:
-                    file_type = FileClassifier.get_file_class(csv_file_path)
-                    
-                    if file_type == FileClasses.ECL_ECF:
-                        df_ecl, df_ecf = self.__read_ecl_ecf_file(csv_file_path)
-                        
-                        if not df_ecl.empty:
-                            merged_df_ecl = pd.concat([merged_df_ecl, df_ecl])
-                        if not df_ecf.empty:
-                            merged_df_ecf = pd.concat([merged_df_ecf, df_ecf])
-                    
-                    elif file_type == FileClasses.DMP_LOG:
-                        df_dmp = DMPProcessor.read_dmp(csv_file_path)
-                        
-                        if not df_dmp.empty:
-                            merged_dmp = pd.concat([merged_dmp, df_dmp])
-                    
-                    else:
-                        logging.warning(f"Skipping unrecognized file: {csv_file_path}")
-
-                except Exception as file_error:
-                    logging.error(f"Error processing file {csv_file_path}: {file_error}")
-                    continue
+            with self.stats.span("discovery"):
+                csv_files = sorted(
+                    path for path in glob.glob(f"{folder_path}/*")
+                    if os.path.isfile(path) and ArchiveReader.is_supported(path)
+                )
+                csv_files = ArchiveReader.expand(csv_files)
+            logging.info("CSV files found in %s: %d", folder_path, len(csv_files))
+            logging.debug("CSV files: %s", [FileSource.name(f) for f in csv_files])
+        except Exception as e:
+            logging.error("Unexpected error reading CSV files: %s", e)
+            csv_files = []
 
-            # Reset indices
-            merged_df_ecf.reset_index(drop=True, inplace=True)
-            merged_df_ecl.reset_index(drop=True, inplace=True)
-            merged_dmp.reset_index(drop=True, inplace=True)
+        if len(csv_files) == 0 or csv_files == None:
+            logging.warning("No CSV files found in folder: %s", folder_path)
+            return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
 
-            return merged_df_ecl, merged_df_ecf, merged_dmp
+        return self.__read_csv_files(csv_files, folder_path)
 
-        except Exception as e:
-            logging.error(f"Unexpected error reading CSV files: {e}")
-            return merged_df_ecl, merged_df_ecf, merged_dmp
+    def __read_csv_file(self, csv_file):
+        """
+        Classify and parse one file (runs in a worker thread).
+        
+        Args:
+            csv_file (str | file-like): File path or buffer
+        
+        Returns:
+            dict: File name, type, size, frames, row count, timing, status and any error
+        """
+        file_start = time.perf_counter()
+        result = {
+            "file": FileSource.name(csv_file), "type": FileClasses.UNKNOWN, "bytes": 0,
+            "ecl": None, "ecf": None, "dmp": None, "rows": 0, "status": "skipped", "error": None,
+        }
+        try:
+            result["bytes"] = FileSource.size(csv_file)
+            with self.stats.span("classification"):
+                result["type"] = FileClassifier.get_file_class(csv_file)
+
+            if result["type"] == FileClasses.ECL_ECF:
+                result["ecl"], result["ecf"] = ECLProcessor.read_ecl_ecf(csv_file, self.stats)
+                result["rows"] = len(result["ecl"]) + len(result["ecf"])
+            elif result["type"] == FileClasses.DMP_LOG:
+                result["dmp"] = DMPProcessor.read_dmp(csv_file, self.stats)
+                result["rows"] = len(result["dmp"])
+
+            if result["type"] != FileClasses.UNKNOWN:
+                result["status"] = "ok"
+
+        except Exception as file_error:
+            result["error"] = file_error
+            result["status"] = "error"
+
+        finally:
+            if isinstance(csv_file, ArchiveMember):
+                # Release the decompression stream; the member can be reopened
+                csv_file.seek(0)
 
-    def __read_ecl_ecf_file(self, file_path):
+        result["seconds"] = time.perf_counter() - file_start
+        return result
+
+    def __drop_duplicate_files(self, csv_files, map_files):
         """
-        Read and format ECL and ECF from CSV with robust error handling.
+        Remove files whose content was already seen, keeping the first copy.
         
         Args:
-            file_path (str): Path to the CSV file
+            csv_files (list): File paths, buffers or archive member streams
+            map_files (callable): map-like function used to hash the files
+                (e.g. a thread pool's map)
         
         Returns:
-            tuple: Formatted ECL and ECF dataframes
+            list: Files with unique content, in input order
+        """
+        def digest(csv_file):
+            try:
+                return FileSource.digest(csv_file)
+            except Exception as e:
+                # Unreadable files are left for the parser to report
+                logging.debug("Could not hash %s: %s", FileSource.name(csv_file), e)
+                return None
+
+        with self.stats.span("deduplication"):
+            digests = list(map_files(digest, csv_files))
+
+        unique_files = []
+        first_seen = {}
+        for csv_file, file_digest in zip(csv_files, digests):
+            if file_digest is None or file_digest not in first_seen:
+                first_seen.setdefault(file_digest, FileSource.name(csv_file))
+                unique_files.append(csv_file)
+                continue
+            self.stats.record_file(
+                FileSource.name(csv_file), FileClasses.UNKNOWN.name, FileSource.size(csv_file), 0, 0.0, "duplicate"
+            )
+            logging.info("Skipping %s: same content as %s", FileSource.name(csv_file), first_seen[file_digest])
+        return unique_files
+
+    def __read_csv_files(self, csv_files, base_dir=None):
         """
+        Read and merge CSV files given as paths or in-memory buffers.
+        
+        Every row is tagged with its file in the SOURCE_COLUMN column.
+        
+        Args:
+            csv_files (list): File paths, file-like objects or archive member streams
+            base_dir (str): Folder the paths are relative to in SOURCE_COLUMN
+        
+        Returns:
+            tuple: Merged ECL, ECF, and DMP dataframes
+        """
+        merged_df_ecl = pd.DataFrame()
+        merged_df_ecf = pd.DataFrame()
+        merged_dmp = pd.DataFrame()
         try:
-            data = pd.read_csv(file_path, low_memory=False)
+            from tqdm import tqdm
+
+            # Per-file problems are counted and reported once after the loop
+            skipped_files = []
+            failed_files = []
+            error_counts = Counter()
 
-            if data.empty:
-                logging.warning(f"Empty dataframe from file: {file_path}")
-                return pd.DataFrame(), pd.DataFrame()
+            overlap_filter = OverlapFilter() if self.__drop_overlaps else None
 
-            ecf_indices = data[data.iloc[:, 0].str.contains("ERROR CODE FREQUENCY", na=False)].index
-            if len(ecf_indices) == 0:
-                logging.warning(f"No ECF section found in file: {file_path}")
-                return pd.DataFrame(), pd.DataFrame()
+            # Files (and archive members) are decompressed and parsed in worker
+            # threads; results arrive in input order and are merged here. cProfile
+            # only sees its own thread, so a profiled run parses on this one.
+            with ThreadPoolExecutor(max_workers=self.__max_workers) as executor:
+                map_files = map if self.__profile else executor.map
+                if self.__deduplicate:
+                    csv_files = self.__drop_duplicate_files(csv_files, map_files)
+                results = map_files(self.__read_csv_file, csv_files)
+                for done, result in enumerate(
+                    tqdm(results, total=len(csv_files), desc="Reading Files", disable=not self.__show_progress), 1
+                ):
+                    csv_file_path = result["file"]
+                    file_type = result["type"]
 
-            ecf_index = ecf_indices[0]
+                    if result["error"] is not None:
+                        failed_files.append(csv_file_path)
+                        # Count by the underlying parser error, not the wrapper
+                        error = result["error"].__cause__ or result["error"]
+                        error_counts[type(error).__name__] += 1
+                        logging.debug("Error processing file %s: %s", csv_file_path, result["error"])
+                    elif file_type == FileClasses.UNKNOWN:
+                        skipped_files.append(csv_file_path)
+                        logging.debug("Skipping unrecognized file: %s", csv_file_path)
 
-            df_ecl = ECLProcessor.format_ecl(data.iloc[0:ecf_index, ])
-            df_ecf = ECFProcessor.format_ecf(data.iloc[ecf_index:, ])
+                    if overlap_filter is not None:
+                        with self.stats.span("deduplication"):
+                            if result["ecl"] is not None:
+                                listed_rows = len(result["ecl"])
+                                result["ecl"] = overlap_filter.drop_ecl(result["ecl"])
+                                if result["ecf"] is not None:
+                                    result["ecf"] = overlap_filter.adjust_ecf(
+                                        result["ecf"], result["ecl"], listed_rows
+                                    )
+                            if result["dmp"] is not None:
+                                result["dmp"] = overlap_filter.drop_dmp(result["dmp"])
 
-            return df_ecl, df_ecf
+                    with self.stats.span("merging"):
+                        source = os.path.relpath(csv_file_path, base_dir) if base_dir else csv_file_path
+                        for key in ("ecl", "ecf", "dmp"):
+                            if result[key] is not None and not result[key].empty:
+                                result[key] = result[key].assign(**{self.SOURCE_COLUMN: source})
+                        if result["ecl"] is not None and not result["ecl"].empty:
+                            merged_df_ecl = pd.concat([merged_df_ecl, result["ecl"]])
+                        if result["ecf"] is not None and not result["ecf"].empty:
+                            merged_df_ecf = pd.concat([merged_df_ecf, result["ecf"]])
+                        if result["dmp"] is not None and not result["dmp"].empty:
+                            merged_dmp = pd.concat([merged_dmp, result["dmp"]])
+
+                    self.stats.record_file(
+                        csv_file_path, file_type.name, result["bytes"],
+                        result["rows"], result["seconds"], result["status"]
+                    )
+                    if self.__progress_callback is not None:
+                        self.__progress_callback({
+                            "file": csv_file_path, "type": file_type.name, "status": result["status"],
+                            "bytes": result["bytes"], "rows": result["rows"], "seconds": result["seconds"],
+                            "done": done, "total": len(csv_files),
+                            "ecl": result["ecl"], "ecf": result["ecf"], "dmp": result["dmp"],
+                        })
+                    if self.__cancel_event is not None and self.__cancel_event.is_set():
+                        self.cancelled = True
+                        logging.warning("Ingestion cancelled after %d of %d file(s)", done, len(csv_files))
+                        # Queued files are dropped; files already being parsed finish first
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        break
+
+            if overlap_filter is not None and any(overlap_filter.dropped_rows.values()):
+                self.stats.dropped_rows.update(overlap_filter.dropped_rows)
+                logging.info(
+                    "Dropped overlapping rows already read from other files: %d ECL, %d DMP",
+                    overlap_filter.dropped_rows["ecl"], overlap_filter.dropped_rows["dmp"]
+                )
+            if overlap_filter is not None and any(overlap_filter.adjusted_ecf.values()):
+                logging.info(
+                    "ECF sections of overlapping reports: %d dropped, %d rebuilt from the kept listing rows",
+                    overlap_filter.adjusted_ecf["dropped"], overlap_filter.adjusted_ecf["rebuilt"]
+                )
+            if skipped_files:
+                logging.warning("Skipped %d unrecognized file(s), e.g. %s", len(skipped_files), skipped_files[:5])
+            if failed_files:
+                logging.error(
+                    "Failed to process %d file(s) (%s), e.g. %s", len(failed_files),
+                    ", ".join(f"{name} x{count}" for name, count in error_counts.most_common()), failed_files[:5]
+                )
+
+            # Reset indices
+            with self.stats.span("merging"):
+                merged_df_ecf.reset_index(drop=True, inplace=True)
+                merged_df_ecl.reset_index(drop=True, inplace=True)
+                merged_dmp.reset_index(drop=True, inplace=True)
+                for merged in (merged_df_ecl, merged_df_ecf, merged_dmp):
+                    if self.SOURCE_COLUMN in merged.columns:
+                        merged[self.SOURCE_COLUMN] = merged[self.SOURCE_COLUMN].astype("category")
+
+            return merged_df_ecl, merged_df_ecf, merged_dmp
 
         except Exception as e:
-            logging.error(f"Error processing ECL/ECF file {file_path}: {e}")
-            return pd.DataFrame(), pd.DataFrame()
+            logging.error("Unexpected error reading CSV files: %s", e)
+            return merged_df_ecl, merged_df_ecf, merged_dmp
 
     def set_folder(self, folder_path):
         """
@@ -139,11 +344,50 @@ class DataHandler:
         Args:
             folder_path (str): Path to the folder containing CSV files
         """
+        self.__folder_path = folder_path
+        self.__ingest(folder_path)
+
+    def set_files(self, files):
+        """
+        Process in-memory files (e.g. uploads) without writing them to disk.
+        
+        Each file-like object is classified and parsed directly from its
+        buffer; it is rewound before every read, so nothing is copied.
+        
+        Args:
+            files (list): File-like objects with a `name` attribute
+        """
+        self.__folder_path = None
+        self.__ingest(None, list(files))
+
+    def __ingest(self, folder_path, files=None):
+        """
+        Read a folder (or in-memory files) and compute every summary.
+        
+        Args:
+            folder_path (str): Path to the folder containing CSV files
+            files (list): File-like objects to read instead of the folder
+        """
+        self.stats = IngestionStats(self.__profile, self.__trace_memory)
+        self.__query_cache.clear()
+        self.__dmp_filter = None
+        self.cancelled = False
+        self.stats.start()
         try:
-            self.__folder_path = folder_path
-            logging.info(f'Reading files from path: {folder_path}')
-            self.ecl, self.ecf, self.dmp = self.__read_csv_from_folder(self.__folder_path)
+            if files is None:
+                logging.info("Reading files from path: %s", folder_path)
+                self.ecl, self.ecf, self.dmp = self.__read_csv_from_folder(folder_path)
+            else:
+                with self.stats.span("discovery"):
+                    files = ArchiveReader.expand(files)
+                logging.info("Reading %d in-memory file(s)", len(files))
+                self.ecl, self.ecf, self.dmp = self.__read_csv_files(files)
             
+            if self.cancelled:
+                # Summaries of a partial read would pass for the whole dataset
+                self.ecl, self.ecf, self.dmp = pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
+                raise IngestionCancelled("Ingestion cancelled")
+
             if self.ecl.empty:
                 logging.warning("No ECL data processed")
             if self.ecf.empty:
@@ -152,26 +396,426 @@ class DataHandler:
                 logging.warning("No DMP data processed")
 
 
-            self.ecl_freq_summary = ECLProcessor.get_frequency_summary(self.ecl)
-            self.filtered_dmp = DMPProcessor.filter_dmp(self.dmp)
-            self.dmp_freq_summary = DMPProcessor.get_frequency_summary(self.filtered_dmp)
+            with self.stats.span("summary:ecl_frequency"):
+                self.ecl_freq_summary = ECLProcessor.get_frequency_summary(self.ecl)
+            with self.stats.span("summary:dmp_filter"):
+                self.filtered_dmp = DMPProcessor.filter_dmp(self.dmp)
+            with self.stats.span("summary:dmp_frequency"):
+                self.dmp_freq_summary = DMPProcessor.get_frequency_summary(self.filtered_dmp)
+            with self.stats.span("summary:valve_activations"):
+                self.valve_activations = DMPProcessor.get_activation_intervals(self.dmp, self.SOURCE_COLUMN)
+                self.valve_activation_summary = DMPProcessor.get_activation_summary(
+                    self.dmp, self.SOURCE_COLUMN, self.valve_activations
+                )
+            with self.stats.span("summary:dmp_timeline"):
+                self.dmp_timeline, self.dmp_segments, self.dmp_transitions = DMPStitcher.stitch(
+                    self.dmp, self.SOURCE_COLUMN
+                )
+            with self.stats.span("summary:diagnostics"):
+                self.diagnostic_flags = DiagnosticDecoder().decode(self.dmp, active_only=True)
+                self.diagnostic_freq_summary = DiagnosticDecoder.flag_counts(self.diagnostic_flags)
             
+        except IngestionCancelled:
+            self._reset_state()
         except Exception as e:
-            logging.error(f"Error setting folder: {e}")
+            logging.error("Error reading files: %s", e)
             self._reset_state()
 
+        self.stats.stop()
+        for name in ("ecl", "ecf", "dmp", "filtered_dmp", "ecl_freq_summary", "dmp_freq_summary",
+                     "valve_activations", "valve_activation_summary",
+                     "dmp_timeline", "dmp_segments", "diagnostic_flags", "diagnostic_freq_summary"):
+            self.stats.record_frame(name, getattr(self, name))
+        file_table = self.stats.file_table()
+        logging.info(
+            "Ingestion finished in %.3fs: %d file(s), %.2f MB",
+            self.stats.total_seconds, len(file_table), file_table["bytes"].sum() / 1e6,
+            extra={"metrics": {
+                "folder": folder_path if files is None else "<memory>",
+                "total_seconds": self.stats.total_seconds,
+                "spans": self.stats.spans,
+                "files_by_status": file_table["status"].value_counts().to_dict(),
+                "bytes": int(file_table["bytes"].sum()),
+                "rows": {name: info["rows"] for name, info in self.stats.frames.items()},
+            }}
+        )
+
     def _reset_state(self):
         """Reset instance variables to empty state."""
         self.ecl = pd.DataFrame()
         self.ecf = pd.DataFrame()
         self.dmp = pd.DataFrame()
+        self.ecl_freq_summary = pd.DataFrame()
         self.filtered_dmp = pd.DataFrame()
         self.dmp_freq_summary = pd.Series()
+        self.valve_activations = pd.DataFrame()
+        self.valve_activation_summary = pd.DataFrame()
+        self.dmp_timeline = pd.DataFrame()
+        self.dmp_segments = pd.DataFrame()
+        self.dmp_transitions = pd.DataFrame()
+        self.diagnostic_flags = pd.DataFrame()
+        self.diagnostic_freq_summary = pd.Series(dtype="int64")
 
     def get_folder(self):
         """Get current folder path."""
         return self.__folder_path
 
+    def export_dataset(self, path):
+        """
+        Persist the processed data as a partitioned Parquet dataset.
+        
+        ECL and DMP rows are partitioned by date and source file, ECF rows by
+        source file; the frequency summaries and a manifest are stored alongside.
+        Reopen it with DataHandler.load_dataset.
+        
+        Args:
+            path (str): Dataset directory (created; a previous export is replaced)
+        
+        Returns:
+            dict: The dataset manifest
+        
+        Raises:
+            ImportError: If pyarrow is not installed
+            FileExistsError: If path is a non-empty directory that is not a dataset
+        """
+        return ParquetDataset.write(
+            path,
+            {"ecl": self.ecl, "ecf": self.ecf, "dmp": self.dmp},
+            {"ecl_freq_summary": self.ecl_freq_summary, "dmp_freq_summary": self.dmp_freq_summary},
+            self.SOURCE_COLUMN,
+            metadata={
+                "source_folder": self.__folder_path,
+                "files": self.stats.files,
+                "dropped_rows": self.stats.dropped_rows,
+            },
+        )
+
+    def save_to_history(self, store, unit=None):
+        """
+        Bulk-load ECL events, ECF counts and DMP rollups into a HistoryStore.
+        
+        Args:
+            store (HistoryStore | str): Open store, or the SQLite file path
+            unit (str): Unit identifier (defaults to the folder name)
+        
+        Returns:
+            dict: Ingestion id and rows inserted per table
+        """
+        from backend.history_store import HistoryStore
+
+        if unit is None:
+            unit = os.path.basename(os.path.normpath(self.__folder_path)) if self.__folder_path else "unknown"
+        if isinstance(store, HistoryStore):
+            return store.save(self, unit, self.SOURCE_COLUMN)
+        with HistoryStore(store) as history:
+            return history.save(self, unit, self.SOURCE_COLUMN)
+
+    def compare(self, other, labels=("A", "B")):
+        """
+        Diff this dataset's cached summaries against another dataset's.
+
+        Runs on the pre-aggregated summaries only, so the cost depends on the
+        number of distinct codes and channels, not on the number of rows.
+
+        Args:
+            other (DataHandler | DatasetHandle): Dataset to compare against this one
+            labels (tuple): Names of (this, other) in column headers
+
+        Returns:
+            dict: 'ecl', 'ecf', 'dmp' and 'valves' tables (see DatasetComparator.compare)
+        """
+        from backend.dataset_comparator import DatasetComparator
+
+        with self.stats.span("compare"):
+            return DatasetComparator.compare(self, other, labels)
+
+    def partial_summary(self):
+        """
+        Mergeable summary of this dataset (see backend.partial_summary).
+        
+        Returns:
+            PartialSummary: Aggregates that can be serialized and merged with
+            the summaries of other datasets
+        """
+        from backend.partial_summary import PartialSummary
+
+        with self.stats.span("partial_summary"):
+            return PartialSummary.from_handler(self)
+
+    def detect_wheel_slide(self, **thresholds):
+        """
+        Detect wheel-slide and axle-lock events in the DMP speed channels.
+        
+        Args:
+            **thresholds: Overrides for WheelSlideDetector.DEFAULTS
+        
+        Returns:
+            pd.DataFrame: One row per event (see WheelSlideDetector.detect)
+        """
+        from backend.data_processors.wheel_slide_detector import WheelSlideDetector
+
+        with self.stats.span("wheel_slide"):
+            return WheelSlideDetector.detect(self.dmp, self.SOURCE_COLUMN, **thresholds)
+
+    def dmp_time_range(self, start=None, end=None, columns=None):
+        """
+        DMP rows between two points of the stitched timeline, in time order.
+        
+        Args:
+            start (float): Seconds from the first sample (None for the beginning)
+            end (float): Seconds from the first sample (None for the end)
+            columns (list): DMP columns to return (None for all)
+        
+        Returns:
+            pd.DataFrame: Rows with 'Timeline (s)' and 'Segment' columns added
+        """
+        timeline = self.dmp_timeline
+        if timeline.empty:
+            return pd.DataFrame()
+        labels = DMPStitcher.time_range(timeline, start, end)
+        rows = self.dmp.loc[labels] if columns is None else self.dmp.loc[labels, list(columns)]
+        return rows.assign(**{
+            DMPStitcher.TIMELINE_COLUMN: timeline[DMPStitcher.TIMELINE_COLUMN].loc[labels].to_numpy(),
+            DMPStitcher.SEGMENT_COLUMN: timeline[DMPStitcher.SEGMENT_COLUMN].loc[labels].to_numpy(),
+        })
+
+    def dmp_filter(self):
+        """
+        Expression filter over the DMP channels (see backend.utils.dmp_filter).
+        
+        The filter and its cached masks are kept until new files are read.
+        
+        Returns:
+            DMPFilter: Filter bound to this handler's DMP rows
+        """
+        from backend.utils.dmp_filter import DMPFilter
+
+        if self.__dmp_filter is None:
+            self.__dmp_filter = DMPFilter(self.dmp)
+        return self.__dmp_filter
+
+    def diagnostic_intervals(self, bit_map=None):
+        """
+        Intervals during which each diagnostic flag was set.
+        
+        Args:
+            bit_map (dict): Flag name -> (byte, bit); defaults to every bit
+        
+        Returns:
+            pd.DataFrame: See DiagnosticDecoder.intervals
+        """
+        decoder = DiagnosticDecoder(bit_map)
+        flags = self.diagnostic_flags if bit_map is None else decoder.decode(self.dmp, active_only=True)
+        return decoder.intervals(self.dmp, self.SOURCE_COLUMN, flags)
+
+    @classmethod
+    def load_dataset(cls, path, columns=None, filters=None):
+        """
+        Reopen a dataset written by export_dataset without re-parsing any CSV.
+        
+        Nothing is read up front: each frame is loaded on first access, with
+        only the requested columns and the partitions matching the filters.
+        Summaries are read from the dataset when no filters are given and are
+        recomputed from the filtered rows otherwise.
+        
+        Args:
+            path (str): Dataset directory
+            columns (list | dict): Columns to load, either one list for every
+                frame or a dict such as {'ecl': [...], 'dmp': [...]}
+            filters (list): (column, op, value) tuples, ANDed, e.g.
+                [('date', '>=', '2024-07-01'), ('Source File', '==', 'Error 1.csv')].
+                Terms on columns a frame does not have are ignored for that frame
+        
+        Returns:
+            DataHandler: Handler whose frames load lazily
+        
+        Raises:
+            FileNotFoundError: If path is not an exported dataset
+            ImportError: If pyarrow is not installed
+        """
+        configure_logging()
+        ParquetDataset.require_pyarrow()
+        manifest = ParquetDataset.read_manifest(path)
+
+        dh = cls.__new__(cls)
+        dh.__folder_path = path
+        dh.__show_progress = False
+        dh.__profile = False
+        dh.__trace_memory = False
+        dh.__max_workers = min(cls.DEFAULT_MAX_WORKERS, os.cpu_count() or 1)
+        dh.__deduplicate = True
+        dh.__drop_overlaps = True
+        dh.stats = IngestionStats()
+        dh.__query_cache = OrderedDict()
+        dh.__query_lock = threading.Lock()
+        dh.__dmp_filter = None
+        dh.stats.files = manifest.get("files", [])
+        dh.__dataset = {"path": path, "manifest": manifest, "columns": columns, "filters": filters}
+        logging.info("Opened dataset %s (columns=%s, filters=%s)", path, columns, filters)
+        return dh
+
+    LAZY_FRAMES = ("ecl", "ecf", "dmp", "filtered_dmp", "ecl_freq_summary", "dmp_freq_summary",
+                   "valve_activations", "valve_activation_summary",
+                   "dmp_timeline", "dmp_segments", "dmp_transitions",
+                   "diagnostic_flags", "diagnostic_freq_summary")
+    QUERY_CACHE_SIZE = 64
+
+    def query(self, frame="ecl"):
+        """
+        Start a lazy query over 'ecl', 'ecf' or 'dmp' (see backend.query.Query).
+        
+        Returns:
+            Query: Chainable query; call collect() to run it
+        """
+        from backend.query import Query
+        return Query(self, frame)
+
+    def scan(self, name, columns=None, filters=None):
+        """
+        Read a frame with column projection and predicates pushed down.
+        
+        For a dataset opened with load_dataset whose frame is not loaded yet,
+        only the needed columns are read, and partition and text-equality
+        filters are evaluated by the Parquet reader. Otherwise the filters are
+        evaluated on just the needed columns of the in-memory frame.
+        
+        Args:
+            name (str): 'ecl', 'ecf' or 'dmp'
+            columns (list): Columns to return (None for all)
+            filters (list): (column, op, value) tuples, ANDed
+        
+        Returns:
+            pd.DataFrame: Matching rows with the requested columns
+        """
+        from backend.query import Query
+
+        filters = list(filters or [])
+        needed = None
+        if columns is not None:
+            needed = list(dict.fromkeys([*columns, *(column for column, _, _ in filters)]))
+
+        dataset = self.__dict__.get("_DataHandler__dataset")
+        if dataset is not None and name not in self.__dict__:
+            with self.stats.span(f"scan:{name}"):
+                partitions = ParquetDataset.PARTITIONS.get(name, []) + [self.SOURCE_COLUMN]
+                pushed = [
+                    (column, op, list(value) if op in ("in", "not in") else value)
+                    for column, op, value in filters if Query.pushable((column, op, value), partitions)
+                ]
+                read_columns = needed
+                if read_columns is None and any(column == ParquetDataset.DATE_COLUMN for column, _, _ in filters):
+                    read_columns = dataset["manifest"]["frames"].get(name, {}).get("columns", []) \
+                        + [ParquetDataset.DATE_COLUMN]
+                df = ParquetDataset.read_frame(dataset["path"], name, dataset["manifest"], read_columns, pushed)
+        else:
+            df = getattr(self, name)
+            wants_date = (needed is None and any(column == ParquetDataset.DATE_COLUMN for column, _, _ in filters)) \
+                or (needed is not None and ParquetDataset.DATE_COLUMN in needed)
+            if wants_date and ParquetDataset.DATE_COLUMN not in df.columns and not df.empty:
+                # Same YYYY-MM-DD values as the exported date partitions
+                df = df.assign(**{ParquetDataset.DATE_COLUMN:
+                                  ParquetDataset.partition_dates(name, df, self.SOURCE_COLUMN)})
+            if needed is not None:
+                df = df[[column for column in needed if column in df.columns]]
+
+        if df.empty:
+            return pd.DataFrame(columns=list(columns or df.columns))
+        mask = Query.mask(df, filters)
+        if mask is not None:
+            df = df.loc[mask]
+        if columns is None:
+            # 'date' is only materialised to evaluate filters on it
+            return df.drop(columns=ParquetDataset.DATE_COLUMN, errors="ignore")
+        return df[list(columns)]
+
+    def run_query(self, query):
+        """
+        Run a Query, serving repeated plans from an LRU result cache.
+        
+        The cache is cleared whenever the handler reads new files.
+        
+        Returns:
+            pd.DataFrame: The query result
+        """
+        key = query.key()
+        with self.__query_lock:
+            if key in self.__query_cache:
+                self.__query_cache.move_to_end(key)
+                return self.__query_cache[key].copy(deep=False)
+        result = query.execute()
+        with self.__query_lock:
+            self.__query_cache[key] = result
+            while len(self.__query_cache) > self.QUERY_CACHE_SIZE:
+                self.__query_cache.popitem(last=False)
+        return result.copy(deep=False)
+
+    def __getattr__(self, name):
+        # Only reached for attributes that are not set yet, i.e. the frames of
+        # a handler opened with load_dataset that have not been accessed
+        dataset = self.__dict__.get("_DataHandler__dataset")
+        if dataset is None or name not in self.LAZY_FRAMES:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        with self.stats.span(f"load:{name}"):
+            value = self.__load_lazy_frame(name, dataset)
+        setattr(self, name, value)
+        self.stats.record_frame(name, value)
+        return value
+
+    def __load_lazy_frame(self, name, dataset):
+        path, manifest, filters = dataset["path"], dataset["manifest"], dataset["filters"]
+        columns = dataset["columns"]
+        if isinstance(columns, dict):
+            columns = columns.get(name)
+
+        if name in ("ecl", "ecf", "dmp"):
+            return ParquetDataset.read_frame(path, name, manifest, columns, filters)
+
+        if name == "filtered_dmp":
+            # Only the valve columns are needed if the full DMP was not loaded
+            dmp = self.__dict__.get("dmp")
+            if dmp is None:
+                dmp = ParquetDataset.read_frame(path, "dmp", manifest, DMPProcessor.VALVE_COLUMNS, filters)
+            return DMPProcessor.filter_dmp(dmp)
+
+        if name in ("valve_activations", "valve_activation_summary"):
+            dmp = self.__dict__.get("dmp")
+            if dmp is None:
+                dmp = ParquetDataset.read_frame(
+                    path, "dmp", manifest,
+                    DMPProcessor.VALVE_COLUMNS + [DMPProcessor.TIME_COLUMN, self.SOURCE_COLUMN], filters
+                )
+            if name == "valve_activations":
+                return DMPProcessor.get_activation_intervals(dmp, self.SOURCE_COLUMN)
+            return DMPProcessor.get_activation_summary(dmp, self.SOURCE_COLUMN, self.valve_activations)
+
+        if name in ("dmp_timeline", "dmp_segments", "dmp_transitions"):
+            # The timeline refers to row labels, so it is built from the loaded DMP frame
+            stitched = dict(zip(("dmp_timeline", "dmp_segments", "dmp_transitions"),
+                                DMPStitcher.stitch(self.dmp, self.SOURCE_COLUMN)))
+            for other, value in stitched.items():
+                if other != name:
+                    setattr(self, other, value)
+            return stitched[name]
+
+        if name == "diagnostic_flags":
+            dmp = self.__dict__.get("dmp")
+            if dmp is None:
+                dmp = ParquetDataset.read_frame(path, "dmp", manifest, DiagnosticDecoder.BYTE_COLUMNS, filters)
+            return DiagnosticDecoder().decode(dmp, active_only=True)
+        if name == "diagnostic_freq_summary":
+            return DiagnosticDecoder.flag_counts(self.diagnostic_flags)
+
+        if not filters:
+            summary = ParquetDataset.read_summary(path, name, manifest)
+            if summary is not None:
+                return summary
+        if name == "ecl_freq_summary":
+            ecl = self.__dict__.get("ecl")
+            if ecl is None or "Description" not in ecl.columns:
+                ecl = ParquetDataset.read_frame(path, "ecl", manifest, ["Description"], filters)
+            return ECLProcessor.get_frequency_summary(ecl)
+        return DMPProcessor.get_frequency_summary(self.filtered_dmp)
+
 # main.py
 if __name__ == "__main__":
     try:
@@ -192,5 +836,5 @@ if __name__ == "__main__":
             print(f"\tValues: {dh.dmp_freq_summary.values}")
         
     except Exception as e:
-        logging.error(f"Critical error in main execution: {e}")
+        logging.error("Critical error in main execution: %s", e)
         print("Data processing failed. Check logs for details.")
@@ -0,0 +1,177 @@
+import json
+import logging
+import numpy as np
+import pandas as pd
+from backend.utils.run_length import RunLength
+
+class DiagnosticDecoder:
+    """
+    Decode the DMP diagnostic bytes (DIA_BYTE_0..4) into named boolean flags.
+
+    All bytes of the whole log are unpacked at once with np.unpackbits, and
+    the bit map picks and names the bits of interest. Without a bit map every
+    bit is exposed as DIA<byte>_B<bit> (bit 0 is the least significant).
+
+    Example bit map (also accepted as a JSON file by from_file):
+        {"SENSOR_1_FAULT": ["DIA_BYTE_0", 0], "SENSOR_2_FAULT": [0, 3]}
+    """
+
+    BYTE_COLUMNS = ["DIA_BYTE_0", "DIA_BYTE_1", "DIA_BYTE_2", "DIA_BYTE_3", "DIA_BYTE_4"]
+    TIME_COLUMN = "Time"
+    INTERVAL_COLUMNS = ["Flag", "Source File", "Start Row", "End Row", "Start Time", "End Time", "Duration (s)"]
+
+    def __init__(self, bit_map=None):
+        """
+        Args:
+            bit_map (dict): Flag name -> (byte column or index, bit 0-7)
+
+        Raises:
+            ValueError: If a byte or bit is out of range
+        """
+        if bit_map is None:
+            bit_map = {
+                f"DIA{byte}_B{bit}": (byte, bit)
+                for byte in range(len(self.BYTE_COLUMNS)) for bit in range(8)
+            }
+        self.__names = []
+        self.__positions = []
+        for name, (byte, bit) in bit_map.items():
+            if isinstance(byte, str):
+                if byte not in self.BYTE_COLUMNS:
+                    raise ValueError(f"Unknown diagnostic byte for {name}: {byte}")
+                byte = self.BYTE_COLUMNS.index(byte)
+            if not 0 <= int(byte) < len(self.BYTE_COLUMNS) or not 0 <= int(bit) < 8:
+                raise ValueError(f"Diagnostic bit out of range for {name}: byte {byte}, bit {bit}")
+            self.__names.append(name)
+            self.__positions.append(int(byte) * 8 + int(bit))
+        self.__positions = np.asarray(self.__positions, dtype=np.intp)
+
+    @classmethod
+    def from_file(cls, path):
+        """Build a decoder from a JSON bit map file."""
+        with open(path) as f:
+            return cls(json.load(f))
+
+    @property
+    def flag_names(self):
+        return list(self.__names)
+
+    def decode(self, df_dmp, active_only=False):
+        """
+        Unpack the diagnostic bytes of every row into boolean flags.
+
+        Args:
+            df_dmp (pd.DataFrame): DMP rows
+            active_only (bool): Keep only flags that are set at least once
+
+        Returns:
+            pd.DataFrame: One boolean column per flag, indexed like df_dmp
+        """
+        try:
+            if df_dmp is None or df_dmp.empty:
+                return pd.DataFrame()
+            missing = [col for col in self.BYTE_COLUMNS if col not in df_dmp.columns]
+            if missing:
+                logging.warning("Missing diagnostic columns in DMP: %s", missing)
+                return pd.DataFrame()
+
+            raw = df_dmp[self.BYTE_COLUMNS].to_numpy()
+            if raw.dtype.kind == "f":
+                raw = np.nan_to_num(raw)
+            if (raw < 0).any() or (raw > 255).any():
+                logging.warning("Diagnostic bytes outside 0-255 were masked to 8 bits")
+            # (rows, bytes) -> (rows, bytes * 8), least significant bit first
+            bits = np.unpackbits((raw.astype(np.int64) & 0xFF).astype(np.uint8), axis=1, bitorder="little")
+            if not np.array_equal(self.__positions, np.arange(bits.shape[1])):
+                bits = bits[:, self.__positions]
+            flags = pd.DataFrame(bits.view(bool), columns=self.__names, index=df_dmp.index)
+            if active_only:
+                flags = flags.loc[:, flags.any(axis=0)]
+            return flags
+
+        except Exception as e:
+            logging.error("Error decoding diagnostic bytes: %s", e)
+            return pd.DataFrame()
+
+    @staticmethod
+    def flag_counts(flags):
+        """
+        Number of samples each flag is set, like the DMP frequency summary.
+
+        Returns:
+            pd.Series: Sample count per flag
+        """
+        if flags is None or flags.empty:
+            return pd.Series(dtype="int64")
+        return flags.sum(axis=0)
+
+    def intervals(self, df_dmp, source_column=None, flags=None):
+        """
+        Run-length encode the flags into intervals where each one is set.
+
+        Args:
+            df_dmp (pd.DataFrame): DMP rows (with Time for interval times)
+            source_column (str): Column naming each row's file
+            flags (pd.DataFrame): Output of decode, if already computed
+
+        Returns:
+            pd.DataFrame: Intervals (INTERVAL_COLUMNS), by flag then start
+        """
+        if flags is None:
+            flags = self.decode(df_dmp, active_only=True)
+        if flags.empty:
+            return pd.DataFrame(columns=self.INTERVAL_COLUMNS)
+
+        time = (df_dmp[self.TIME_COLUMN].to_numpy(dtype=float)
+                if self.TIME_COLUMN in df_dmp.columns else np.arange(len(df_dmp), dtype=float))
+        has_source = source_column is not None and source_column in df_dmp.columns
+        sources = df_dmp[source_column].astype("category").cat.codes.to_numpy() if has_source else None
+        flag, start, end = RunLength.intervals(flags.to_numpy(), RunLength.boundaries(time, sources))
+        return pd.DataFrame({
+            "Flag": pd.Categorical.from_codes(flag, categories=list(flags.columns)),
+            "Source File": df_dmp[source_column].iloc[start].astype(str).to_numpy() if has_source else None,
+            "Start Row": start,
+            "End Row": end,
+            "Start Time": time[start],
+            "End Time": time[end],
+            "Duration (s)": np.round(RunLength.durations(time, start, end), 3),
+        })
+
+    @staticmethod
+    def state_at(df_dmp, flags, time, source_column=None, source_file=None):
+        """
+        Flag states at a log time (the last sample at or before it).
+
+        Args:
+            df_dmp (pd.DataFrame): DMP rows with the Time column
+            flags (pd.DataFrame): Output of decode
+            time (float): Log time in seconds
+            source_column (str): Column naming each row's file
+            source_file (str): Log file to look in (required when several are loaded)
+
+        Returns:
+            pd.Series: Boolean state per flag, or an empty series before the first sample
+
+        Raises:
+            ValueError: If several log files are loaded and source_file is not given, source_file is
+                given without a source column, or the times to search go backwards
+        """
+        rows = np.arange(len(df_dmp))
+        has_sources = source_column is not None and source_column in df_dmp.columns
+        if source_file is not None and not has_sources:
+            raise ValueError(f"source_file given but the source column {source_column!r} is not in the DMP rows")
+        if has_sources:
+            if source_file is None:
+                if df_dmp[source_column].nunique() > 1:
+                    # Log times restart in every file, so the time alone is ambiguous
+                    raise ValueError("source_file is required when several DMP log files are loaded")
+            else:
+                rows = np.flatnonzero(df_dmp[source_column].to_numpy() == source_file)
+        times = df_dmp[DiagnosticDecoder.TIME_COLUMN].to_numpy(dtype=float)[rows]
+        if np.any(np.diff(times) < 0):
+            # A restarted log clock (see RunLength.boundaries) makes the time match several samples
+            raise ValueError("Log time goes backwards in the DMP rows searched; pass one log file's rows")
+        position = np.searchsorted(times, time, side="right") - 1
+        if position < 0 or flags.empty:
+            return pd.Series(dtype=bool)
+        return flags.iloc[rows[position]]
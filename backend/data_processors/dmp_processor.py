@@ -1,36 +1,49 @@
+import numpy as np
 import pandas as pd
 import logging
+from backend.utils.run_length import RunLength
+from backend.utils.ingestion_stats import IngestionStats
+from backend.utils.file_source import FileSource
+from backend.utils.exceptions import FileProcessingError
 
 class DMPProcessor:
+    VALVE_COLUMNS = ["FILL_1","VENT_1","FILL_2","VENT_2","FILL_3","VENT_3","FILL_4","VENT_4"]
+    TIME_COLUMN = "Time"
+    INTERVAL_COLUMNS = ["Channel", "Source File", "Start Row", "End Row", "Start Time", "End Time", "Duration (s)"]
+    ACTIVATION_SUMMARY_COLUMNS = [
+        "Channel", "Activations", "On Time (s)", "Min Duration (s)", "Median Duration (s)",
+        "P95 Duration (s)", "Max Duration (s)", "Duty Cycle (%)",
+    ]
+
     @staticmethod
-    def read_dmp(file_path):
+    def read_dmp(file_path, stats=None):
         """
         Read DMP file with comprehensive error handling.
         
         Args:
-            file_path (str): Path to the CSV file
+            file_path (str | file-like): Path to the CSV file, or an in-memory buffer
+            stats (IngestionStats): Optional collector for the parsing span
         
         Returns:
-            pd.DataFrame: Loaded dataframe or empty dataframe
+            pd.DataFrame: Loaded dataframe
+        
+        Raises:
+            FileProcessingError: If the file has no columns or cannot be parsed;
+                the ingestion loop records it as a failed file
         """
         try:
-            data = pd.read_csv(file_path, low_memory=False)
-            
-            # Additional validation
-            if data.empty:
-                logging.warning(f"Empty dataframe from file: {file_path}")
-            
-            return data
-        
-        except pd.errors.EmptyDataError:
-            logging.error(f"No columns to parse from file: {file_path}")
-            return pd.DataFrame()
-        except pd.errors.ParserError as e:
-            logging.error(f"Parsing error in file {file_path}: {e}")
-            return pd.DataFrame()
+            with IngestionStats.span_of(stats, "parsing"):
+                data = pd.read_csv(FileSource.rewind(file_path), low_memory=False)
+        except pd.errors.EmptyDataError as e:
+            raise FileProcessingError(f"No columns to parse from file: {FileSource.name(file_path)}") from e
         except Exception as e:
-            logging.error(f"Unexpected error reading DMP file {file_path}: {e}")
-            return pd.DataFrame()
+            raise FileProcessingError(f"Error reading DMP file {FileSource.name(file_path)}: {e}") from e
+
+        # Additional validation
+        if data.empty:
+            logging.warning("Empty dataframe from file: %s", FileSource.name(file_path))
+        
+        return data
 
     @staticmethod
     def filter_dmp(df_dmp):
@@ -48,12 +61,12 @@ class DMPProcessor:
                 logging.warning("Empty or None dataframe passed to filter_dmp")
                 return pd.DataFrame()
 
-            required_columns = ["FILL_1","VENT_1","FILL_2","VENT_2","FILL_3","VENT_3","FILL_4","VENT_4"]
+            required_columns = DMPProcessor.VALVE_COLUMNS
             
             # Check if all required columns exist
             missing_columns = [col for col in required_columns if col not in df_dmp.columns]
             if missing_columns:
-                logging.warning(f"Missing columns in DMP: {missing_columns}")
+                logging.warning("Missing columns in DMP: %s", missing_columns)
                 return pd.DataFrame()
 
             f_df_dmp = df_dmp[required_columns]
@@ -62,7 +75,7 @@ class DMPProcessor:
             return f_df_dmp
         
         except Exception as e:
-            logging.error(f"Error filtering DMP dataframe: {e}")
+            logging.error("Error filtering DMP dataframe: %s", e)
             return pd.DataFrame()
 
     @staticmethod
@@ -85,5 +98,109 @@ class DMPProcessor:
             return summary
         
         except Exception as e:
-            logging.error(f"Error generating DMP frequency summary: {e}")
+            logging.error("Error generating DMP frequency summary: %s", e)
             return pd.Series()
+
+    @staticmethod
+    def __segments(df_dmp, source_column):
+        time = (df_dmp[DMPProcessor.TIME_COLUMN].to_numpy(dtype=float)
+                if DMPProcessor.TIME_COLUMN in df_dmp.columns else np.arange(len(df_dmp), dtype=float))
+        sources = None
+        if source_column is not None and source_column in df_dmp.columns:
+            sources = df_dmp[source_column].astype("category").cat.codes.to_numpy()
+        return time, RunLength.boundaries(time, sources)
+
+    @staticmethod
+    def get_activation_intervals(df_dmp, source_column=None):
+        """
+        Run-length encode the FILL/VENT channels into activation intervals.
+        
+        Each row is one actuation: the channel, the rows and log times it was
+        on for, and its duration. Intervals never span two log files.
+        
+        Args:
+            df_dmp (pd.DataFrame): DMP rows with the valve and Time columns
+            source_column (str): Column naming each row's file
+        
+        Returns:
+            pd.DataFrame: Intervals (INTERVAL_COLUMNS), by channel then start
+        """
+        try:
+            channels = [col for col in DMPProcessor.VALVE_COLUMNS if df_dmp is not None and col in df_dmp.columns]
+            if not channels or df_dmp.empty:
+                return pd.DataFrame(columns=DMPProcessor.INTERVAL_COLUMNS)
+
+            time, boundary = DMPProcessor.__segments(df_dmp, source_column)
+            channel, start, end = RunLength.intervals(df_dmp[channels].to_numpy() != 0, boundary)
+            return pd.DataFrame({
+                "Channel": pd.Categorical.from_codes(channel, categories=channels),
+                "Source File": (df_dmp[source_column].iloc[start].astype(str).to_numpy()
+                                if source_column is not None and source_column in df_dmp.columns else None),
+                "Start Row": start,
+                "End Row": end,
+                "Start Time": time[start],
+                "End Time": time[end],
+                "Duration (s)": np.round(RunLength.durations(time, start, end), 3),
+            })
+
+        except Exception as e:
+            logging.error("Error encoding valve activations: %s", e)
+            return pd.DataFrame(columns=DMPProcessor.INTERVAL_COLUMNS)
+
+    @staticmethod
+    def get_logged_time(df_dmp, source_column=None):
+        """
+        Seconds of recording in the DMP rows, summed over the log files.
+        
+        Args:
+            df_dmp (pd.DataFrame): DMP rows with the Time column
+            source_column (str): Column naming each row's file
+        
+        Returns:
+            float: Logged time (the denominator of duty cycles)
+        """
+        if df_dmp is None or df_dmp.empty:
+            return 0.0
+        time, boundary = DMPProcessor.__segments(df_dmp, source_column)
+        return RunLength.covered_time(time, boundary)
+
+    @staticmethod
+    def get_activation_summary(df_dmp, source_column=None, intervals=None):
+        """
+        Summarise valve actuations per channel.
+        
+        Args:
+            df_dmp (pd.DataFrame): DMP rows with the valve and Time columns
+            source_column (str): Column naming each row's file
+            intervals (pd.DataFrame): Output of get_activation_intervals, if
+                already computed
+        
+        Returns:
+            pd.DataFrame: Activation count, on-time, duration statistics and
+            duty cycle (on-time over logged time) of every channel that actuated
+        """
+        try:
+            if df_dmp is None or df_dmp.empty:
+                return pd.DataFrame(columns=DMPProcessor.ACTIVATION_SUMMARY_COLUMNS)
+            if intervals is None:
+                intervals = DMPProcessor.get_activation_intervals(df_dmp, source_column)
+            if intervals.empty:
+                return pd.DataFrame(columns=DMPProcessor.ACTIVATION_SUMMARY_COLUMNS)
+
+            logged = DMPProcessor.get_logged_time(df_dmp, source_column)
+            summary = intervals.groupby("Channel", observed=True, sort=False)["Duration (s)"].agg(
+                **{
+                    "Activations": "size",
+                    "On Time (s)": "sum",
+                    "Min Duration (s)": "min",
+                    "Median Duration (s)": "median",
+                    "P95 Duration (s)": lambda d: d.quantile(0.95),
+                    "Max Duration (s)": "max",
+                }
+            )
+            summary["Duty Cycle (%)"] = summary["On Time (s)"] / logged * 100 if logged else np.nan
+            return summary.round(3).reset_index()[DMPProcessor.ACTIVATION_SUMMARY_COLUMNS]
+
+        except Exception as e:
+            logging.error("Error summarising valve activations: %s", e)
+            return pd.DataFrame(columns=DMPProcessor.ACTIVATION_SUMMARY_COLUMNS)
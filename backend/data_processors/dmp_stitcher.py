@@ -0,0 +1,202 @@
+import logging
+import numpy as np
+import pandas as pd
+
+class DMPStitcher:
+    """
+    Stitch DMP logs into one continuous timeline.
+
+    Every log restarts its Time column at 0, but the module tick counters
+    keep running across logs (MOD_TICK counts milliseconds, MONTIME 2 ms
+    steps), so they place each sample on a vehicle-wide clock. Logs are
+    ordered by their first tick and merged: logs whose tick ranges do not
+    intersect are simply appended, and only overlapping logs are merged
+    sample by sample. Breaks in the clock are reported as gaps, and logs
+    that cover the same ticks as overlaps.
+
+    The timeline is stored as row labels in stitched order plus their time,
+    so time-range lookups are a binary search and never re-sort the data.
+    """
+
+    TICK_COLUMNS = {"MOD_TICK": 0.001, "MONTIME": 0.002}  # column -> seconds per tick
+    TIMELINE_COLUMN = "Timeline (s)"
+    SEGMENT_COLUMN = "Segment"
+    MIN_GAP_SECONDS = 1.0
+    SEGMENT_COLUMNS = ["Segment", "Start (s)", "End (s)", "Duration (s)", "Rows", "Source Files", "Gap Before (s)"]
+    TRANSITION_COLUMNS = ["From File", "To File", "Gap (s)", "Kind"]
+
+    @staticmethod
+    def tick_seconds(df_dmp):
+        """
+        Each row's tick converted to seconds, from the first available tick column.
+
+        Returns:
+            np.ndarray | None: Seconds per row, or None without a tick column
+        """
+        for column, seconds in DMPStitcher.TICK_COLUMNS.items():
+            if column in df_dmp.columns:
+                return df_dmp[column].to_numpy(dtype=float) * seconds
+        return None
+
+    @staticmethod
+    def stitch(df_dmp, source_column, gap_seconds=None):
+        """
+        Order every DMP row on one monotonic timeline.
+
+        Args:
+            df_dmp (pd.DataFrame): DMP rows of one or more logs
+            source_column (str): Column naming each row's log file
+            gap_seconds (float): Clock breaks longer than this start a new
+                segment (default: the larger of MIN_GAP_SECONDS and 5 sample periods)
+
+        Returns:
+            tuple: (timeline, segments, transitions)
+                timeline (pd.DataFrame): Indexed by df_dmp row labels in stitched
+                    order, with the timeline in seconds from the first sample,
+                    the segment number and the source file
+                segments (pd.DataFrame): Contiguous stretches of recording
+                transitions (pd.DataFrame): Gap or overlap between each log and the
+                    log reaching furthest before it
+        """
+        empty = (pd.DataFrame(columns=[DMPStitcher.TIMELINE_COLUMN, DMPStitcher.SEGMENT_COLUMN, source_column]),
+                 pd.DataFrame(columns=DMPStitcher.SEGMENT_COLUMNS),
+                 pd.DataFrame(columns=DMPStitcher.TRANSITION_COLUMNS))
+        try:
+            if df_dmp is None or df_dmp.empty:
+                return empty
+            seconds = DMPStitcher.tick_seconds(df_dmp)
+            if seconds is None:
+                logging.warning("No MOD_TICK or MONTIME column; DMP timeline not stitched")
+                return empty
+
+            sources = (df_dmp[source_column].astype("category") if source_column in df_dmp.columns
+                       else pd.Series(pd.Categorical(["unknown"] * len(df_dmp))))
+            codes = sources.cat.codes.to_numpy()
+
+            # Per-log sorted positions and tick ranges
+            logs = []
+            by_log = np.argsort(codes, kind="stable")
+            splits = np.flatnonzero(np.diff(codes[by_log])) + 1
+            for positions in np.split(by_log, splits):
+                code = codes[positions[0]]
+                log_seconds = seconds[positions]
+                if (np.diff(log_seconds) < 0).any():
+                    positions = positions[np.argsort(log_seconds, kind="stable")]
+                    log_seconds = seconds[positions]
+                logs.append((log_seconds[0], log_seconds[-1], code, positions))
+            logs.sort(key=lambda log: (log[0], log[1]))
+
+            order = np.concatenate(list(DMPStitcher.iter_merge(logs, seconds)))
+            timeline_seconds = seconds[order]
+
+            steps = np.diff(timeline_seconds)
+            positive = steps[steps > 0]
+            period = float(np.median(positive)) if len(positive) else 0.0
+            if gap_seconds is None:
+                gap_seconds = max(DMPStitcher.MIN_GAP_SECONDS, 5 * period)
+            breaks = np.flatnonzero(steps > gap_seconds) + 1
+            segment = np.zeros(len(order), dtype=np.int64)
+            segment[breaks] = 1
+            segment = np.cumsum(segment)
+
+            categories = sources.cat.categories
+            timeline = pd.DataFrame({
+                DMPStitcher.TIMELINE_COLUMN: timeline_seconds - timeline_seconds[0],
+                DMPStitcher.SEGMENT_COLUMN: segment,
+                source_column: pd.Categorical.from_codes(codes[order], categories=categories),
+            }, index=df_dmp.index[order])
+
+            segments = DMPStitcher.__segments(timeline, breaks, period, source_column)
+            transitions = DMPStitcher.__transitions(logs, categories, gap_seconds)
+            return timeline, segments, transitions
+
+        except Exception as e:
+            logging.error("Error stitching DMP timeline: %s", e)
+            return empty
+
+    @staticmethod
+    def iter_merge(logs, seconds):
+        """
+        Yield row positions in timeline order, one group of logs at a time.
+
+        Args:
+            logs (list): (first, last, code, positions) per log, ordered by first tick
+            seconds (np.ndarray): Tick seconds of every row
+
+        Yields:
+            np.ndarray: Positions of the next stretch of the timeline. Logs that
+            do not overlap are yielded whole; overlapping logs are merged with a
+            stable sort of their (already sorted) runs
+        """
+        group, group_end = [], None
+        for first, last, _, positions in logs:
+            if group and first > group_end:
+                yield DMPStitcher.__merge_group(group, seconds)
+                group = []
+            group_end = last if not group else max(group_end, last)
+            group.append(positions)
+        if group:
+            yield DMPStitcher.__merge_group(group, seconds)
+
+    @staticmethod
+    def __merge_group(group, seconds):
+        if len(group) == 1:
+            return group[0]
+        positions = np.concatenate(group)
+        # Timsort detects the sorted runs, so this is a k-way merge of the logs
+        return positions[np.argsort(seconds[positions], kind="stable")]
+
+    @staticmethod
+    def __transitions(logs, categories, gap_seconds):
+        # Like iter_merge, measure each log against the latest tick seen so far, so a
+        # log nested inside an earlier, longer one is an overlap rather than a gap
+        rows = []
+        covering = None  # (last, code) of the log reaching furthest so far
+        for first, last, code, _ in logs:
+            if covering is not None:
+                gap = first - covering[0]
+                rows.append({
+                    "From File": str(categories[covering[1]]),
+                    "To File": str(categories[code]),
+                    "Gap (s)": round(gap, 3),
+                    "Kind": "overlap" if gap <= 0 else "gap" if gap > gap_seconds else "contiguous",
+                })
+            if covering is None or last > covering[0]:
+                covering = (last, code)
+        return pd.DataFrame(rows, columns=DMPStitcher.TRANSITION_COLUMNS)
+
+    @staticmethod
+    def __segments(timeline, breaks, period, source_column):
+        times = timeline[DMPStitcher.TIMELINE_COLUMN].to_numpy()
+        starts = np.concatenate([[0], breaks])
+        ends = np.append(breaks, len(times)) - 1
+        files = timeline.groupby(DMPStitcher.SEGMENT_COLUMN, sort=True)[source_column].agg(
+            lambda sources: ", ".join(map(str, sources.unique()))
+        )
+        return pd.DataFrame({
+            "Segment": np.arange(len(starts)),
+            "Start (s)": times[starts],
+            "End (s)": times[ends],
+            "Duration (s)": np.round(times[ends] - times[starts] + period, 3),
+            "Rows": ends - starts + 1,
+            "Source Files": files.to_numpy(),
+            "Gap Before (s)": np.concatenate([[0.0], np.round(times[starts[1:]] - times[ends[:-1]], 3)]),
+        })
+
+    @staticmethod
+    def time_range(timeline, start=None, end=None):
+        """
+        Row labels whose timeline position lies in [start, end] seconds.
+
+        Args:
+            timeline (pd.DataFrame): Output of stitch
+            start (float): Range start (None for the beginning)
+            end (float): Range end (None for the end)
+
+        Returns:
+            pd.Index: Row labels, in timeline order
+        """
+        times = timeline[DMPStitcher.TIMELINE_COLUMN].to_numpy()
+        low = 0 if start is None else np.searchsorted(times, start, side="left")
+        high = len(times) if end is None else np.searchsorted(times, end, side="right")
+        return timeline.index[low:high]
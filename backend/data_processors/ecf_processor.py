@@ -1,5 +1,3 @@
-import pandas as pd
-import logging
 from backend.utils.exceptions import FileProcessingError
 
 class ECFProcessor:
@@ -45,7 +43,6 @@ class ECFProcessor:
 
             return df_ecf_fmtd
         
-        except (ValueError, FileProcessingError) as e:
-            logging.error(f"ECF formatting error: {e}")
-            return pd.DataFrame()
+        except ValueError as e:
+            raise FileProcessingError(f"ECF formatting error: {e}") from e
 
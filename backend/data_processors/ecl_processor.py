@@ -1,8 +1,55 @@
 import pandas as pd
 import logging
 from backend.utils.exceptions import FileProcessingError
+from backend.data_processors.ecf_processor import ECFProcessor
+from backend.data_processors.ecl_timestamps import ECLTimestamps
+from backend.utils.ingestion_stats import IngestionStats
+from backend.utils.file_source import FileSource
 
 class ECLProcessor:
+    @staticmethod
+    def read_ecl_ecf(file_path, stats=None):
+        """
+        Read and format ECL and ECF from CSV with robust error handling.
+        
+        Args:
+            file_path (str | file-like): Path to the CSV file, or an in-memory buffer
+            stats (IngestionStats): Optional collector for parsing/formatting spans
+        
+        Returns:
+            tuple: Formatted ECL and ECF dataframes (empty if the file has no
+            rows or no ECF section)
+        
+        Raises:
+            FileProcessingError: If the file cannot be parsed or formatted; the
+                ingestion loop records it as a failed file
+        """
+        try:
+            with IngestionStats.span_of(stats, "parsing"):
+                data = pd.read_csv(FileSource.rewind(file_path), low_memory=False)
+
+            if data.empty:
+                logging.warning("Empty dataframe from file: %s", FileSource.name(file_path))
+                return pd.DataFrame(), pd.DataFrame()
+
+            ecf_indices = data[data.iloc[:, 0].str.contains("ERROR CODE FREQUENCY", na=False)].index
+            if len(ecf_indices) == 0:
+                logging.warning("No ECF section found in file: %s", FileSource.name(file_path))
+                return pd.DataFrame(), pd.DataFrame()
+
+            ecf_index = ecf_indices[0]
+
+            with IngestionStats.span_of(stats, "formatting"):
+                df_ecl = ECLProcessor.format_ecl(data.iloc[0:ecf_index, ])
+                df_ecf = ECFProcessor.format_ecf(data.iloc[ecf_index:, ])
+            with IngestionStats.span_of(stats, "timestamps"):
+                df_ecl = ECLTimestamps.add(df_ecl)
+
+            return df_ecl, df_ecf
+
+        except Exception as e:
+            raise FileProcessingError(f"Error processing ECL/ECF file {FileSource.name(file_path)}: {e}") from e
+
     @staticmethod
     def format_ecl(df_ecl):
         """
@@ -45,9 +92,8 @@ class ECLProcessor:
 
             return df_ecl_fmtd
         
-        except (ValueError, FileProcessingError) as e:
-            logging.error(f"ECL formatting error: {e}")
-            return pd.DataFrame()
+        except ValueError as e:
+            raise FileProcessingError(f"ECL formatting error: {e}") from e
 
     @staticmethod
     def get_frequency_summary(df_ecl_fmtd):
@@ -67,12 +113,25 @@ class ECLProcessor:
 
             summary = df_ecl_fmtd.groupby(by=["Description"])
             summary = summary.size().reset_index(name='Frequency')
-            summary['SortKey'] = summary['Description'].apply(lambda x: (-len(str(x)), str(x).lower()))
-            summary = summary.sort_values(by="SortKey", ignore_index=True)
-            summary = summary.drop(columns='SortKey')
-            
-            return summary
+            return ECLProcessor.order_frequency_summary(summary)
         
         except Exception as e:
-            logging.error(f"Error generating ECL frequency summary: {e}")
+            logging.error("Error generating ECL frequency summary: %s", e)
             return pd.DataFrame()
+
+    @staticmethod
+    def order_frequency_summary(summary):
+        """
+        Order a Description/Frequency summary the way the app displays it
+        (longest descriptions first, then alphabetically).
+        
+        Args:
+            summary (pd.DataFrame): Summary with a 'Description' column
+        
+        Returns:
+            pd.DataFrame: Reordered summary with a fresh index
+        """
+        summary = summary.copy()
+        summary['SortKey'] = summary['Description'].apply(lambda x: (-len(str(x)), str(x).lower()))
+        summary = summary.sort_values(by="SortKey", ignore_index=True)
+        return summary.drop(columns='SortKey')
@@ -0,0 +1,151 @@
+import logging
+import numpy as np
+import pandas as pd
+
+class ECLTimestamps:
+    """
+    Millisecond timestamps for ECL events.
+
+    The listing gives each event a wall-clock second (Date '31/7/24', Time
+    '16:6:55') and a tick count (Ticks(hex), 2 ms per tick) that restarts at
+    every power-on (code 0xA000). Rows are split into power-on segments, and
+    each segment is anchored at the offset between its wall clock and its
+    ticks; the ticks then supply the milliseconds within every event's second.
+    Timestamps therefore never leave the second shown in Date/Time, even when
+    the tick clock drifts from the wall clock over a long segment.
+    """
+
+    COLUMN = "Timestamp"
+    POWER_ON_CODE = "0xA000"
+    TICK_MS = 2
+    DATE_FORMAT = "%d/%m/%y"
+    __HEX_DIGITS = np.full(256, -1, dtype=np.int64)
+    __HEX_DIGITS[np.frombuffer(b"0123456789", dtype=np.uint8)] = np.arange(10)
+    __HEX_DIGITS[np.frombuffer(b"abcdef", dtype=np.uint8)] = np.arange(10, 16)
+    __HEX_DIGITS[np.frombuffer(b"ABCDEF", dtype=np.uint8)] = np.arange(10, 16)
+
+    @staticmethod
+    def parse_hex(values):
+        """
+        Parse '0x...' strings to integers without a per-row Python call.
+
+        Args:
+            values (pd.Series): Hex strings
+
+        Returns:
+            np.ndarray: int64 values, -1 where a value is not valid hex
+        """
+        strings = values.astype(str).to_numpy()
+        if not len(strings):
+            return np.array([], dtype=np.int64)
+        try:
+            encoded = strings.astype("S")
+        except UnicodeEncodeError:
+            encoded = None
+        if encoded is not None and 2 < encoded.itemsize <= 18:
+            raw = np.frombuffer(encoded.tobytes(), dtype=np.uint8).reshape(len(strings), encoded.itemsize)
+        else:
+            raw = None
+        if raw is not None and raw[:, -1].all():
+            # Fixed-width '0x' + digits (the listing's format): decode as a byte matrix
+            digits = ECLTimestamps.__HEX_DIGITS[raw[:, 2:]]
+            valid = (raw[:, 0] == ord("0")) & np.isin(raw[:, 1], (ord("x"), ord("X"))) & (digits >= 0).all(axis=1)
+            weights = np.int64(16) ** np.arange(digits.shape[1] - 1, -1, -1, dtype=np.int64)
+            return np.where(valid, digits @ weights, -1)
+
+        # Mixed widths: convert each distinct string once
+        def to_int(value):
+            try:
+                return int(value, 16)
+            except (TypeError, ValueError):
+                return -1
+        uniques, inverse = np.unique(strings, return_inverse=True)
+        return np.array([to_int(value) for value in uniques], dtype=np.int64)[inverse]
+
+    @staticmethod
+    def parse_wall_clock(dates, times):
+        """
+        Combine Date and Time strings, parsing each distinct string once.
+
+        Args:
+            dates (pd.Series): Dates like '31/7/24'
+            times (pd.Series): Times like '16:6:55' (fields need not be zero-padded)
+
+        Returns:
+            np.ndarray: datetime64[ms] values, NaT where unparseable
+        """
+        date_codes, date_uniques = pd.factorize(dates, use_na_sentinel=True)
+        time_codes, time_uniques = pd.factorize(times, use_na_sentinel=True)
+
+        day = pd.to_datetime(pd.Series(date_uniques, dtype=object), format=ECLTimestamps.DATE_FORMAT,
+                             errors="coerce").to_numpy(dtype="datetime64[ms]")
+        fields = pd.Series(time_uniques, dtype=object).str.split(":", expand=True)
+        if fields.shape[1] == 3:
+            fields = fields.apply(pd.to_numeric, errors="coerce")
+            in_range = fields[0].between(0, 23) & fields[1].between(0, 59) & fields[2].between(0, 59)
+            seconds = (fields[0] * 3600 + fields[1] * 60 + fields[2]).where(in_range)
+        else:
+            seconds = pd.Series(np.nan, index=range(len(time_uniques)))
+        offset = (seconds.to_numpy(dtype=float) * 1000)
+
+        valid = (date_codes >= 0) & (time_codes >= 0)
+        result = np.full(len(dates), np.datetime64("NaT", "ms"))
+        offsets = offset[time_codes[valid]]
+        parsed = day[date_codes[valid]] + np.where(np.isnan(offsets), 0, offsets).astype("timedelta64[ms]")
+        result[valid] = np.where(np.isnan(offsets), np.datetime64("NaT", "ms"), parsed)
+        return result
+
+    @staticmethod
+    def power_on_segments(codes):
+        """
+        Segment number of every row: it increases at each power-on row.
+
+        Rows before the first power-on form segment 0.
+        """
+        return np.cumsum(codes.to_numpy() == ECLTimestamps.POWER_ON_CODE)
+
+    @staticmethod
+    def reconstruct(df_ecl):
+        """
+        Millisecond timestamps for the rows of one ECL listing.
+
+        Args:
+            df_ecl (pd.DataFrame): Formatted ECL rows of one file
+
+        Returns:
+            pd.Series: datetime64[ms] timestamps aligned with df_ecl (NaT
+            where Date/Time cannot be parsed)
+        """
+        wall = ECLTimestamps.parse_wall_clock(df_ecl["Date"], df_ecl["Time"])
+        ticks = ECLTimestamps.parse_hex(df_ecl["Ticks(hex)"])
+        segments = ECLTimestamps.power_on_segments(df_ecl["Code(hex)"])
+
+        wall_ms = wall.astype("int64")
+        tick_ms = ticks * ECLTimestamps.TICK_MS
+        usable = ~np.isnat(wall) & (ticks >= 0)
+
+        # Each row bounds the segment's wall-minus-tick offset from below
+        # (its clock second is truncated), so the segment anchor is the
+        # largest offset; only its sub-second phase is used
+        offset = np.where(usable, wall_ms - tick_ms, np.iinfo(np.int64).min)
+        anchor = pd.Series(offset).groupby(segments).transform("max").to_numpy()
+        milliseconds = np.where(
+            usable & (anchor != np.iinfo(np.int64).min), (tick_ms + anchor - wall_ms) % 1000, 0
+        )
+        timestamps = np.where(np.isnat(wall), np.datetime64("NaT", "ms"), wall + milliseconds.astype("timedelta64[ms]"))
+        return pd.Series(timestamps.astype("datetime64[ms]"), index=df_ecl.index, name=ECLTimestamps.COLUMN)
+
+    @staticmethod
+    def add(df_ecl):
+        """
+        Return df_ecl with the Timestamp column added (unchanged if the
+        listing lacks Date, Time, Ticks(hex) or Code(hex)).
+        """
+        required = ["Date", "Time", "Ticks(hex)", "Code(hex)"]
+        if df_ecl is None or df_ecl.empty or not set(required).issubset(df_ecl.columns):
+            return df_ecl
+        try:
+            return df_ecl.assign(**{ECLTimestamps.COLUMN: ECLTimestamps.reconstruct(df_ecl)})
+        except Exception as e:
+            logging.error("Error reconstructing ECL timestamps: %s", e)
+            return df_ecl
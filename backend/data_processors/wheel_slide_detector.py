@@ -0,0 +1,159 @@
+import logging
+import numpy as np
+import pandas as pd
+from backend.utils.run_length import RunLength
+
+class WheelSlideDetector:
+    """
+    Detect wheel-slide and axle-lock events in DMP speed channels.
+
+    All four axles are evaluated at once on (rows x axles) arrays: a sample
+    slides when its slip against REF_SPEED or its deceleration passes a
+    threshold while the train is moving, and an event is a run of sliding
+    samples lasting at least `min_duration` seconds within one log file.
+    Events reaching `lock_slip` are reported as AXLE<n>_LOCK, like the ECL
+    codes, and the others as AXLE<n>_SLIDE.
+
+    Speeds and accelerations are compared in the log's raw units.
+    """
+
+    REF_COLUMN = "REF_SPEED"
+    SPEED_COLUMNS = ["SPEED_1", "SPEED_2", "SPEED_3", "SPEED_4"]
+    ACC_COLUMNS = ["ACC_1", "ACC_2", "ACC_3", "ACC_4"]
+    TIME_COLUMN = "Time"
+    TICK_COLUMN = "MOD_TICK"
+    CONTROLLER_SLIDE_COLUMN = "SD_TR_SLIDE"
+
+    DEFAULTS = {
+        "slip_threshold": 0.15,   # (ref - wheel) / ref
+        "lock_slip": 0.9,         # wheel (almost) stopped while the train moves
+        "decel_threshold": 60.0,  # -ACC above this counts as sliding
+        "max_abs_acc": 500.0,     # larger ACC readings are logging glitches
+        "min_speed": 50.0,        # ignore slip below this reference speed
+        "min_duration": 0.3,      # seconds a slide must last
+    }
+
+    EVENT_COLUMNS = [
+        "Description", "Axle", "Source File", "Start Time", "End Time", "Duration (s)",
+        "Start MOD_TICK", "Ref Speed", "Min Wheel Speed", "Max Slip", "Max Decel",
+        "Controller Slide",
+    ]
+
+    @staticmethod
+    def required_columns():
+        """Columns the detector reads from a DMP frame."""
+        return [WheelSlideDetector.REF_COLUMN, *WheelSlideDetector.SPEED_COLUMNS,
+                *WheelSlideDetector.ACC_COLUMNS, WheelSlideDetector.TIME_COLUMN]
+
+    @staticmethod
+    def slip(df_dmp, min_speed=DEFAULTS["min_speed"]):
+        """
+        Per-axle slip ratio (ref - wheel) / ref, 0 while the reference speed is below min_speed.
+
+        Returns:
+            np.ndarray: (rows, 4) float array
+        """
+        ref = df_dmp[WheelSlideDetector.REF_COLUMN].to_numpy(dtype=float)[:, None]
+        speeds = df_dmp[WheelSlideDetector.SPEED_COLUMNS].to_numpy(dtype=float)
+        moving = ref >= min_speed
+        return np.where(moving, (ref - speeds) / np.where(moving, ref, 1.0), 0.0)
+
+    @staticmethod
+    def detect(df_dmp, source_column=None, **thresholds):
+        """
+        Detect sustained slides on all axles.
+
+        Args:
+            df_dmp (pd.DataFrame): Raw DMP rows (one or more files, in file order)
+            source_column (str): Column naming each row's file; runs never
+                span two files
+            **thresholds: Overrides for WheelSlideDetector.DEFAULTS
+
+        Returns:
+            pd.DataFrame: One row per event (EVENT_COLUMNS), ordered by file
+            and start time, or an empty dataframe
+        """
+        try:
+            unknown = set(thresholds) - set(WheelSlideDetector.DEFAULTS)
+            if unknown:
+                raise ValueError(f"Unknown wheel-slide thresholds: {sorted(unknown)}")
+            config = {**WheelSlideDetector.DEFAULTS, **thresholds}
+
+            if df_dmp is None or df_dmp.empty:
+                return pd.DataFrame(columns=WheelSlideDetector.EVENT_COLUMNS)
+            missing = [c for c in WheelSlideDetector.required_columns() if c not in df_dmp.columns]
+            if missing:
+                logging.warning("Missing columns for wheel-slide detection: %s", missing)
+                return pd.DataFrame(columns=WheelSlideDetector.EVENT_COLUMNS)
+
+            time = df_dmp[WheelSlideDetector.TIME_COLUMN].to_numpy(dtype=float)
+            slip = WheelSlideDetector.slip(df_dmp, config["min_speed"])
+            acc = df_dmp[WheelSlideDetector.ACC_COLUMNS].to_numpy(dtype=float)
+            acc = np.where(np.abs(acc) > config["max_abs_acc"], 0.0, acc)
+            moving = df_dmp[WheelSlideDetector.REF_COLUMN].to_numpy(dtype=float)[:, None] >= config["min_speed"]
+            sliding = moving & ((slip >= config["slip_threshold"]) | (-acc >= config["decel_threshold"]))
+
+            sources = None
+            if source_column is not None and source_column in df_dmp.columns:
+                sources = df_dmp[source_column].astype("category").cat.codes.to_numpy()
+            axle, starts, ends = RunLength.intervals(sliding, RunLength.boundaries(time, sources))
+            if not len(starts):
+                return pd.DataFrame(columns=WheelSlideDetector.EVENT_COLUMNS)
+
+            duration = RunLength.durations(time, starts, ends)
+            keep = duration >= config["min_duration"] - 1e-9
+            axle, starts, ends, duration = axle[keep], starts[keep], ends[keep], duration[keep]
+            if not len(starts):
+                return pd.DataFrame(columns=WheelSlideDetector.EVENT_COLUMNS)
+
+            speeds = df_dmp[WheelSlideDetector.SPEED_COLUMNS].to_numpy(dtype=float)
+            max_slip = RunLength.reduce(slip, axle, starts, ends, np.maximum)
+            min_wheel = RunLength.reduce(speeds, axle, starts, ends, np.minimum)
+            max_decel = -RunLength.reduce(acc, axle, starts, ends, np.minimum)
+
+            controller = False
+            if WheelSlideDetector.CONTROLLER_SLIDE_COLUMN in df_dmp.columns:
+                # Whether the controller flagged a slide anywhere in the run
+                flagged = np.concatenate([[0], np.cumsum(
+                    df_dmp[WheelSlideDetector.CONTROLLER_SLIDE_COLUMN].to_numpy(dtype=float) > 0)])
+                controller = flagged[ends + 1] > flagged[starts]
+
+            events = pd.DataFrame({
+                "Description": ("AXLE" + pd.Series(axle + 1).astype(str)
+                                + np.where(max_slip >= config["lock_slip"], "_LOCK", "_SLIDE")),
+                "Axle": axle + 1,
+                "Source File": (df_dmp[source_column].iloc[starts].astype(str).to_numpy()
+                                if source_column is not None and source_column in df_dmp.columns else None),
+                "Start Time": time[starts],
+                "End Time": time[ends],
+                "Duration (s)": np.round(duration, 3),
+                "Start MOD_TICK": (df_dmp[WheelSlideDetector.TICK_COLUMN].to_numpy()[starts]
+                                   if WheelSlideDetector.TICK_COLUMN in df_dmp.columns else np.nan),
+                "Ref Speed": df_dmp[WheelSlideDetector.REF_COLUMN].to_numpy()[starts],
+                "Min Wheel Speed": min_wheel,
+                "Max Slip": np.round(max_slip, 3),
+                "Max Decel": max_decel,
+                "Controller Slide": controller,
+            })
+            order = np.lexsort((axle, starts))
+            return events.iloc[order].reset_index(drop=True)
+
+        except ValueError:
+            raise
+        except Exception as e:
+            logging.error("Error detecting wheel slide: %s", e)
+            return pd.DataFrame(columns=WheelSlideDetector.EVENT_COLUMNS)
+
+    @staticmethod
+    def summarize(events):
+        """
+        Count events and total slide time per description, like ecl_freq_summary.
+
+        Returns:
+            pd.DataFrame: Description, Frequency, Total Duration (s)
+        """
+        if events is None or events.empty:
+            return pd.DataFrame(columns=["Description", "Frequency", "Total Duration (s)"])
+        return (events.groupby("Description", sort=True)
+                .agg(Frequency=("Axle", "size"), **{"Total Duration (s)": ("Duration (s)", "sum")})
+                .reset_index())
@@ -0,0 +1,130 @@
+import logging
+import numpy as np
+import pandas as pd
+
+class DatasetComparator:
+    """
+    Compare two loaded datasets (two vehicles, or one vehicle before and
+    after maintenance) from their cached summaries.
+
+    Only the pre-aggregated frames are read (ecl_freq_summary, ecf,
+    dmp_freq_summary, valve_activation_summary and dmp_segments), so a
+    comparison costs O(distinct codes) whatever the number of rows.
+
+    Every table has, per key, both counts, the absolute delta (right - left),
+    the relative change, and both rates with their delta:
+      - ECL/ECF rates are shares of the dataset's total events (%), so
+        datasets of different lengths compare fairly;
+      - DMP rates are per hour of logged recording.
+    """
+
+    TABLES = {
+        # name -> (key columns, value column)
+        "ecl": (["Description"], "Frequency"),
+        "ecf": (["Code(hex)", "Description"], "Frequency"),
+        "dmp": (["Channel"], "Samples"),
+        "valves": (["Channel"], "Activations"),
+    }
+
+    @staticmethod
+    def counts(data_handler):
+        """
+        Per-key counts of one dataset, from its cached summaries.
+
+        Returns:
+            dict: Table name -> pd.Series indexed by the table's keys
+        """
+        counts = {}
+        ecl = data_handler.ecl_freq_summary
+        counts["ecl"] = (ecl.groupby("Description", sort=False)["Frequency"].sum()
+                         if not ecl.empty else pd.Series(dtype="float64"))
+
+        ecf = data_handler.ecf
+        if not ecf.empty and {"Code(hex)", "Description", "Frequency"}.issubset(ecf.columns):
+            # ECF is already one row per code and file; sum the files
+            counts["ecf"] = (ecf.assign(Frequency=pd.to_numeric(ecf["Frequency"], errors="coerce"))
+                             .groupby(["Code(hex)", "Description"], sort=False)["Frequency"].sum())
+        else:
+            counts["ecf"] = pd.Series(dtype="float64")
+
+        dmp = data_handler.dmp_freq_summary
+        counts["dmp"] = dmp.rename_axis("Channel") if not dmp.empty else pd.Series(dtype="float64")
+
+        valves = data_handler.valve_activation_summary
+        counts["valves"] = (valves.set_index("Channel")["Activations"].rename(index=str)
+                            if not valves.empty else pd.Series(dtype="float64"))
+        return counts
+
+    @staticmethod
+    def logged_hours(data_handler):
+        """Hours of DMP recording (from the stitched segments), or NaN without DMP data."""
+        segments = data_handler.dmp_segments
+        if segments.empty:
+            return np.nan
+        return float(segments["Duration (s)"].sum()) / 3600
+
+    @staticmethod
+    def compare(left, right, labels=("A", "B")):
+        """
+        Diff two datasets.
+
+        Args:
+            left (DataHandler): Baseline dataset
+            right (DataHandler): Dataset compared against the baseline
+            labels (tuple): Names of the two datasets in column headers
+
+        Returns:
+            dict: Table name ('ecl', 'ecf', 'dmp', 'valves') -> pd.DataFrame
+            with the key columns, both counts, 'Delta', 'Change (%)', both
+            rates and 'Rate Delta', sorted by the largest absolute rate delta
+        """
+        left_label, right_label = labels
+        left_counts = DatasetComparator.counts(left)
+        right_counts = DatasetComparator.counts(right)
+        hours = (DatasetComparator.logged_hours(left), DatasetComparator.logged_hours(right))
+
+        result = {}
+        for name, (keys, value) in DatasetComparator.TABLES.items():
+            try:
+                result[name] = DatasetComparator.__diff(
+                    left_counts[name], right_counts[name], keys, value,
+                    (left_label, right_label), hours if name in ("dmp", "valves") else None
+                )
+            except Exception as e:
+                logging.error("Error comparing %s summaries: %s", name, e)
+                result[name] = pd.DataFrame()
+        return result
+
+    @staticmethod
+    def __diff(left, right, keys, value, labels, hours):
+        left_label, right_label = labels
+        columns = [*keys, f"{value} {left_label}", f"{value} {right_label}", "Delta", "Change (%)",
+                   f"Rate {left_label}", f"Rate {right_label}", "Rate Delta"]
+        if left.empty and right.empty:
+            return pd.DataFrame(columns=columns)
+
+        # Keys missing on one side were never counted there
+        table = pd.concat([left.rename("left"), right.rename("right")], axis=1).fillna(0).astype("int64")
+        if hours is None:
+            left_rate = table["left"] / table["left"].sum() * 100 if table["left"].sum() else np.nan
+            right_rate = table["right"] / table["right"].sum() * 100 if table["right"].sum() else np.nan
+        else:
+            left_rate = table["left"] / hours[0] if hours[0] else np.nan
+            right_rate = table["right"] / hours[1] if hours[1] else np.nan
+
+        table = table.assign(
+            Delta=table["right"] - table["left"],
+            **{
+                "Change (%)": np.where(table["left"] != 0,
+                                       (table["right"] - table["left"]) / table["left"].where(table["left"] != 0) * 100,
+                                       np.nan),
+                f"Rate {left_label}": left_rate,
+                f"Rate {right_label}": right_rate,
+            },
+        )
+        table["Rate Delta"] = table[f"Rate {right_label}"] - table[f"Rate {left_label}"]
+        table = table.rename(columns={"left": f"{value} {left_label}", "right": f"{value} {right_label}"})
+        table = table.reset_index()
+        table.columns = columns
+        order = np.argsort(-table["Rate Delta"].abs().fillna(table["Delta"].abs()).to_numpy(), kind="stable")
+        return table.iloc[order].reset_index(drop=True).round(3)
@@ -0,0 +1,183 @@
+import os
+import hashlib
+import logging
+import threading
+import weakref
+from collections import OrderedDict
+import pandas as pd
+
+class DatasetHandle:
+    """
+    Read-only view of a DataHandler held by the DatasetRegistry.
+
+    Attribute reads are forwarded to the shared DataHandler. Dataframes and
+    series are returned as copies, so one session can never modify another
+    session's data. When pandas copy-on-write is enabled (the Streamlit app
+    turns it on at startup) the copies are shallow: they share the underlying
+    data and only copy on the first write. Otherwise they are deep copies.
+    The registry never changes the pandas option itself. The reference is
+    released by release() or when the handle is garbage collected (e.g. when
+    a Streamlit session ends).
+    """
+
+    def __init__(self, registry, key, data_handler):
+        object.__setattr__(self, "_DatasetHandle__data_handler", data_handler)
+        object.__setattr__(self, "key", key)
+        object.__setattr__(self, "_DatasetHandle__finalizer", weakref.finalize(self, registry.release, key))
+
+    def __getattr__(self, name):
+        value = getattr(self.__data_handler, name)
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            # 'warn' mode behaves like the legacy mode, so only True is safe to share
+            return value.copy(deep=pd.get_option("mode.copy_on_write") is not True)
+        return value
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Shared dataset is read-only (cannot set '{name}')")
+
+    def release(self):
+        """Release this handle's reference (idempotent)."""
+        self.__finalizer()
+
+    @property
+    def released(self):
+        return not self.__finalizer.alive
+
+class DatasetRegistry:
+    DEFAULT_BUDGET_MB = 1024
+
+    def __init__(self, memory_budget_bytes=None):
+        """
+        Process-wide store of loaded datasets shared by all sessions.
+
+        Args:
+            memory_budget_bytes (int): Memory budget for unreferenced datasets.
+                Defaults to ERROR_ANALYZER_DATASET_BUDGET_MB (or 1024 MB)
+        """
+        if memory_budget_bytes is None:
+            budget_mb = float(os.environ.get("ERROR_ANALYZER_DATASET_BUDGET_MB", self.DEFAULT_BUDGET_MB))
+            memory_budget_bytes = int(budget_mb * 1024 * 1024)
+        self.memory_budget_bytes = memory_budget_bytes
+        self.__entries = OrderedDict()
+        self.__loading = {}
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(named_buffers):
+        """
+        Content fingerprint of a set of files, independent of their order.
+
+        Args:
+            named_buffers (iterable): (name, bytes-like) pairs
+
+        Returns:
+            str: Hex digest
+        """
+        file_digests = sorted(
+            (name, hashlib.blake2b(buffer, digest_size=16).hexdigest())
+            for name, buffer in named_buffers
+        )
+        digest = hashlib.blake2b(digest_size=16)
+        for name, file_digest in file_digests:
+            digest.update(name.encode("utf-8", "replace") + b"\0" + file_digest.encode() + b"\0")
+        return digest.hexdigest()
+
+    @staticmethod
+    def dataset_memory(data_handler):
+        """Deep memory footprint of a DataHandler's frames, in bytes."""
+        frames = getattr(getattr(data_handler, "stats", None), "frames", None)
+        if frames:
+            return sum(info["memory_bytes"] for info in frames.values())
+        return sum(
+            int(value.memory_usage(deep=True).sum())
+            for value in vars(data_handler).values()
+            if isinstance(value, pd.DataFrame)
+        )
+
+    def acquire(self, key, loader):
+        """
+        Return a handle to the dataset for `key`, loading it once if needed.
+
+        Concurrent sessions asking for the same key wait for a single load
+        instead of loading their own copy.
+
+        Args:
+            key (str): Content fingerprint
+            loader (callable): Returns a DataHandler; called only on a miss
+
+        Returns:
+            DatasetHandle: Read-only handle holding one reference
+        """
+        while True:
+            with self.__lock:
+                entry = self.__entries.get(key)
+                if entry is not None:
+                    entry["refs"] += 1
+                    self.__entries.move_to_end(key)
+                    return DatasetHandle(self, key, entry["data_handler"])
+                loading = self.__loading.get(key)
+                if loading is None:
+                    loading = self.__loading[key] = threading.Event()
+                    break
+            loading.wait()
+
+        try:
+            data_handler = loader()
+            memory = self.dataset_memory(data_handler)
+            with self.__lock:
+                self.__entries[key] = {"data_handler": data_handler, "refs": 1, "memory_bytes": memory}
+                self.__evict()
+            logging.info("Registered shared dataset %s (%.1f MB)", key, memory / 1e6)
+            return DatasetHandle(self, key, data_handler)
+        finally:
+            with self.__lock:
+                self.__loading.pop(key).set()
+
+    def release(self, key):
+        """Drop one reference to `key` and evict unreferenced datasets over budget."""
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and entry["refs"] > 0:
+                entry["refs"] -= 1
+            self.__evict()
+
+    def __evict(self):
+        # Least recently used first; datasets still referenced are never evicted
+        total = sum(entry["memory_bytes"] for entry in self.__entries.values())
+        for key in list(self.__entries):
+            if total <= self.memory_budget_bytes:
+                break
+            entry = self.__entries[key]
+            if entry["refs"] == 0:
+                total -= entry["memory_bytes"]
+                del self.__entries[key]
+                logging.info("Evicted shared dataset %s (%.1f MB)", key, entry["memory_bytes"] / 1e6)
+
+    def stats(self):
+        """
+        Return a snapshot of the registry for diagnostics.
+
+        Returns:
+            dict: Budget, total memory and per-dataset reference counts
+        """
+        with self.__lock:
+            datasets = [
+                {"key": key, "refs": entry["refs"], "memory_bytes": entry["memory_bytes"]}
+                for key, entry in self.__entries.items()
+            ]
+        return {
+            "memory_budget_bytes": self.memory_budget_bytes,
+            "memory_bytes": sum(d["memory_bytes"] for d in datasets),
+            "datasets": datasets,
+        }
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_registry():
+    """Return the process-wide DatasetRegistry, creating it on first use."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = DatasetRegistry()
+        return _registry
@@ -0,0 +1,337 @@
+import sqlite3
+import hashlib
+import logging
+from datetime import datetime
+import pandas as pd
+from backend.data_processors.dmp_processor import DMPProcessor
+from backend.data_processors.ecl_timestamps import ECLTimestamps
+
+class HistoryStore:
+    """
+    Persistent SQLite store of processed ECL events, ECF counts and DMP
+    rollups, so long-term questions (e.g. every AXLE3_LOCK on one unit in the
+    last 90 days) are answered from indexes instead of re-ingesting CSVs.
+
+    ECL events are unique per (unit, code, ticks, event time), and ECF counts
+    and DMP rollups per (unit, source file, content digest), so loading the
+    same files again does not duplicate history, while a different export
+    that reuses a file name (e.g. report.csv) is kept alongside the earlier
+    one instead of overwriting it.
+    """
+
+    BATCH_SIZE = 10000
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS ingestions (
+        id INTEGER PRIMARY KEY,
+        unit TEXT NOT NULL,
+        source_folder TEXT,
+        created TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS ecl_events (
+        id INTEGER PRIMARY KEY,
+        ingestion_id INTEGER NOT NULL REFERENCES ingestions(id),
+        unit TEXT NOT NULL,
+        source_file TEXT,
+        code TEXT NOT NULL,
+        ticks INTEGER,
+        event_time TEXT,
+        description TEXT,
+        condition TEXT,
+        speed REAL,
+        odometer REAL,
+        UNIQUE (unit, code, ticks, event_time)
+    );
+    CREATE TABLE IF NOT EXISTS ecf_counts (
+        id INTEGER PRIMARY KEY,
+        ingestion_id INTEGER NOT NULL REFERENCES ingestions(id),
+        unit TEXT NOT NULL,
+        source_file TEXT,
+        content_digest TEXT,
+        code TEXT,
+        description TEXT,
+        frequency INTEGER,
+        UNIQUE (unit, source_file, content_digest, code)
+    );
+    CREATE TABLE IF NOT EXISTS dmp_rollups (
+        id INTEGER PRIMARY KEY,
+        ingestion_id INTEGER NOT NULL REFERENCES ingestions(id),
+        unit TEXT NOT NULL,
+        source_file TEXT,
+        content_digest TEXT,
+        column_name TEXT NOT NULL,
+        active_samples INTEGER,
+        samples INTEGER,
+        first_tick INTEGER,
+        last_tick INTEGER,
+        UNIQUE (unit, source_file, content_digest, column_name)
+    );
+    CREATE INDEX IF NOT EXISTS idx_ecl_code ON ecl_events (code);
+    CREATE INDEX IF NOT EXISTS idx_ecl_description ON ecl_events (description);
+    CREATE INDEX IF NOT EXISTS idx_ecl_source ON ecl_events (source_file);
+    CREATE INDEX IF NOT EXISTS idx_ecl_time ON ecl_events (event_time);
+    CREATE INDEX IF NOT EXISTS idx_ecl_unit_description_time ON ecl_events (unit, description, event_time);
+    CREATE INDEX IF NOT EXISTS idx_ecl_unit_code_time ON ecl_events (unit, code, event_time);
+    CREATE INDEX IF NOT EXISTS idx_ecf_unit_code ON ecf_counts (unit, code);
+    CREATE INDEX IF NOT EXISTS idx_ecf_description ON ecf_counts (description);
+    CREATE INDEX IF NOT EXISTS idx_ecf_source ON ecf_counts (source_file);
+    CREATE INDEX IF NOT EXISTS idx_dmp_unit_column ON dmp_rollups (unit, column_name);
+    CREATE INDEX IF NOT EXISTS idx_dmp_source ON dmp_rollups (source_file);
+    """
+
+    def __init__(self, db_path="history.db"):
+        """
+        Open (or create) a history database.
+
+        Args:
+            db_path (str): SQLite file path, or ':memory:'
+        """
+        self.db_path = db_path
+        self.__connection = sqlite3.connect(db_path)
+        # WAL lets readers query while a bulk load is running
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute("PRAGMA synchronous=NORMAL")
+        self.__connection.executescript(self.SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self.__connection.close()
+
+    @staticmethod
+    def __column(df, name, default=None):
+        return df[name] if name in df.columns else pd.Series(default, index=df.index)
+
+    @staticmethod
+    def content_digests(df, sources):
+        """
+        Hash the rows of each source file.
+
+        Args:
+            df (pd.DataFrame): Rows to hash
+            sources (pd.Series): Source file of each row
+
+        Returns:
+            dict: blake2b hex digest per source file
+        """
+        row_hashes = pd.util.hash_pandas_object(df, index=False)
+        return {
+            source: hashlib.blake2b(hashes.to_numpy().tobytes(), digest_size=16).hexdigest()
+            for source, hashes in row_hashes.groupby(sources, sort=False)
+        }
+
+    @staticmethod
+    def ecl_event_rows(df_ecl, source_column="Source File"):
+        """
+        Convert formatted ECL rows into ecl_events tuples (without ids).
+
+        Returns:
+            pd.DataFrame: code, ticks, event_time, description, condition, speed,
+            odometer and source_file columns
+        """
+        column = HistoryStore.__column
+        if ECLTimestamps.COLUMN in df_ecl.columns:
+            # Stored at second resolution, as the listing's Date/Time
+            event_time = df_ecl[ECLTimestamps.COLUMN].dt.floor("s")
+        else:
+            event_time = pd.Series(ECLTimestamps.parse_wall_clock(
+                column(df_ecl, "Date", ""), column(df_ecl, "Time", "")
+            ), index=df_ecl.index)
+        ticks = pd.Series(ECLTimestamps.parse_hex(column(df_ecl, "Ticks(hex)", "")), index=df_ecl.index)
+        ticks = ticks.where(ticks >= 0).astype("Int64")
+        rows = pd.DataFrame({
+            "source_file": column(df_ecl, source_column).astype(object),
+            "code": column(df_ecl, "Code(hex)"),
+            "ticks": ticks.astype(object),
+            "event_time": event_time.dt.strftime("%Y-%m-%d %H:%M:%S").astype(object),
+            "description": column(df_ecl, "Description"),
+            "condition": column(df_ecl, "Condition"),
+            "speed": pd.to_numeric(column(df_ecl, "Speed(km/h)"), errors="coerce"),
+            "odometer": pd.to_numeric(column(df_ecl, "Odometer(km)"), errors="coerce"),
+        })
+        return rows.astype(object).where(rows.notna(), None)
+
+    @staticmethod
+    def dmp_rollup_rows(df_dmp, source_column="Source File"):
+        """
+        Roll DMP samples up to one row per source file and valve column.
+
+        Returns:
+            pd.DataFrame: source_file, content_digest (of the file's valve and
+            tick columns), column_name, active_samples, samples, first_tick and
+            last_tick columns
+        """
+        valve_columns = [c for c in DMPProcessor.VALVE_COLUMNS if c in df_dmp.columns]
+        if df_dmp.empty or not valve_columns:
+            return pd.DataFrame(columns=[
+                "source_file", "content_digest", "column_name", "active_samples", "samples", "first_tick", "last_tick"
+            ])
+        sources = HistoryStore.__column(df_dmp, source_column, "").astype(str)
+        grouped = (df_dmp[valve_columns] != 0).groupby(sources, observed=True)
+        active = grouped.sum().stack().rename("active_samples")
+        rollup = active.reset_index()
+        rollup.columns = ["source_file", "column_name", "active_samples"]
+        hashed_columns = [c for c in ["MOD_TICK", "MONTIME"] if c in df_dmp.columns] + valve_columns
+        rollup.insert(1, "content_digest", rollup["source_file"].map(
+            HistoryStore.content_digests(df_dmp[hashed_columns], sources)
+        ))
+        sizes = grouped.size()
+        rollup["samples"] = rollup["source_file"].map(sizes)
+        if "MOD_TICK" in df_dmp.columns:
+            ticks = df_dmp["MOD_TICK"].groupby(sources, observed=True).agg(["min", "max"])
+            rollup["first_tick"] = rollup["source_file"].map(ticks["min"])
+            rollup["last_tick"] = rollup["source_file"].map(ticks["max"])
+        else:
+            rollup["first_tick"] = None
+            rollup["last_tick"] = None
+        return rollup.astype(object).where(rollup.notna(), None)
+
+    def __insert_batches(self, sql, rows):
+        inserted = 0
+        for start in range(0, len(rows), self.BATCH_SIZE):
+            before = self.__connection.total_changes
+            self.__connection.executemany(sql, rows[start:start + self.BATCH_SIZE])
+            inserted += self.__connection.total_changes - before
+        return inserted
+
+    def save(self, data_handler, unit, source_column="Source File"):
+        """
+        Bulk-load a DataHandler's ECL events, ECF counts and DMP rollups.
+
+        Everything is written in one transaction with batched executemany
+        inserts; ECL events already in the store are skipped. ECF counts and
+        DMP rollups are keyed by a digest of each file's rows, so those of a
+        file loaded again with the same content are replaced, and those of a
+        different file with the same name are added.
+
+        Args:
+            data_handler (DataHandler): Processed data
+            unit (str): Vehicle or unit identifier
+            source_column (str): Column holding each row's file name
+
+        Returns:
+            dict: Ingestion id and number of rows inserted per table
+        """
+        ecl_rows = self.ecl_event_rows(data_handler.ecl, source_column) if not data_handler.ecl.empty else pd.DataFrame()
+        dmp_rows = self.dmp_rollup_rows(data_handler.dmp, source_column)
+        ecf = data_handler.ecf
+        ecf_rows = pd.DataFrame({
+            "source_file": self.__column(ecf, source_column).astype(object),
+            "code": self.__column(ecf, "Code(hex)"),
+            "description": self.__column(ecf, "Description"),
+            "frequency": pd.to_numeric(self.__column(ecf, "Frequency"), errors="coerce"),
+        }) if not ecf.empty else pd.DataFrame()
+        if not ecf_rows.empty:
+            ecf_rows = ecf_rows.astype(object).where(ecf_rows.notna(), None)
+            sources = ecf_rows["source_file"].astype(str)
+            ecf_rows.insert(1, "content_digest", sources.map(
+                self.content_digests(ecf_rows[["code", "description", "frequency"]], sources)
+            ))
+
+        counts = {}
+        with self.__connection:
+            cursor = self.__connection.execute(
+                "INSERT INTO ingestions (unit, source_folder, created) VALUES (?, ?, ?)",
+                (unit, data_handler.get_folder(), datetime.now().isoformat(timespec="seconds"))
+            )
+            ingestion_id = cursor.lastrowid
+
+            counts["ecl_events"] = self.__insert_batches(
+                "INSERT OR IGNORE INTO ecl_events (ingestion_id, unit, source_file, code, ticks, event_time,"
+                " description, condition, speed, odometer) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(ingestion_id, unit, *row) for row in ecl_rows[
+                    ["source_file", "code", "ticks", "event_time", "description", "condition", "speed", "odometer"]
+                ].itertuples(index=False, name=None)] if not ecl_rows.empty else []
+            )
+            counts["ecf_counts"] = self.__insert_batches(
+                "INSERT OR REPLACE INTO ecf_counts (ingestion_id, unit, source_file, content_digest, code, description,"
+                " frequency) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(ingestion_id, unit, *row) for row in ecf_rows.itertuples(index=False, name=None)]
+            )
+            counts["dmp_rollups"] = self.__insert_batches(
+                "INSERT OR REPLACE INTO dmp_rollups (ingestion_id, unit, source_file, content_digest, column_name,"
+                " active_samples, samples, first_tick, last_tick) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(ingestion_id, unit, *row) for row in dmp_rows.itertuples(index=False, name=None)]
+            )
+
+        logging.info("Saved ingestion %d for unit %s to %s: %s", ingestion_id, unit, self.db_path, counts)
+        return {"ingestion_id": ingestion_id, **counts}
+
+    def query_events(self, unit=None, code=None, description=None, source_file=None,
+                     since=None, until=None, limit=None):
+        """
+        Return ECL events matching every given criterion, oldest first.
+
+        Args:
+            unit (str): Unit identifier
+            code (str): Error code, e.g. '0x0037'
+            description (str): Exact description, e.g. 'AXLE3_LOCK'
+            source_file (str): Source file name
+            since (datetime | str): Earliest event time (inclusive)
+            until (datetime | str): Latest event time (inclusive)
+            limit (int): Maximum rows
+
+        Returns:
+            pd.DataFrame: Matching events
+        """
+        clauses, params = [], []
+        for column, value in (("unit", unit), ("code", code), ("description", description), ("source_file", source_file)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("event_time >= ?")
+            params.append(pd.Timestamp(since).strftime("%Y-%m-%d %H:%M:%S"))
+        if until is not None:
+            clauses.append("event_time <= ?")
+            params.append(pd.Timestamp(until).strftime("%Y-%m-%d %H:%M:%S"))
+
+        sql = "SELECT unit, source_file, code, ticks, event_time, description, condition, speed, odometer FROM ecl_events"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY event_time"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        events = pd.read_sql_query(sql, self.__connection, params=params)
+        events["event_time"] = pd.to_datetime(events["event_time"])
+        return events
+
+    def event_frequency(self, unit=None, since=None, until=None):
+        """
+        Return event counts per description, most frequent first.
+
+        Returns:
+            pd.DataFrame: Description and Frequency columns
+        """
+        clauses, params = [], []
+        if unit is not None:
+            clauses.append("unit = ?")
+            params.append(unit)
+        if since is not None:
+            clauses.append("event_time >= ?")
+            params.append(pd.Timestamp(since).strftime("%Y-%m-%d %H:%M:%S"))
+        if until is not None:
+            clauses.append("event_time <= ?")
+            params.append(pd.Timestamp(until).strftime("%Y-%m-%d %H:%M:%S"))
+        sql = "SELECT description AS Description, COUNT(*) AS Frequency FROM ecl_events"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " GROUP BY description ORDER BY Frequency DESC, description"
+        return pd.read_sql_query(sql, self.__connection, params=params)
+
+    def units(self):
+        """Return every unit with its first and last event time and event count."""
+        return pd.read_sql_query(
+            "SELECT unit, MIN(event_time) AS first_event, MAX(event_time) AS last_event, COUNT(*) AS events"
+            " FROM ecl_events GROUP BY unit ORDER BY unit",
+            self.__connection
+        )
+
+    def explain(self, sql, params=()):
+        """Return SQLite's query plan for a statement (to check index use)."""
+        return [row[-1] for row in self.__connection.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
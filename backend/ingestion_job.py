@@ -0,0 +1,173 @@
+import time
+import logging
+import threading
+from backend.data_handler import DataHandler
+from backend.partial_summary import PartialSummary
+from backend.utils.exceptions import IngestionCancelled
+
+class IngestionJob:
+    """
+    Reads a dataset in a background thread.
+
+    The caller's thread (e.g. a Streamlit script run) stays free: it polls
+    progress() for per-file progress, reads `partial` for summaries of the
+    files finished so far, and may cancel() at any time. Each finished file
+    is summarised into a PartialSummary and merged into a new snapshot, so
+    readers never see a summary that is being updated.
+
+    Example:
+        job = IngestionJob(files=uploaded_files).start()
+        while not job.finished:
+            print(job.progress()["done"], job.partial.ecl_frequency().head())
+            time.sleep(0.5)
+        data_handler = job.result
+    """
+
+    RUNNING = "running"
+    DONE = "done"
+    CANCELLED = "cancelled"
+    FAILED = "failed"
+
+    def __init__(self, folder_path=None, files=None, registry=None, key=None, **handler_options):
+        """
+        Args:
+            folder_path (str): Folder to read
+            files (list): In-memory file-like objects to read instead of a folder
+            registry (DatasetRegistry): Registry to load the dataset through, so
+                sessions reading the same files share one copy (needs `key`)
+            key (str): Registry key (content fingerprint) of the files
+            **handler_options: Further DataHandler arguments (e.g. profile)
+
+        Raises:
+            ValueError: If neither folder_path nor files is given, or a
+                registry is given without a key
+        """
+        if folder_path is None and files is None:
+            raise ValueError("Either folder_path or files must be given")
+        if registry is not None and key is None:
+            raise ValueError("A registry key is required to load through a registry")
+        self.folder_path = folder_path
+        self.files = files
+        self.registry = registry
+        self.key = key
+        self.__handler_options = dict(handler_options, show_progress=False)
+        self.__cancel = threading.Event()
+        self.__lock = threading.Lock()
+        self.__thread = None
+        self.__state = self.RUNNING
+        self.__progress = {"done": 0, "total": 0, "file": None, "bytes": 0, "rows": 0, "failed": 0}
+        self.__started = None
+        self.__finished = None
+        self.partial = PartialSummary()
+        self.result = None
+        self.error = None
+
+    def start(self):
+        """
+        Start reading in a daemon thread.
+
+        Returns:
+            IngestionJob: self
+        """
+        self.__started = time.perf_counter()
+        self.__thread = threading.Thread(target=self.__run, name="ingestion", daemon=True)
+        self.__thread.start()
+        return self
+
+    def cancel(self):
+        """Ask the reader to stop after the file it is merging."""
+        self.__cancel.set()
+
+    def wait(self, timeout=None):
+        """
+        Wait for the job to finish.
+
+        Returns:
+            bool: True if the job finished within the timeout
+        """
+        if self.__thread is not None:
+            self.__thread.join(timeout)
+        return self.finished
+
+    @property
+    def state(self):
+        with self.__lock:
+            return self.__state
+
+    @property
+    def cancelling(self):
+        """True once cancel() was called on a job that is still running."""
+        return self.__cancel.is_set() and not self.finished
+
+    @property
+    def finished(self):
+        return self.state != self.RUNNING
+
+    def progress(self):
+        """
+        Snapshot of the job's progress.
+
+        Returns:
+            dict: 'state', files 'done' of 'total', last 'file', 'bytes' and
+            'rows' read, 'failed' files, 'fraction' done, 'elapsed' seconds and
+            'remaining' (estimated seconds, None until the first file is done)
+        """
+        with self.__lock:
+            progress = dict(self.__progress, state=self.__state)
+            end = self.__finished
+        elapsed = ((end or time.perf_counter()) - self.__started) if self.__started else 0.0
+        done, total = progress["done"], progress["total"]
+        progress["fraction"] = done / total if total else (1.0 if progress["state"] == self.DONE else 0.0)
+        progress["elapsed"] = elapsed
+        progress["remaining"] = elapsed / done * (total - done) if done and progress["state"] == self.RUNNING else None
+        return progress
+
+    def __on_file(self, event):
+        # Runs in the ingestion thread once per merged file
+        frames = {name: event[name] for name in ("ecl", "ecf", "dmp")}
+        if any(frame is not None and not frame.empty for frame in frames.values()):
+            try:
+                partial = PartialSummary.combine(
+                    [self.partial, PartialSummary.from_frames(source_column=DataHandler.SOURCE_COLUMN, **frames)]
+                )
+            except Exception as e:
+                # A preview problem must never fail the ingestion itself
+                logging.debug("Could not summarise %s: %s", event["file"], e)
+                partial = self.partial
+        else:
+            partial = self.partial
+        with self.__lock:
+            self.partial = partial
+            self.__progress.update(
+                done=event["done"], total=event["total"], file=event["file"],
+                bytes=self.__progress["bytes"] + event["bytes"], rows=self.__progress["rows"] + event["rows"],
+                failed=self.__progress["failed"] + (event["status"] == "error"),
+            )
+
+    def __load(self):
+        data_handler = DataHandler(
+            self.folder_path, files=self.files, progress_callback=self.__on_file, cancel_event=self.__cancel,
+            **self.__handler_options
+        )
+        if data_handler.cancelled:
+            # Raising keeps the incomplete dataset out of the registry
+            raise IngestionCancelled("Ingestion cancelled")
+        return data_handler
+
+    def __run(self):
+        try:
+            if self.registry is not None:
+                result = self.registry.acquire(self.key, self.__load)
+            else:
+                result = self.__load()
+            state = self.DONE
+        except IngestionCancelled:
+            result, state = None, self.CANCELLED
+        except Exception as e:
+            logging.error("Background ingestion failed: %s", e)
+            result, state = None, self.FAILED
+            self.error = e
+        with self.__lock:
+            self.result = result
+            self.__finished = time.perf_counter()
+            self.__state = state
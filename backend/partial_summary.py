@@ -0,0 +1,364 @@
+import gzip
+import json
+import logging
+import numpy as np
+import pandas as pd
+from backend.utils.quantile_sketch import QuantileSketch
+from backend.data_processors.ecl_processor import ECLProcessor
+from backend.data_processors.dmp_processor import DMPProcessor
+from backend.data_processors.diagnostic_decoder import DiagnosticDecoder
+
+class PartialSummary:
+    """
+    Mergeable form of every summary the app computes.
+
+    A partial summary holds only aggregates: event counts per ECL description
+    and ECF code, FILL/VENT sample counts, diagnostic flag counts, valve
+    activation counts, on-time, min/max and a duration sketch, and per DMP
+    channel the count, mean, M2 (sum of squared deviations), min, max and a
+    quantile sketch. Partials can be built per file or per vehicle in
+    separate workers, serialized (gzip JSON, a few KB), and merged in any
+    order or grouping with the same result, so fleet-wide summaries never
+    need the raw rows in one process.
+
+    Rows repeated across files (overlapping ECL listings, duplicate exports)
+    are only dropped within one DataHandler, so build partials per vehicle
+    folder when the files of a vehicle overlap.
+
+    Example:
+        partials = [PartialSummary.from_handler(DataHandler(folder)) for folder in folders]
+        fleet = PartialSummary.combine(partials)
+        fleet.ecl_frequency(), fleet.activation_summary(), fleet.channel_statistics()
+    """
+
+    VERSION = 1
+    SOURCE_COLUMN = "Source File"
+    # DMP columns that are not measurements (flags are counted, not averaged)
+    NON_STAT_COLUMNS = {"Time", "MOD_TICK", "MONTIME", *DMPProcessor.VALVE_COLUMNS, *DiagnosticDecoder.BYTE_COLUMNS}
+    STAT_QUANTILES = (0.5, 0.95, 0.99)
+    CHANNEL_STAT_COLUMNS = ["Channel", "Count", "Mean", "Std", "Min", "P50", "P95", "P99", "Max"]
+
+    def __init__(self):
+        """An empty partial summary (the identity of merge)."""
+        self.rows = {"ecl": 0, "ecf": 0, "dmp": 0}
+        self.parts = 0
+        self.logged_seconds = 0.0
+        self.ecl_start = None
+        self.ecl_end = None
+        self.__ecl = {}
+        self.__ecf = {}
+        self.__dmp = {}
+        self.__diagnostics = {}
+        self.__valves = {}
+        self.__channels = {}
+
+    @classmethod
+    def from_frames(cls, ecl=None, ecf=None, dmp=None, source_column=SOURCE_COLUMN):
+        """
+        Summarise raw frames, e.g. the rows of a single file.
+
+        Args:
+            ecl (pd.DataFrame): Formatted ECL rows
+            ecf (pd.DataFrame): ECF rows
+            dmp (pd.DataFrame): DMP rows
+            source_column (str): Column naming each row's file
+
+        Returns:
+            PartialSummary: Summary of the frames
+        """
+        dmp = dmp if dmp is not None else pd.DataFrame()
+        intervals = DMPProcessor.get_activation_intervals(dmp, source_column) if not dmp.empty else None
+        diagnostics = (DiagnosticDecoder.flag_counts(DiagnosticDecoder().decode(dmp, active_only=True))
+                       if not dmp.empty else None)
+        return cls.__build(
+            ecl,
+            ECLProcessor.get_frequency_summary(ecl) if ecl is not None and not ecl.empty else None,
+            ecf,
+            DMPProcessor.get_frequency_summary(DMPProcessor.filter_dmp(dmp)) if not dmp.empty else None,
+            dmp, intervals, diagnostics, DMPProcessor.get_logged_time(dmp, source_column),
+        )
+
+    @classmethod
+    def from_handler(cls, data_handler):
+        """
+        Summarise a loaded dataset, reusing its cached summaries.
+
+        Args:
+            data_handler (DataHandler | DatasetHandle): Loaded dataset
+
+        Returns:
+            PartialSummary: Summary of the dataset
+        """
+        dmp = data_handler.dmp
+        return cls.__build(
+            data_handler.ecl, data_handler.ecl_freq_summary, data_handler.ecf, data_handler.dmp_freq_summary,
+            dmp, data_handler.valve_activations, data_handler.diagnostic_freq_summary,
+            DMPProcessor.get_logged_time(dmp, data_handler.SOURCE_COLUMN),
+        )
+
+    @classmethod
+    def __build(cls, ecl, ecl_freq, ecf, dmp_freq, dmp, intervals, diagnostics, logged_seconds):
+        partial = cls()
+        partial.parts = 1
+        partial.logged_seconds = float(logged_seconds)
+        if ecl is not None and not ecl.empty:
+            partial.rows["ecl"] = len(ecl)
+            if "Timestamp" in ecl.columns and ecl["Timestamp"].notna().any():
+                partial.ecl_start, partial.ecl_end = ecl["Timestamp"].min(), ecl["Timestamp"].max()
+        if ecl_freq is not None and not ecl_freq.empty:
+            partial.__ecl = {str(k): int(v) for k, v in zip(ecl_freq["Description"], ecl_freq["Frequency"])}
+
+        if ecf is not None and not ecf.empty and {"Code(hex)", "Description", "Frequency"}.issubset(ecf.columns):
+            partial.rows["ecf"] = len(ecf)
+            counts = (ecf.assign(Frequency=pd.to_numeric(ecf["Frequency"], errors="coerce").fillna(0))
+                      .groupby(["Code(hex)", "Description"], sort=False)["Frequency"].sum())
+            partial.__ecf = {(str(code), str(description)): int(v) for (code, description), v in counts.items()}
+
+        if dmp_freq is not None and not dmp_freq.empty:
+            partial.__dmp = {str(k): int(v) for k, v in dmp_freq.items()}
+        if diagnostics is not None and not diagnostics.empty:
+            partial.__diagnostics = {str(k): int(v) for k, v in diagnostics.items()}
+
+        if intervals is not None and not intervals.empty:
+            for channel, durations in intervals.groupby("Channel", observed=True, sort=False)["Duration (s)"]:
+                durations = durations.to_numpy(dtype=float)
+                partial.__valves[str(channel)] = {
+                    "activations": len(durations),
+                    "on_time": float(durations.sum()),
+                    "min": float(durations.min()),
+                    "max": float(durations.max()),
+                    "sketch": QuantileSketch().add(durations),
+                }
+
+        if dmp is not None and not dmp.empty:
+            partial.rows["dmp"] = len(dmp)
+            for column in dmp.columns:
+                if column in cls.NON_STAT_COLUMNS or not isinstance(column, str) or dmp[column].dtype.kind not in "biuf":
+                    continue
+                partial.__channels[column] = cls.__channel_stats(dmp[column].to_numpy())
+            partial.__channels = {column: stats for column, stats in partial.__channels.items() if stats}
+        return partial
+
+    @staticmethod
+    def __channel_stats(values):
+        if values.dtype.kind in "iu":
+            if not len(values):
+                return None
+            low, high = int(values.min()), int(values.max())
+            if high - low < 1_000_000:
+                # Integer channels take few distinct values: work on value counts
+                counts = np.bincount(values - low)
+                distinct = np.flatnonzero(counts)
+                weights = counts[distinct]
+                distinct = distinct.astype(float) + low
+                count = len(values)
+                mean = float(np.dot(distinct, weights) / count)
+                return {
+                    "count": count,
+                    "mean": mean,
+                    "m2": float(np.dot(np.square(distinct - mean), weights)),
+                    "min": float(low),
+                    "max": float(high),
+                    "sketch": QuantileSketch().add(distinct, weights),
+                }
+        values = values.astype(float)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return None
+        mean = float(values.mean())
+        return {
+            "count": len(values),
+            "mean": mean,
+            "m2": float(np.square(values - mean).sum()),
+            "min": float(values.min()),
+            "max": float(values.max()),
+            "sketch": QuantileSketch().add(values),
+        }
+
+    def merge(self, other):
+        """
+        Add another partial summary into this one.
+
+        Returns:
+            PartialSummary: self
+        """
+        for name in self.rows:
+            self.rows[name] += other.rows.get(name, 0)
+        self.parts += other.parts
+        self.logged_seconds += other.logged_seconds
+        if other.ecl_start is not None:
+            self.ecl_start = other.ecl_start if self.ecl_start is None else min(self.ecl_start, other.ecl_start)
+            self.ecl_end = other.ecl_end if self.ecl_end is None else max(self.ecl_end, other.ecl_end)
+        for mine, theirs in ((self.__ecl, other.__ecl), (self.__ecf, other.__ecf),
+                             (self.__dmp, other.__dmp), (self.__diagnostics, other.__diagnostics)):
+            for key, count in theirs.items():
+                mine[key] = mine.get(key, 0) + count
+
+        for channel, theirs in other.__valves.items():
+            mine = self.__valves.get(channel)
+            if mine is None:
+                self.__valves[channel] = dict(theirs, sketch=QuantileSketch().merge(theirs["sketch"]))
+                continue
+            mine["activations"] += theirs["activations"]
+            mine["on_time"] += theirs["on_time"]
+            mine["min"] = min(mine["min"], theirs["min"])
+            mine["max"] = max(mine["max"], theirs["max"])
+            mine["sketch"].merge(theirs["sketch"])
+
+        for channel, theirs in other.__channels.items():
+            mine = self.__channels.get(channel)
+            if mine is None:
+                self.__channels[channel] = dict(theirs, sketch=QuantileSketch().merge(theirs["sketch"]))
+                continue
+            # Chan et al. parallel update of the mean and M2
+            count = mine["count"] + theirs["count"]
+            delta = theirs["mean"] - mine["mean"]
+            mine["m2"] += theirs["m2"] + delta * delta * mine["count"] * theirs["count"] / count
+            mine["mean"] += delta * theirs["count"] / count
+            mine["count"] = count
+            mine["min"] = min(mine["min"], theirs["min"])
+            mine["max"] = max(mine["max"], theirs["max"])
+            mine["sketch"].merge(theirs["sketch"])
+        return self
+
+    @classmethod
+    def combine(cls, partials):
+        """
+        Merge any number of partial summaries (None entries are skipped).
+
+        Returns:
+            PartialSummary: The combined summary
+        """
+        combined = cls()
+        for partial in partials:
+            if partial is not None:
+                combined.merge(partial)
+        return combined
+
+    def ecl_frequency(self):
+        """ECL events per description, like ECLProcessor.get_frequency_summary."""
+        if not self.__ecl:
+            return pd.DataFrame(columns=["Description", "Frequency"])
+        summary = pd.DataFrame({"Description": list(self.__ecl), "Frequency": list(self.__ecl.values())})
+        return ECLProcessor.order_frequency_summary(summary)
+
+    def ecf_frequency(self):
+        """ECF counts per code and description, most frequent first."""
+        summary = pd.DataFrame(
+            [(code, description, count) for (code, description), count in self.__ecf.items()],
+            columns=["Code(hex)", "Description", "Frequency"],
+        )
+        return summary.sort_values(by=["Frequency", "Code(hex)"], ascending=[False, True], ignore_index=True)
+
+    def dmp_frequency(self):
+        """FILL/VENT sample counts, like DMPProcessor.get_frequency_summary."""
+        order = [col for col in DMPProcessor.VALVE_COLUMNS if col in self.__dmp]
+        return pd.Series({col: self.__dmp[col] for col in order}, dtype="int64")
+
+    def diagnostic_frequency(self):
+        """Samples each diagnostic flag was set."""
+        return pd.Series(self.__diagnostics, dtype="int64")
+
+    def activation_summary(self):
+        """
+        Valve activation summary, like DMPProcessor.get_activation_summary
+        (median and P95 durations are sketch estimates).
+        """
+        rows = []
+        for channel in [col for col in DMPProcessor.VALVE_COLUMNS if col in self.__valves]:
+            valve = self.__valves[channel]
+            # Sketch estimates are within 1% but may step past the exact extremes
+            median, p95 = np.clip(valve["sketch"].quantiles((0.5, 0.95)), valve["min"], valve["max"])
+            rows.append([
+                channel, valve["activations"], valve["on_time"], valve["min"], median, p95, valve["max"],
+                valve["on_time"] / self.logged_seconds * 100 if self.logged_seconds else np.nan,
+            ])
+        return pd.DataFrame(rows, columns=DMPProcessor.ACTIVATION_SUMMARY_COLUMNS).round(3)
+
+    def channel_statistics(self):
+        """
+        Count, mean, sample standard deviation, min, max and quantile
+        estimates of every DMP measurement channel.
+        """
+        rows = []
+        for channel, stats in self.__channels.items():
+            std = np.sqrt(stats["m2"] / (stats["count"] - 1)) if stats["count"] > 1 else np.nan
+            rows.append([channel, stats["count"], stats["mean"], std, stats["min"],
+                         *np.clip(stats["sketch"].quantiles(self.STAT_QUANTILES), stats["min"], stats["max"]),
+                         stats["max"]])
+        return pd.DataFrame(rows, columns=self.CHANNEL_STAT_COLUMNS).round(3)
+
+    def to_dict(self):
+        """JSON-serializable form."""
+        def timestamp(value):
+            return None if value is None or pd.isna(value) else pd.Timestamp(value).isoformat()
+        return {
+            "version": self.VERSION,
+            "rows": dict(self.rows),
+            "parts": self.parts,
+            "logged_seconds": self.logged_seconds,
+            "ecl_start": timestamp(self.ecl_start),
+            "ecl_end": timestamp(self.ecl_end),
+            "ecl": self.__ecl,
+            "ecf": [[code, description, count] for (code, description), count in self.__ecf.items()],
+            "dmp": self.__dmp,
+            "diagnostics": self.__diagnostics,
+            "valves": {channel: dict(valve, sketch=valve["sketch"].to_dict()) for channel, valve in self.__valves.items()},
+            "channels": {channel: dict(stats, sketch=stats["sketch"].to_dict()) for channel, stats in self.__channels.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuild a partial summary from to_dict output.
+
+        Raises:
+            ValueError: If the data was written by an unsupported version
+        """
+        if data.get("version") != cls.VERSION:
+            raise ValueError(f"Unsupported partial summary version: {data.get('version')}")
+        partial = cls()
+        partial.rows.update(data["rows"])
+        partial.parts = data["parts"]
+        partial.logged_seconds = data["logged_seconds"]
+        partial.ecl_start = pd.Timestamp(data["ecl_start"]) if data["ecl_start"] else None
+        partial.ecl_end = pd.Timestamp(data["ecl_end"]) if data["ecl_end"] else None
+        partial.__ecl = dict(data["ecl"])
+        partial.__ecf = {(code, description): count for code, description, count in data["ecf"]}
+        partial.__dmp = dict(data["dmp"])
+        partial.__diagnostics = dict(data["diagnostics"])
+        partial.__valves = {channel: dict(valve, sketch=QuantileSketch.from_dict(valve["sketch"]))
+                            for channel, valve in data["valves"].items()}
+        partial.__channels = {channel: dict(stats, sketch=QuantileSketch.from_dict(stats["sketch"]))
+                              for channel, stats in data["channels"].items()}
+        return partial
+
+    def to_bytes(self):
+        """Compact serialized form (gzip-compressed JSON)."""
+        return gzip.compress(json.dumps(self.to_dict(), separators=(",", ":")).encode("utf-8"))
+
+    @classmethod
+    def from_bytes(cls, payload):
+        """Rebuild a partial summary from to_bytes output."""
+        return cls.from_dict(json.loads(gzip.decompress(payload).decode("utf-8")))
+
+    def save(self, path):
+        """Write the serialized summary to a file (conventionally *.json.gz)."""
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+        return path
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a summary written by save.
+
+        Returns:
+            PartialSummary | None: The summary, or None if the file cannot be read
+        """
+        try:
+            with open(path, "rb") as f:
+                return cls.from_bytes(f.read())
+        except Exception as e:
+            logging.error("Error reading partial summary %s: %s", path, e)
+            return None
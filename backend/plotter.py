@@ -1,11 +1,45 @@
-from matplotlib import pyplot as plt
+from concurrent.futures import ProcessPoolExecutor
 import math
+import os
 
 class Plotter:
+    IMAGE_FORMATS = ("png", "svg")
+
+    @staticmethod
+    def _pyplot():
+        """Import pyplot on first use, so importing Plotter does not load matplotlib."""
+        from matplotlib import pyplot as plt
+        return plt
+
+    @staticmethod
+    def use_headless_backend():
+        """Switch matplotlib to the non-interactive Agg backend (no windows)."""
+        Plotter._pyplot().switch_backend("Agg")
+
+    @staticmethod
+    def _prepare_figure(fig, figsize, **subplot_kw):
+        """Reuse an existing figure by clearing it, or create a new one."""
+        if fig is None:
+            fig = Plotter._pyplot().figure(figsize=figsize)
+        else:
+            fig.clf()
+            fig.set_size_inches(*figsize)
+        ax = fig.add_subplot(**subplot_kw)
+        return fig, ax
+
+    @staticmethod
+    def _finish_figure(fig, save_path):
+        """Show the figure interactively, or write it to save_path."""
+        if save_path is None:
+            Plotter._pyplot().show()
+        else:
+            fig.savefig(save_path)
+
     @staticmethod
-    def plot_bar_chart(x, y, xlabel="Errors", ylabel="Frequency", figsize=(12, 8)):
-        # Create a bar chart
-        fig, ax = plt.subplots(figsize=figsize)
+    def plot_bar_chart(x, y, xlabel="Errors", ylabel="Frequency", figsize=(12, 8),
+                       title='Bar Chart with Labels', save_path=None, fig=None):
+        # Create a bar chart (reusing fig when given)
+        fig, ax = Plotter._prepare_figure(fig, figsize)
         bars = ax.bar(x, y)
 
         # Add bar labels
@@ -14,11 +48,12 @@ class Plotter:
         # Add labels and title
         ax.set_xlabel(xlabel)
         ax.set_ylabel(ylabel)
-        ax.set_title('Bar Chart with Labels')
-        plt.xticks(rotation=45, ha='right')
-        plt.tight_layout()
+        ax.set_title(title)
+        Plotter._pyplot().setp(ax.get_xticklabels(), rotation=45, ha='right')
+        fig.tight_layout()
 
-        plt.show()
+        Plotter._finish_figure(fig, save_path)
+        return fig
 
     @staticmethod
     def polar_projection(a, b, theta):
@@ -37,13 +72,13 @@ class Plotter:
         return x, y
 
     @staticmethod
-    def plot_pie_chart(labels, data, figsize=(10, 10)):
-        fig, ax = plt.subplots(figsize=figsize, subplot_kw=dict(aspect="equal"))
+    def plot_pie_chart(labels, data, figsize=(10, 10), title=None, save_path=None, fig=None):
+        fig, ax = Plotter._prepare_figure(fig, figsize, aspect="equal")
         wedges, texts = ax.pie(data)
 
         bbox_props = dict(boxstyle="square,pad=0.3", fc="w", ec="k", lw=0.72)
         kw = dict(arrowprops=dict(arrowstyle="-"), bbox=bbox_props, zorder=0, va="center")
-        
+
         for i, p in enumerate(wedges):
             ang = (p.theta2 - p.theta1)/2. + p.theta1
             y = math.sin(ang * math.pi / 180)
@@ -55,4 +90,88 @@ class Plotter:
             xt, yt = Plotter.polar_projection(2, 1.5, ang * math.pi / 180)
             ax.annotate(labels[i], xy=(x, y), xytext=(xt, yt), horizontalalignment=horizontalalignment, **kw)
 
-        plt.show()
\ No newline at end of file
+        if title:
+            ax.set_title(title)
+
+        Plotter._finish_figure(fig, save_path)
+        return fig
+
+    @staticmethod
+    def _render_jobs(jobs, output_dir, image_format):
+        """
+        Render a chunk of chart jobs headlessly, reusing one figure per chart kind.
+
+        Args:
+            jobs (list): Chart job dicts (see render_batch)
+            output_dir (str): Destination directory
+            image_format (str): 'png' or 'svg'
+
+        Returns:
+            list: Paths of the written files
+        """
+        Plotter.use_headless_backend()
+        figures = {}
+        paths = []
+        for job in jobs:
+            save_path = os.path.join(output_dir, f"{job['name']}.{image_format}")
+            if job["kind"] == "pie":
+                figures["pie"] = Plotter.plot_pie_chart(
+                    list(job["labels"]), list(job["values"]),
+                    title=job.get("title"), save_path=save_path, fig=figures.get("pie")
+                )
+            else:
+                figures["bar"] = Plotter.plot_bar_chart(
+                    list(job["labels"]), list(job["values"]),
+                    xlabel=job.get("xlabel", "Errors"), ylabel=job.get("ylabel", "Frequency"),
+                    title=job.get("title", "Bar Chart with Labels"),
+                    save_path=save_path, fig=figures.get("bar")
+                )
+            paths.append(save_path)
+        plt = Plotter._pyplot()
+        for fig in figures.values():
+            plt.close(fig)
+        return paths
+
+    @staticmethod
+    def render_batch(jobs, output_dir, image_format="png", max_workers=None):
+        """
+        Render many charts to image files across a process pool.
+
+        Each job is a dict with 'kind' ('bar' or 'pie'), 'name' (file name
+        without extension), 'labels' and 'values', plus optional 'title',
+        'xlabel' and 'ylabel'. Jobs are split into one chunk per worker so
+        every worker reuses its figures instead of creating one per chart.
+
+        Args:
+            jobs (list): Chart job dicts
+            output_dir (str): Destination directory (created if missing)
+            image_format (str): 'png' or 'svg'
+            max_workers (int): Worker process count (defaults to CPU count)
+
+        Returns:
+            list: Paths of the written files, in job order
+
+        Raises:
+            ValueError: If the image format is not supported
+        """
+        if image_format not in Plotter.IMAGE_FORMATS:
+            raise ValueError(f"Unsupported image format: {image_format}")
+        if not jobs:
+            return []
+        os.makedirs(output_dir, exist_ok=True)
+
+        worker_count = min(max_workers or os.cpu_count() or 1, len(jobs))
+        if worker_count == 1:
+            return Plotter._render_jobs(jobs, output_dir, image_format)
+
+        chunks = [jobs[i::worker_count] for i in range(worker_count)]
+        with ProcessPoolExecutor(max_workers=worker_count) as executor:
+            chunk_paths = list(executor.map(
+                Plotter._render_jobs, chunks, [output_dir] * worker_count, [image_format] * worker_count
+            ))
+
+        # Restore job order from the interleaved chunks
+        paths = [None] * len(jobs)
+        for offset, chunk_result in enumerate(chunk_paths):
+            paths[offset::worker_count] = chunk_result
+        return paths
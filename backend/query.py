@@ -0,0 +1,259 @@
+import numbers
+import numpy as np
+import pandas as pd
+
+class Query:
+    """
+    Lazy, chainable query over one DataHandler frame ('ecl', 'ecf', 'dmp').
+
+    Every method returns a new Query; nothing is read until collect(). The
+    plan's columns and predicates are pushed down to DataHandler.scan, which
+    reads only those columns (and, for datasets opened with load_dataset,
+    only the matching Parquet partitions), so the final result is the only
+    frame materialised. Results are cached per plan on the DataHandler.
+
+    Example:
+        dh.query("ecl").description("AXLE3_LOCK").where("Speed(km/h)", ">", 30) \\
+            .select("Date", "Time", "Speed(km/h)").collect()
+    """
+
+    OPERATORS = ("==", "!=", "<", "<=", ">", ">=", "in", "not in", "between", "contains")
+    # Aggregations that need numbers; ECL text columns are converted first
+    NUMERIC_AGGREGATIONS = ("sum", "mean", "median", "min", "max", "std", "var", "prod")
+
+    def __init__(self, data_handler, frame="ecl", _plan=None):
+        """
+        Args:
+            data_handler (DataHandler): Data to query
+            frame (str): 'ecl', 'ecf' or 'dmp'
+        """
+        self.__data_handler = data_handler
+        self.__plan = _plan or {
+            "frame": frame, "select": None, "filters": (), "group_by": None,
+            "agg": None, "sort": None, "limit": None,
+        }
+
+    def __with(self, **changes):
+        return Query(self.__data_handler, _plan={**self.__plan, **changes})
+
+    def select(self, *columns):
+        """Keep only these columns."""
+        return self.__with(select=tuple(columns))
+
+    def where(self, column, op, value):
+        """
+        Keep rows where `column op value`. Conditions are ANDed.
+
+        Args:
+            column (str): Column name ('date' is available on ECL and DMP
+                frames as YYYY-MM-DD)
+            op (str): One of Query.OPERATORS; 'between' takes a (low, high)
+                pair, inclusive
+            value: Comparison value; numbers compare numerically even on text columns
+
+        Raises:
+            ValueError: If the operator is not supported
+        """
+        if op not in self.OPERATORS:
+            raise ValueError(f"Unsupported operator: {op}")
+        if op in ("in", "not in", "between"):
+            value = tuple(value)
+        return self.__with(filters=self.__plan["filters"] + ((column, op, value),))
+
+    def code(self, *codes):
+        """Keep rows with one of these error codes (e.g. '0x0037')."""
+        return self.where("Code(hex)", "in", codes)
+
+    def description(self, *descriptions):
+        """Keep rows with one of these descriptions (e.g. 'AXLE3_LOCK')."""
+        return self.where("Description", "in", descriptions)
+
+    def dates(self, start=None, end=None):
+        """Keep rows dated between start and end (inclusive, 'YYYY-MM-DD' or datetime)."""
+        query = self
+        if start is not None:
+            query = query.where("date", ">=", pd.Timestamp(start).strftime("%Y-%m-%d"))
+        if end is not None:
+            query = query.where("date", "<=", pd.Timestamp(end).strftime("%Y-%m-%d"))
+        return query
+
+    def group_by(self, *columns):
+        """Group rows by these columns before aggregating."""
+        return self.__with(group_by=tuple(columns))
+
+    def agg(self, **aggregations):
+        """
+        Aggregate, pandas named-aggregation style, e.g. Frequency=("Description", "size").
+
+        Numeric aggregations (see NUMERIC_AGGREGATIONS) of text columns such
+        as ECL 'Speed(km/h)' compare and add the values as numbers.
+        collect() raises ValueError if such a column holds values that are
+        not numbers (e.g. 'Ticks(hex)' or 'Code(hex)').
+        """
+        return self.__with(agg=tuple(sorted(aggregations.items())))
+
+    def count(self, name="Frequency"):
+        """Count rows (per group when grouped)."""
+        return self.__with(agg=(("__count__", name),))
+
+    def sort(self, column, ascending=True):
+        return self.__with(sort=(column, ascending))
+
+    def limit(self, n):
+        return self.__with(limit=int(n))
+
+    def key(self):
+        """Hashable identity of the plan (used as the result cache key)."""
+        return tuple(sorted(self.__plan.items()))
+
+    def columns_needed(self):
+        """
+        Columns the scan must read, or None for every column.
+
+        Returns:
+            list | None: Projection pushed down to the scan
+        """
+        plan = self.__plan
+        if plan["agg"] is not None:
+            columns = list(plan["group_by"] or ())
+            if plan["agg"][0][0] != "__count__":
+                columns += [column for _, (column, _) in plan["agg"]]
+        elif plan["select"] is not None:
+            columns = list(plan["select"])
+            if plan["sort"] is not None:
+                columns.append(plan["sort"][0])
+        else:
+            return None
+        return list(dict.fromkeys(columns))
+
+    def explain(self):
+        """Describe what collect() will read and compute."""
+        plan = self.__plan
+        lines = [
+            f"scan {plan['frame']} columns={self.columns_needed() or 'all'}",
+            f"  filters={list(plan['filters']) or 'none'} (pushed into the scan)",
+        ]
+        if plan["agg"] is not None:
+            lines.append(f"  aggregate {dict(plan['agg'])} by {list(plan['group_by'] or [])}")
+        if plan["select"] is not None and plan["agg"] is None:
+            lines.append(f"  project {list(plan['select'])}")
+        if plan["sort"] is not None:
+            lines.append(f"  sort by {plan['sort'][0]} {'asc' if plan['sort'][1] else 'desc'}")
+        if plan["limit"] is not None:
+            lines.append(f"  limit {plan['limit']}")
+        return "\n".join(lines)
+
+    def collect(self):
+        """
+        Execute the plan (or return the cached result of an identical plan).
+
+        Returns:
+            pd.DataFrame: The result
+        """
+        return self.__data_handler.run_query(self)
+
+    def execute(self):
+        """Execute the plan without the cache (called by DataHandler.run_query)."""
+        plan = self.__plan
+        df = self.__data_handler.scan(plan["frame"], self.columns_needed(), list(plan["filters"]))
+
+        if plan["agg"] is not None:
+            if plan["agg"][0][0] == "__count__":
+                name = plan["agg"][0][1]
+                if plan["group_by"]:
+                    df = df.groupby(list(plan["group_by"]), observed=True, sort=False).size().reset_index(name=name)
+                else:
+                    df = pd.DataFrame({name: [len(df)]})
+            else:
+                df = self.numeric_columns(df, plan["agg"])
+                if plan["group_by"]:
+                    df = df.groupby(list(plan["group_by"]), observed=True, sort=False).agg(**dict(plan["agg"])).reset_index()
+                else:
+                    df = pd.DataFrame({name: [df[column].agg(func)] for name, (column, func) in plan["agg"]})
+        if plan["sort"] is not None:
+            df = df.sort_values(plan["sort"][0], ascending=plan["sort"][1], kind="stable")
+        if plan["select"] is not None and plan["agg"] is None:
+            df = df[list(plan["select"])]
+        if plan["limit"] is not None:
+            df = df.head(plan["limit"])
+        return df.reset_index(drop=True)
+
+    @staticmethod
+    def numeric_columns(df, aggregations):
+        """
+        Convert the text columns of numeric aggregations to numbers.
+
+        Args:
+            df (pd.DataFrame): Scanned rows
+            aggregations (tuple): (name, (column, func)) pairs
+
+        Returns:
+            pd.DataFrame: df, with those columns converted
+
+        Raises:
+            ValueError: If such a column holds values that are not numbers
+        """
+        columns = {
+            column: func for _, (column, func) in aggregations
+            if func in Query.NUMERIC_AGGREGATIONS and not pd.api.types.is_numeric_dtype(df[column])
+            and not pd.api.types.is_datetime64_any_dtype(df[column])
+        }
+        converted = {}
+        for column, func in columns.items():
+            # Same conversion as numeric filters (see mask)
+            values = pd.to_numeric(df[column].astype(object), errors="coerce")
+            if (values.isna() & df[column].notna()).any():
+                raise ValueError(f"Cannot compute {func} of non-numeric column '{column}'")
+            converted[column] = values
+        return df.assign(**converted) if converted else df
+
+    @staticmethod
+    def mask(df, filters):
+        """
+        Evaluate ANDed (column, op, value) filters on a frame.
+
+        Returns:
+            np.ndarray | None: Boolean row mask, or None when there are no filters
+        """
+        mask = None
+        for column, op, value in filters:
+            series = df[column]
+            values = value if op in ("in", "not in", "between") else (value,)
+            if series.dtype == object and all(isinstance(v, numbers.Number) for v in values):
+                # ECL fields are text; compare numbers numerically
+                series = pd.to_numeric(series, errors="coerce")
+            if op == "==":
+                condition = series == value
+            elif op == "!=":
+                condition = series != value
+            elif op == "<":
+                condition = series < value
+            elif op == "<=":
+                condition = series <= value
+            elif op == ">":
+                condition = series > value
+            elif op == ">=":
+                condition = series >= value
+            elif op == "in":
+                condition = series.isin(value)
+            elif op == "not in":
+                condition = ~series.isin(value)
+            elif op == "between":
+                condition = series.between(value[0], value[1])
+            else:
+                condition = series.astype(str).str.contains(str(value), regex=False)
+            condition = np.asarray(condition, dtype=bool)
+            mask = condition if mask is None else mask & condition
+        return mask
+
+    @staticmethod
+    def pushable(filter_term, partition_columns):
+        """
+        Whether a filter can be evaluated by the Parquet reader: any filter on
+        a partition column, and text equality/membership on other columns.
+        """
+        column, op, value = filter_term
+        if column in partition_columns:
+            return op in ("==", "!=", "<", "<=", ">", ">=", "in", "not in")
+        values = value if op in ("in", "not in") else (value,)
+        return op in ("==", "!=", "in", "not in") and all(isinstance(v, str) for v in values)
@@ -0,0 +1,390 @@
+import os
+import sys
+import gzip
+import json
+import hashlib
+import logging
+import argparse
+import threading
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+import numpy as np
+import pandas as pd
+from backend.data_handler import DataHandler
+from backend.utils.parquet_dataset import ParquetDataset
+from backend.utils.exceptions import DMPFilterError
+
+class QueryService:
+    """
+    JSON query service over datasets loaded once through DataHandler.
+
+    Routes (GET):
+        /datasets                              Loaded datasets
+        /datasets/<name>                       Row counts, files and time range
+        /datasets/<name>/summary/<kind>        ecl, ecf, dmp, valves, diagnostics,
+                                               segments or transitions
+        /datasets/<name>/ecl?code=&description=&from=&to=&columns=&offset=&limit=
+        /datasets/<name>/ecf?code=&description=&offset=&limit=
+        /datasets/<name>/dmp?start=&end=&where=&columns=&offset=&limit=
+                                               Rows of the stitched DMP timeline between
+                                               start and end seconds, optionally
+                                               filtered by a DMPFilter expression
+        /stats                                 Request and cache counters
+
+    Repeated parameters (code=a&code=b) or comma separated values select
+    several codes, descriptions or columns. Responses are cached per dataset
+    version, path and parameters; each carries an ETag so clients can
+    revalidate with If-None-Match and get 304 Not Modified without a body.
+    Datasets are read-only once loaded, so requests are served concurrently.
+    """
+
+    SUMMARIES = {
+        "ecl": "ecl_freq_summary",
+        "ecf": "ecf",
+        "dmp": "dmp_freq_summary",
+        "valves": "valve_activation_summary",
+        "diagnostics": "diagnostic_freq_summary",
+        "segments": "dmp_segments",
+        "transitions": "dmp_transitions",
+    }
+    DEFAULT_PAGE_SIZE = 100
+    MAX_PAGE_SIZE = 5000
+    CACHE_SIZE = 256
+    GZIP_MIN_BYTES = 1024
+
+    def __init__(self, cache_size=CACHE_SIZE):
+        """
+        Args:
+            cache_size (int): Responses kept in the LRU response cache
+        """
+        self.cache_size = cache_size
+        self.__datasets = {}
+        self.__versions = {}
+        self.__cache = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__counters = {"requests": 0, "hits": 0, "misses": 0, "not_modified": 0, "errors": 0}
+
+    def add_dataset(self, name, source):
+        """
+        Load (or replace) a dataset.
+
+        Args:
+            name (str): Name used in URLs
+            source (str | DataHandler): A folder of CSV files, a dataset
+                written by DataHandler.export_dataset, or a loaded handler
+
+        Returns:
+            DataHandler: The loaded handler
+        """
+        if isinstance(source, str):
+            if os.path.exists(os.path.join(source, ParquetDataset.MANIFEST)):
+                handler = DataHandler.load_dataset(source)
+            else:
+                handler = DataHandler(source, show_progress=False)
+        else:
+            handler = source
+        # Load lazy summaries now, not in the first concurrent requests
+        for attribute in self.SUMMARIES.values():
+            getattr(handler, attribute)
+        with self.__lock:
+            self.__datasets[name] = handler
+            self.__versions[name] = self.__versions.get(name, 0) + 1
+            self.__invalidate(name)
+        logging.info("Query service loaded dataset %s", name)
+        return handler
+
+    def remove_dataset(self, name):
+        with self.__lock:
+            self.__datasets.pop(name, None)
+            self.__invalidate(name)
+
+    def __invalidate(self, name):
+        # The dataset's responses and the dataset listing (cached under None)
+        for key in [key for key in self.__cache if key[0] in (name, None)]:
+            del self.__cache[key]
+
+    def stats(self):
+        with self.__lock:
+            return dict(self.__counters, cached=len(self.__cache), datasets=len(self.__datasets))
+
+    def handle(self, path, query="", if_none_match=None, accept_gzip=False):
+        """
+        Answer one GET request (independent of the HTTP server, for tests and embedding).
+
+        Args:
+            path (str): URL path, e.g. '/datasets/unit_42/summary/ecl'
+            query (str): URL query string
+            if_none_match (str): If-None-Match request header
+            accept_gzip (bool): Whether the client accepts gzip encoding
+
+        Returns:
+            tuple: (HTTP status, headers dict, body bytes)
+        """
+        params = {key: values for key, values in parse_qs(query, keep_blank_values=False).items()}
+        parts = [part for part in path.split("/") if part]
+        dataset = parts[1] if len(parts) > 1 and parts[0] == "datasets" else None
+        with self.__lock:
+            self.__counters["requests"] += 1
+            version = self.__versions.get(dataset)
+        key = (dataset, version, tuple(parts), tuple(sorted((k, tuple(v)) for k, v in params.items())))
+
+        if parts == ["stats"]:
+            entry = self.__entry(json.dumps(self.stats()).encode("utf-8"))
+        else:
+            with self.__lock:
+                entry = self.__cache.get(key)
+                if entry is not None:
+                    self.__cache.move_to_end(key)
+                    self.__counters["hits"] += 1
+            if entry is None:
+                try:
+                    entry = self.__entry(self.__route(parts, params))
+                except LookupError as e:
+                    return self.__error(HTTPStatus.NOT_FOUND, str(e).strip("'\""))
+                except (ValueError, DMPFilterError) as e:
+                    return self.__error(HTTPStatus.BAD_REQUEST, str(e))
+                except Exception as e:
+                    # One broken request must not take down the serving thread
+                    logging.exception("Query service failed on /%s", "/".join(parts))
+                    return self.__error(HTTPStatus.INTERNAL_SERVER_ERROR, f"Internal error: {type(e).__name__}")
+                with self.__lock:
+                    self.__counters["misses"] += 1
+                    self.__cache[key] = entry
+                    while len(self.__cache) > self.cache_size:
+                        self.__cache.popitem(last=False)
+
+        compress = accept_gzip and len(entry["body"]) >= self.GZIP_MIN_BYTES
+        # Each encoding is its own representation, with its own strong ETag
+        etag = entry["etag"][:-1] + '-gz"' if compress else entry["etag"]
+        headers = {"ETag": etag, "Cache-Control": "no-cache", "Content-Type": "application/json",
+                   "Vary": "Accept-Encoding"}
+        if if_none_match and self.__etag_matches(if_none_match, etag):
+            with self.__lock:
+                self.__counters["not_modified"] += 1
+            return HTTPStatus.NOT_MODIFIED, headers, b""
+        body = entry["body"]
+        if compress:
+            if entry.get("gzip") is None:
+                entry["gzip"] = gzip.compress(body, compresslevel=5)
+            body = entry["gzip"]
+            headers["Content-Encoding"] = "gzip"
+        return HTTPStatus.OK, headers, body
+
+    @staticmethod
+    def __entry(body):
+        return {"etag": '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"', "body": body}
+
+    @staticmethod
+    def __etag_matches(header, etag):
+        tags = [tag.strip() for tag in header.split(",")]
+        return "*" in tags or etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+    def __error(self, status, message):
+        with self.__lock:
+            self.__counters["errors"] += 1
+        body = json.dumps({"error": message, "status": int(status)}).encode("utf-8")
+        return status, {"Content-Type": "application/json", "Cache-Control": "no-store"}, body
+
+    def __route(self, parts, params):
+        if parts in ([], ["datasets"]):
+            with self.__lock:
+                names = list(self.__datasets)
+            return self.__json({"datasets": [self.__info(name) for name in names]})
+        if parts[0] != "datasets":
+            raise LookupError(f"Unknown path: /{'/'.join(parts)}")
+        if len(parts) == 2:
+            return self.__json(self.__info(parts[1]))
+
+        handler = self.__handler(parts[1])
+        if parts[2] == "summary" and len(parts) == 4:
+            if parts[3] not in self.SUMMARIES:
+                raise LookupError(f"Unknown summary: {parts[3]} (expected one of {', '.join(self.SUMMARIES)})")
+            summary = getattr(handler, self.SUMMARIES[parts[3]])
+            if isinstance(summary, pd.Series):
+                summary = summary.rename_axis("Name").reset_index(name="Value")
+            return self.__page(parts[1], summary, {"limit": [str(self.MAX_PAGE_SIZE)], **params})
+        if len(parts) == 3 and parts[2] in ("ecl", "ecf"):
+            return self.__page(parts[1], self.__events(handler, parts[2], params), params)
+        if len(parts) == 3 and parts[2] == "dmp":
+            return self.__page(parts[1], self.__dmp_slice(handler, params), params)
+        raise LookupError(f"Unknown path: /{'/'.join(parts)}")
+
+    def __handler(self, name):
+        with self.__lock:
+            handler = self.__datasets.get(name)
+        if handler is None:
+            raise LookupError(f"Unknown dataset: {name}")
+        return handler
+
+    def __info(self, name):
+        handler = self.__handler(name)
+        info = {
+            "name": name,
+            "version": self.__versions.get(name),
+            "files": len(handler.stats.files),
+            "rows": {frame: len(getattr(handler, frame)) for frame in ("ecl", "ecf", "dmp")},
+        }
+        if "Timestamp" in handler.ecl.columns and not handler.ecl.empty:
+            info["ecl_range"] = [str(handler.ecl["Timestamp"].min()), str(handler.ecl["Timestamp"].max())]
+        if not handler.dmp_segments.empty:
+            info["dmp_timeline_seconds"] = float(handler.dmp_segments["End (s)"].max())
+        return info
+
+    @staticmethod
+    def __values(params, name):
+        values = []
+        for value in params.get(name, []):
+            values += [item.strip() for item in value.split(",") if item.strip()]
+        return values
+
+    @staticmethod
+    def __number(params, name, default=None, cast=float):
+        if name not in params:
+            return default
+        try:
+            return cast(params[name][-1])
+        except ValueError:
+            raise ValueError(f"Parameter '{name}' must be a number") from None
+
+    def __events(self, handler, frame, params):
+        query = handler.query(frame)
+        codes, descriptions = self.__values(params, "code"), self.__values(params, "description")
+        if codes:
+            query = query.code(*codes)
+        if descriptions:
+            query = query.description(*descriptions)
+        if frame == "ecl" and ("from" in params or "to" in params):
+            try:
+                query = query.dates(params.get("from", [None])[-1], params.get("to", [None])[-1])
+            except (ValueError, TypeError):
+                raise ValueError("Parameters 'from' and 'to' must be dates (YYYY-MM-DD)") from None
+        columns = self.__values(params, "columns")
+        if columns:
+            unknown = [column for column in columns if column not in getattr(handler, frame).columns]
+            if unknown:
+                raise ValueError(f"Unknown {frame.upper()} column(s): {', '.join(unknown)}")
+            query = query.select(*columns)
+        try:
+            return query.collect()
+        except KeyError as e:
+            raise ValueError(f"Unknown column: {e}") from None
+
+    def __dmp_slice(self, handler, params):
+        columns = self.__values(params, "columns") or None
+        if columns is not None:
+            unknown = [column for column in columns if column not in handler.dmp.columns]
+            if unknown:
+                raise ValueError(f"Unknown DMP column(s): {', '.join(unknown)}")
+        rows = handler.dmp_time_range(self.__number(params, "start"), self.__number(params, "end"), columns)
+        if "where" in params and not rows.empty:
+            mask = pd.Series(handler.dmp_filter().mask(params["where"][-1]), index=handler.dmp.index)
+            rows = rows[mask.loc[rows.index].to_numpy()]
+        return rows
+
+    def __page(self, name, df, params):
+        offset = self.__number(params, "offset", 0, int)
+        limit = self.__number(params, "limit", self.DEFAULT_PAGE_SIZE, int)
+        if offset < 0 or limit < 0:
+            raise ValueError("Parameters 'offset' and 'limit' must not be negative")
+        limit = min(limit, self.MAX_PAGE_SIZE)
+        page = df.iloc[offset:offset + limit]
+        if isinstance(page.index, pd.RangeIndex) or page.empty:
+            page = page.reset_index(drop=True)
+        else:
+            page = page.reset_index(names="Row")
+        # Compose around pandas' own JSON writer rather than re-encoding the rows
+        header = json.dumps({"dataset": name, "total": len(df), "offset": offset, "limit": limit,
+                             "columns": [str(column) for column in page.columns]})
+        rows = page.to_json(orient="records", date_format="iso", default_handler=str) if not page.empty else "[]"
+        return (header[:-1] + ',"rows":' + rows + "}").encode("utf-8")
+
+    @staticmethod
+    def __json(data):
+        def default(value):
+            if isinstance(value, np.generic):
+                return value.item()
+            return str(value)
+        return json.dumps(data, default=default).encode("utf-8")
+
+    def make_server(self, host="127.0.0.1", port=8765):
+        """
+        Create (but do not start) a threaded HTTP server for this service.
+
+        Returns:
+            ThreadingHTTPServer: Call serve_forever() to run it
+        """
+        server = ThreadingHTTPServer((host, port), QueryRequestHandler)
+        server.daemon_threads = True
+        server.service = self
+        return server
+
+class QueryRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "ErrorAnalyzerQuery/1.0"
+
+    def do_GET(self):
+        self.__send(*self.__handle())
+
+    def do_HEAD(self):
+        # Same representation (and ETag) as the matching GET, without the body
+        status, headers, body = self.__handle()
+        headers["Content-Length"] = str(len(body))
+        self.__send(status, headers, b"", content_length=False)
+
+    def __handle(self):
+        url = urlsplit(self.path)
+        return self.server.service.handle(
+            url.path, url.query,
+            if_none_match=self.headers.get("If-None-Match"),
+            accept_gzip="gzip" in self.headers.get("Accept-Encoding", ""),
+        )
+
+    def __send(self, status, headers, body, content_length=True):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if content_length:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Per-request lines would swamp the log at high request rates
+        logging.debug("%s - %s", self.address_string(), format % args)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve processed datasets as JSON over HTTP.")
+    parser.add_argument("datasets", nargs="+",
+                        help="CSV folders or exported datasets, optionally named as NAME=PATH")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port (default: 8765)")
+    parser.add_argument("--cache-size", type=int, default=QueryService.CACHE_SIZE,
+                        help=f"Responses kept in the cache (default: {QueryService.CACHE_SIZE})")
+    args = parser.parse_args(argv)
+
+    service = QueryService(cache_size=args.cache_size)
+    for dataset in args.datasets:
+        name, _, path = dataset.rpartition("=")
+        name = name or os.path.basename(os.path.normpath(path))
+        try:
+            service.add_dataset(name, path)
+        except (FileNotFoundError, NotADirectoryError, PermissionError, ImportError) as e:
+            print(f"Error loading {path}: {e}")
+            return 1
+        print(f"Loaded {name} from {path}")
+
+    server = service.make_server(args.host, args.port)
+    print(f"Serving on http://{args.host}:{server.server_address[1]}/datasets (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
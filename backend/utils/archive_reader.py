@@ -0,0 +1,284 @@
+import io
+import os
+import gzip
+import lzma
+import shutil
+import logging
+import tarfile
+import weakref
+import zipfile
+import tempfile
+import importlib.util
+from backend.utils.file_source import FileSource
+
+class ArchiveMember(io.RawIOBase):
+    """
+    Read-only stream over one decompressed CSV (a compressed file or an
+    archive member), decompressed on the fly as it is read.
+
+    The stream is opened lazily; seeking backwards (e.g. the classifier's
+    rewind) reopens it, so members never have to be extracted to disk or
+    held fully in memory.
+    """
+
+    def __init__(self, name, opener, size=None):
+        """
+        Args:
+            name (str): Display name, e.g. 'bundle.zip/Error 1.csv'
+            opener (callable): Returns a fresh binary stream of the decompressed data
+            size (int): Uncompressed size in bytes when the container records it,
+                otherwise the compressed size
+        """
+        super().__init__()
+        self.name = name
+        self.size = size
+        self.__opener = opener
+        self.__stream = None
+        self.__position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        if self.__stream is None:
+            self.__stream = self.__opener()
+        data = self.__stream.read(len(buffer))
+        buffer[:len(data)] = data
+        self.__position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.__position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.__position
+        elif whence != io.SEEK_SET:
+            raise io.UnsupportedOperation("ArchiveMember only supports seeking from the start")
+        if offset < self.__position:
+            self.__close_stream()
+            self.__position = 0
+        while self.__position < offset:
+            if not self.read(min(offset - self.__position, 1 << 20)):
+                break
+        return self.__position
+
+    def close(self):
+        self.__close_stream()
+        super().close()
+
+    def __close_stream(self):
+        if self.__stream is not None:
+            self.__stream.close()
+            self.__stream = None
+
+class ArchiveReader:
+    # Single compressed files, by suffix; zstd needs the optional 'zstandard' package
+    COMPRESSED_SUFFIXES = (".gz", ".xz", ".zst")
+    ARCHIVE_SUFFIXES = (".zip", ".tar", ".tgz", ".tar.gz", ".tar.xz", ".txz", ".tar.zst")
+    # Members of compressed tars are kept in memory up to this total, then spooled to temporary files
+    SPOOL_MEMORY_BYTES = 256 * 1024 * 1024
+
+    @staticmethod
+    def is_supported(name):
+        """Return True for plain CSVs, compressed CSVs and archives."""
+        name = name.lower()
+        return (
+            name.endswith(".csv")
+            or name.endswith(ArchiveReader.ARCHIVE_SUFFIXES)
+            or any(name.endswith(".csv" + suffix) for suffix in ArchiveReader.COMPRESSED_SUFFIXES)
+        )
+
+    @staticmethod
+    def expand(sources):
+        """
+        Replace compressed files and archives by streams of the CSVs they contain.
+
+        Plain CSV paths and buffers are returned unchanged. Unreadable archives
+        and zstd input without the 'zstandard' package are logged and skipped.
+
+        Args:
+            sources (list): File paths or file-like objects with a `name`
+
+        Returns:
+            list: File paths, buffers and ArchiveMember streams
+        """
+        expanded = []
+        for source in sources:
+            name = FileSource.name(source)
+            lower = name.lower()
+            try:
+                if lower.endswith(".zip"):
+                    expanded.extend(ArchiveReader.__zip_members(source, name))
+                elif lower.endswith(ArchiveReader.ARCHIVE_SUFFIXES):
+                    expanded.extend(ArchiveReader.__tar_members(source, name))
+                elif lower.endswith(ArchiveReader.COMPRESSED_SUFFIXES):
+                    member = ArchiveReader.__compressed_file(source, name)
+                    if member is not None:
+                        expanded.append(member)
+                else:
+                    expanded.append(source)
+            except (OSError, zipfile.BadZipFile, tarfile.TarError) as e:
+                logging.error("Error opening archive %s: %s", name, e)
+        return expanded
+
+    @staticmethod
+    def __raw_opener(source):
+        """Return a callable giving the raw source: the path, or an independent in-memory stream."""
+        if not FileSource.is_buffer(source):
+            return lambda: source
+        # BytesIO over the same bytes object shares it instead of copying
+        data = source.getvalue() if isinstance(source, io.BytesIO) else FileSource.rewind(source).read()
+        return lambda: io.BytesIO(data)
+
+    @staticmethod
+    def __decompress(suffix, raw):
+        """Open a path or raw stream through the decompressor for a suffix."""
+        if suffix in (".gz", ".tgz"):
+            return gzip.open(raw, "rb")
+        if suffix in (".xz", ".txz"):
+            return lzma.open(raw, "rb")
+        stream = open(raw, "rb") if isinstance(raw, str) else raw
+        if suffix == ".zst":
+            import zstandard
+            return zstandard.ZstdDecompressor().stream_reader(stream, closefd=True)
+        return stream
+
+    @staticmethod
+    def __zstd_available(name):
+        if importlib.util.find_spec("zstandard") is None:
+            logging.error("Cannot read %s: zstd input requires the 'zstandard' package", name)
+            return False
+        return True
+
+    @staticmethod
+    def __compressed_file(source, name):
+        suffix = os.path.splitext(name.lower())[1]
+        if suffix == ".zst" and not ArchiveReader.__zstd_available(name):
+            return None
+        raw_opener = ArchiveReader.__raw_opener(source)
+        return ArchiveMember(
+            name[:-len(suffix)],
+            lambda: ArchiveReader.__decompress(suffix, raw_opener()),
+            FileSource.size(source)
+        )
+
+    @staticmethod
+    def __is_csv_member(member_name):
+        base = os.path.basename(member_name)
+        return base.lower().endswith(".csv") and not base.startswith(".") and "__MACOSX" not in member_name
+
+    @staticmethod
+    def __zip_members(source, name):
+        # Zip members are compressed independently, so they can be streamed in parallel
+        archive = zipfile.ZipFile(ArchiveReader.__raw_opener(source)())
+        members = [
+            ArchiveMember(
+                os.path.join(name, info.filename),
+                lambda info=info: archive.open(info),
+                info.file_size
+            )
+            for info in archive.infolist()
+            if not info.is_dir() and ArchiveReader.__is_csv_member(info.filename)
+        ]
+        # The members' openers hold the only references to the archive; close
+        # the file under it (ZipFile.close leaves a file object it was given
+        # open) once the last member is released
+        weakref.finalize(archive, _close_quietly, archive.fp)
+        return members
+
+    @staticmethod
+    def __tar_members(source, name):
+        lower = name.lower()
+        suffix = next(s for s in (".tar.gz", ".tgz", ".tar.xz", ".txz", ".tar.zst", ".tar") if lower.endswith(s))
+        suffix = suffix[len(".tar"):] if suffix.startswith(".tar.") else suffix
+        if suffix == ".zst" and not ArchiveReader.__zstd_available(name):
+            return []
+        raw_opener = ArchiveReader.__raw_opener(source)
+
+        if suffix == ".tar":
+            # Uncompressed: index the headers once, then read each member in
+            # place from its data offset
+            with ArchiveReader.__decompress(suffix, raw_opener()) as stream, \
+                    tarfile.open(fileobj=stream, mode="r:") as archive:
+                members = [
+                    (info.name, info.offset_data, info.size) for info in archive
+                    if info.isfile() and ArchiveReader.__is_csv_member(info.name)
+                ]
+            return [
+                ArchiveMember(
+                    os.path.join(name, member_name),
+                    lambda offset=offset, size=size: _BoundedStream(
+                        ArchiveReader.__decompress(suffix, raw_opener()), offset, size
+                    ),
+                    size
+                )
+                for member_name, offset, size in members
+            ]
+
+        # Compressed tars can only be read front to back: decompress once and
+        # spool each member as it streams past, so members are read (hashed,
+        # classified, parsed) from the spool instead of re-decompressing
+        budget = {"memory_bytes": ArchiveReader.SPOOL_MEMORY_BYTES}
+        spooled = []
+        with ArchiveReader.__decompress(suffix, raw_opener()) as stream, \
+                tarfile.open(fileobj=stream, mode="r|") as archive:
+            for info in archive:
+                if info.isfile() and ArchiveReader.__is_csv_member(info.name):
+                    spooled.append(ArchiveReader.__spool(
+                        os.path.join(name, info.name), archive.extractfile(info), info.size, budget
+                    ))
+        return spooled
+
+    @staticmethod
+    def __spool(member_name, stream, size, budget):
+        """
+        Copy one streamed member into memory (while the budget lasts) or a
+        temporary file, and return an ArchiveMember reading from the copy.
+        """
+        if size <= budget["memory_bytes"]:
+            budget["memory_bytes"] -= size
+            data = stream.read()
+            return ArchiveMember(member_name, lambda: io.BytesIO(data), size)
+
+        descriptor, path = tempfile.mkstemp(prefix="archive_member_", suffix=".csv")
+        with os.fdopen(descriptor, "wb") as spool:
+            shutil.copyfileobj(stream, spool, 1 << 20)
+        member = ArchiveMember(member_name, lambda: open(path, "rb"), size)
+        # The spool lives as long as the member that reads it
+        weakref.finalize(member, _remove_quietly, path)
+        return member
+
+class _BoundedStream:
+    """Reads `size` bytes starting at `offset` of a seekable stream, then closes it."""
+
+    def __init__(self, stream, offset, size):
+        stream.seek(offset)
+        self.__stream = stream
+        self.__remaining = size
+
+    def read(self, size=-1):
+        if size is None or size < 0 or size > self.__remaining:
+            size = self.__remaining
+        data = self.__stream.read(size)
+        self.__remaining -= len(data)
+        return data
+
+    def close(self):
+        self.__stream.close()
+
+def _close_quietly(*streams):
+    for stream in streams:
+        try:
+            stream.close()
+        except Exception:
+            pass
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,86 @@
+import csv
+import logging
+from collections import Counter
+
+class ColumnStreamer:
+    ECL_LISTING_MARKER = "ERROR CODE LISTING"
+    ECF_SECTION_MARKER = "ERROR CODE FREQUENCY"
+
+    @staticmethod
+    def iter_column(file_path, column_name, encoding="utf-8"):
+        """
+        Stream the values of one column without loading the file into memory.
+
+        Handles both ECL-style reports (title line, LEGEND block and a ';'
+        separated listing that ends at the ERROR CODE FREQUENCY section) and
+        plain comma separated CSVs. The column is matched case-insensitively.
+
+        Args:
+            file_path (str): Path to the CSV file
+            column_name (str): Name of the column to read
+            encoding (str): Text encoding of the file
+
+        Yields:
+            str: Non-empty values of the column, in file order
+        """
+        wanted = column_name.strip().lower()
+        with open(file_path, "r", encoding=encoding, errors="replace", newline="") as f:
+            first_line = f.readline()
+            if ColumnStreamer.ECL_LISTING_MARKER in first_line:
+                yield from ColumnStreamer.__iter_ecl_column(f, wanted, file_path)
+            else:
+                yield from ColumnStreamer.__iter_csv_column(first_line, f, wanted, file_path)
+
+    @staticmethod
+    def __iter_ecl_column(lines, wanted, file_path):
+        # Skip the LEGEND block until the ';' separated header row
+        index = None
+        for line in lines:
+            if ";" not in line:
+                continue
+            header = [name.strip().lower() for name in line.rstrip("\r\n").split(";")]
+            if wanted not in header:
+                logging.warning("Column '%s' not found in ECL listing header: %s", wanted, file_path)
+                return
+            index = header.index(wanted)
+            break
+        if index is None:
+            return
+
+        for line in lines:
+            if ColumnStreamer.ECF_SECTION_MARKER in line:
+                break
+            fields = line.rstrip("\r\n").split(";")
+            if len(fields) > index and fields[index]:
+                yield fields[index]
+
+    @staticmethod
+    def __iter_csv_column(header_line, lines, wanted, file_path):
+        delimiter = ";" if header_line.count(";") > header_line.count(",") else ","
+        header = [name.strip().lower() for name in next(csv.reader([header_line], delimiter=delimiter), [])]
+        if wanted not in header:
+            logging.warning("Column '%s' not found in CSV header: %s", wanted, file_path)
+            return
+        index = header.index(wanted)
+
+        for fields in csv.reader(lines, delimiter=delimiter):
+            if len(fields) > index and fields[index]:
+                yield fields[index]
+
+    @staticmethod
+    def count_column(file_path, column_name):
+        """
+        Count the values of one column in a single file.
+
+        Args:
+            file_path (str): Path to the CSV file
+            column_name (str): Name of the column to count
+
+        Returns:
+            Counter: Value frequencies, empty if the file cannot be read
+        """
+        try:
+            return Counter(ColumnStreamer.iter_column(file_path, column_name))
+        except OSError as e:
+            logging.error("Error streaming file %s: %s", file_path, e)
+            return Counter()
@@ -0,0 +1,224 @@
+import ast
+import logging
+import operator
+import threading
+import importlib.util
+from collections import OrderedDict
+import numpy as np
+from backend.utils.exceptions import DMPFilterError
+
+class CompiledFilter:
+    """
+    A parsed and validated filter expression.
+
+    Attributes:
+        expression (str): The expression as written
+        key (str): Normalised form, equal for equivalent spellings
+        columns (list): DMP columns the expression reads
+    """
+
+    def __init__(self, expression, tree, columns):
+        self.expression = expression
+        self.tree = tree
+        self.key = ast.dump(tree)
+        self.columns = columns
+
+class DMPFilter:
+    """
+    Filter expressions over DMP channels, e.g.
+
+        REF_SPEED > 200 and FILL_2 == 1 and ACC_3 < -20
+        abs(REF_SPEED - SPEED_1) >= 30 or not DEV_ON
+
+    Supported: column names, numbers, + - * / %, abs(), comparisons
+    (chained too), and/or/not and parentheses. Expressions are parsed once,
+    validated against the frame's columns and evaluated on the referenced
+    columns only (with numexpr when it is installed, numpy otherwise).
+    Masks are cached per expression, so counting matches and then fetching
+    the rows evaluates it once.
+    """
+
+    CACHE_SIZE = 32
+    MAX_LENGTH = 1000
+
+    __BINARY = {ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul,
+                ast.Div: operator.truediv, ast.Mod: operator.mod}
+    __COMPARE = {ast.Eq: operator.eq, ast.NotEq: operator.ne, ast.Lt: operator.lt,
+                 ast.LtE: operator.le, ast.Gt: operator.gt, ast.GtE: operator.ge}
+    __NUMEXPR_BINARY = {ast.Add: "+", ast.Sub: "-", ast.Mult: "*", ast.Div: "/", ast.Mod: "%"}
+    __NUMEXPR_COMPARE = {ast.Eq: "==", ast.NotEq: "!=", ast.Lt: "<", ast.LtE: "<=", ast.Gt: ">", ast.GtE: ">="}
+
+    def __init__(self, df_dmp):
+        """
+        Args:
+            df_dmp (pd.DataFrame): DMP rows to filter
+        """
+        self.__df = df_dmp
+        self.__numeric = {
+            col for col in df_dmp.columns
+            if isinstance(col, str) and df_dmp[col].dtype.kind in "biuf"
+        }
+        self.__cache = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__use_numexpr = importlib.util.find_spec("numexpr") is not None
+
+    @property
+    def columns(self):
+        """Columns usable in expressions."""
+        return sorted(self.__numeric)
+
+    def compile(self, expression):
+        """
+        Parse and validate an expression.
+
+        Returns:
+            CompiledFilter: The compiled expression
+
+        Raises:
+            DMPFilterError: On syntax errors, unsupported constructs or unknown columns
+        """
+        if not expression or not expression.strip():
+            raise DMPFilterError("Empty filter expression")
+        if len(expression) > self.MAX_LENGTH:
+            raise DMPFilterError(f"Filter expression longer than {self.MAX_LENGTH} characters")
+        try:
+            tree = ast.parse(expression.strip(), mode="eval").body
+        except SyntaxError as e:
+            raise DMPFilterError(f"Invalid filter expression: {e.msg}") from None
+
+        columns = []
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Name) and node.id != "abs":
+                if node.id not in self.__numeric:
+                    raise DMPFilterError(f"Unknown DMP column: {node.id}")
+                columns.append(node.id)
+            elif isinstance(node, ast.Call):
+                if not (isinstance(node.func, ast.Name) and node.func.id == "abs"
+                        and len(node.args) == 1 and not node.keywords):
+                    raise DMPFilterError("Only abs(<expression>) calls are supported")
+            elif isinstance(node, ast.Constant):
+                if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+                    raise DMPFilterError(f"Only numeric constants are supported: {node.value!r}")
+            elif isinstance(node, ast.BinOp) and type(node.op) not in self.__BINARY:
+                raise DMPFilterError(f"Unsupported operator: {type(node.op).__name__}")
+            elif isinstance(node, ast.UnaryOp) and not isinstance(node.op, (ast.Not, ast.USub, ast.UAdd)):
+                raise DMPFilterError(f"Unsupported operator: {type(node.op).__name__}")
+            elif isinstance(node, ast.Compare) and any(type(op) not in self.__COMPARE for op in node.ops):
+                raise DMPFilterError("Only ==, !=, <, <=, > and >= comparisons are supported")
+            elif not isinstance(node, (ast.Name, ast.Call, ast.Constant, ast.BinOp, ast.UnaryOp,
+                                       ast.Compare, ast.BoolOp, ast.Load, ast.And, ast.Or,
+                                       *self.__BINARY, *self.__COMPARE, ast.Not, ast.USub, ast.UAdd)):
+                raise DMPFilterError(f"Unsupported syntax: {type(node).__name__}")
+        return CompiledFilter(expression, tree, list(dict.fromkeys(columns)))
+
+    def mask(self, expression):
+        """
+        Boolean row mask for an expression (cached).
+
+        Args:
+            expression (str | CompiledFilter): Filter expression
+
+        Returns:
+            np.ndarray: One boolean per row
+        """
+        compiled = expression if isinstance(expression, CompiledFilter) else self.compile(expression)
+        with self.__lock:
+            if compiled.key in self.__cache:
+                self.__cache.move_to_end(compiled.key)
+                return self.__cache[compiled.key]
+
+        arrays = {col: self.__df[col].to_numpy() for col in compiled.columns}
+        result = None
+        if self.__use_numexpr:
+            try:
+                import numexpr
+                result = numexpr.evaluate(self.__to_numexpr(compiled.tree), local_dict=arrays)
+            except Exception as e:
+                logging.debug("numexpr could not evaluate %r, using numpy: %s", compiled.expression, e)
+        if result is None:
+            result = self.__evaluate(compiled.tree, arrays)
+        result = np.broadcast_to(np.asarray(result, dtype=bool), (len(self.__df),))
+
+        with self.__lock:
+            self.__cache[compiled.key] = result
+            while len(self.__cache) > self.CACHE_SIZE:
+                self.__cache.popitem(last=False)
+        return result
+
+    def count(self, expression):
+        """Number of matching rows, without materialising them."""
+        return int(np.count_nonzero(self.mask(expression)))
+
+    def apply(self, expression, frame=None):
+        """
+        Matching rows.
+
+        Args:
+            expression (str | CompiledFilter): Filter expression
+            frame (pd.DataFrame): Frame to take the rows from instead of the
+                DMP frame; must share its index (e.g. filtered_dmp)
+
+        Returns:
+            pd.DataFrame: Rows where the expression holds
+        """
+        mask = self.mask(expression)
+        if frame is None:
+            return self.__df[mask]
+        return frame.loc[self.__df.index[mask]]
+
+    def __evaluate(self, node, arrays):
+        if isinstance(node, ast.Name):
+            return arrays[node.id]
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, ast.Call):
+            return np.abs(self.__evaluate(node.args[0], arrays))
+        if isinstance(node, ast.BinOp):
+            return self.__BINARY[type(node.op)](self.__evaluate(node.left, arrays), self.__evaluate(node.right, arrays))
+        if isinstance(node, ast.UnaryOp):
+            operand = self.__evaluate(node.operand, arrays)
+            if isinstance(node.op, ast.Not):
+                return ~np.asarray(operand, dtype=bool)
+            return -operand if isinstance(node.op, ast.USub) else operand
+        if isinstance(node, ast.Compare):
+            result, left = True, self.__evaluate(node.left, arrays)
+            for op, comparator in zip(node.ops, node.comparators):
+                right = self.__evaluate(comparator, arrays)
+                result = result & self.__COMPARE[type(op)](left, right)
+                left = right
+            return result
+        # BoolOp
+        values = [np.asarray(self.__evaluate(value, arrays), dtype=bool) for value in node.values]
+        reduce = np.logical_and.reduce if isinstance(node.op, ast.And) else np.logical_or.reduce
+        return reduce(values)
+
+    def __to_numexpr(self, node):
+        if isinstance(node, ast.Name):
+            return node.id
+        if isinstance(node, ast.Constant):
+            return repr(node.value)
+        if isinstance(node, ast.Call):
+            return f"abs({self.__to_numexpr(node.args[0])})"
+        if isinstance(node, ast.BinOp):
+            return f"({self.__to_numexpr(node.left)} {self.__NUMEXPR_BINARY[type(node.op)]} {self.__to_numexpr(node.right)})"
+        if isinstance(node, ast.UnaryOp):
+            operand = self.__to_numexpr(node.operand)
+            if isinstance(node.op, ast.Not):
+                return f"~{self.__numexpr_bool(node.operand)}"
+            return f"(-{operand})" if isinstance(node.op, ast.USub) else operand
+        if isinstance(node, ast.Compare):
+            parts, left = [], self.__to_numexpr(node.left)
+            for op, comparator in zip(node.ops, node.comparators):
+                right = self.__to_numexpr(comparator)
+                parts.append(f"({left} {self.__NUMEXPR_COMPARE[type(op)]} {right})")
+                left = right
+            return "(" + " & ".join(parts) + ")"
+        joiner = " & " if isinstance(node.op, ast.And) else " | "
+        return "(" + joiner.join(self.__numexpr_bool(value) for value in node.values) + ")"
+
+    def __numexpr_bool(self, node):
+        # numexpr only combines booleans with & | ~, so test plain values against 0
+        expression = self.__to_numexpr(node)
+        if isinstance(node, (ast.Compare, ast.BoolOp)) or (isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not)):
+            return expression
+        return f"({expression} != 0)"
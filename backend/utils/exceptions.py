@@ -1,3 +1,11 @@
 class FileProcessingError(Exception):
     """Custom exception for file processing errors."""
-    pass
\ No newline at end of file
+    pass
+
+class DMPFilterError(ValueError):
+    """Raised when a DMP filter expression is invalid for the DMP schema."""
+    pass
+
+class IngestionCancelled(Exception):
+    """Raised when reading a dataset is cancelled before all files are read."""
+    pass
@@ -2,6 +2,7 @@ import os
 import logging
 import pandas as pd
 from backend.utils.file_types import FileClasses
+from backend.utils.file_source import FileSource
 
 class FileClassifier:
     @staticmethod
@@ -10,27 +11,31 @@ class FileClassifier:
         Determine file class with more robust type detection.
         
         Args:
-            file_path (str): Path to the CSV file
+            file_path (str | file-like): Path to the CSV file, or an in-memory buffer
+                (rewound before and after reading its header)
         
         Returns:
             FileClasses: Detected file class
         """
         try:
-            # Validate file existence and readability
-            if not os.path.exists(file_path):
-                logging.warning(f"File does not exist: {file_path}")
-                return FileClasses.UNKNOWN
-            
-            if not os.access(file_path, os.R_OK):
-                logging.warning(f"Cannot read file: {file_path}")
-                return FileClasses.UNKNOWN
+            # Validate file existence and readability (buffers are already in memory)
+            if not FileSource.is_buffer(file_path):
+                if not os.path.exists(file_path):
+                    logging.warning("File does not exist: %s", file_path)
+                    return FileClasses.UNKNOWN
+
+                if not os.access(file_path, os.R_OK):
+                    logging.warning("Cannot read file: %s", file_path)
+                    return FileClasses.UNKNOWN
 
             # Read with error handling
             try:
-                df = pd.read_csv(file_path, nrows=50, low_memory=False)
+                df = pd.read_csv(FileSource.rewind(file_path), nrows=50, low_memory=False)
             except Exception as e:
-                logging.error(f"Error reading file {file_path}: {e}")
+                logging.error("Error reading file %s: %s", FileSource.name(file_path), e)
                 return FileClasses.UNKNOWN
+            finally:
+                FileSource.rewind(file_path)
 
             file_type_and_col_names = {
                 FileClasses.ECL_ECF: ["ERROR CODE LISTING", "Code(hex)", "Ticks(hex)"],
@@ -46,6 +51,6 @@ class FileClassifier:
             return FileClasses.UNKNOWN
 
         except Exception as e:
-            logging.error(f"Unexpected error in file classification: {e}")
+            logging.error("Unexpected error in file classification: %s", e)
             return FileClasses.UNKNOWN
 
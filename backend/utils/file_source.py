@@ -0,0 +1,69 @@
+import io
+import os
+import hashlib
+
+class FileSource:
+    """
+    Helpers that let readers accept either a file path or an in-memory
+    file-like object (e.g. a Streamlit UploadedFile or io.BytesIO).
+    """
+
+    @staticmethod
+    def is_buffer(source):
+        """Return True if source is a file-like object rather than a path."""
+        return hasattr(source, "read")
+
+    @staticmethod
+    def name(source):
+        """Return the path, or the buffer's `name` attribute when it has one."""
+        if FileSource.is_buffer(source):
+            return getattr(source, "name", None) or f"<{type(source).__name__}>"
+        return source
+
+    @staticmethod
+    def size(source):
+        """Return the size in bytes without reading the buffer."""
+        if not FileSource.is_buffer(source):
+            return os.path.getsize(source)
+        if getattr(source, "size", None) is not None:
+            return source.size
+        if isinstance(source, io.BytesIO):
+            return source.getbuffer().nbytes
+        position = source.tell()
+        size = source.seek(0, io.SEEK_END)
+        source.seek(position)
+        return size
+
+    @staticmethod
+    def rewind(source):
+        """Seek a buffer back to its start so it can be read again; paths are returned unchanged."""
+        if FileSource.is_buffer(source):
+            source.seek(0)
+        return source
+
+    @staticmethod
+    def digest(source, chunk_size=1 << 20):
+        """
+        Return a blake2b hash of the content, read in chunks.
+
+        Args:
+            source (str | file-like): File path or buffer (rewound afterwards)
+            chunk_size (int): Bytes read per chunk
+
+        Returns:
+            str: Hex digest
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        if isinstance(source, io.BytesIO):
+            digest.update(source.getbuffer())
+            return digest.hexdigest()
+        if FileSource.is_buffer(source):
+            FileSource.rewind(source)
+            while chunk := source.read(chunk_size):
+                digest.update(chunk)
+            FileSource.rewind(source)
+        else:
+            with open(source, "rb") as stream:
+                while chunk := stream.read(chunk_size):
+                    digest.update(chunk)
+        return digest.hexdigest()
@@ -0,0 +1,299 @@
+import math
+import heapq
+import hashlib
+from collections import Counter
+from itertools import islice
+import numpy as np
+
+class CountMinSketch:
+    """
+    Count-Min sketch: approximate counts of any item in fixed memory.
+
+    Estimates never undercount. With width w and depth d, an estimate
+    exceeds the true count by more than (e / w) * total with probability
+    at most e^-d. That bound needs the rows' hashes to be independent, so
+    each row uses BLAKE2b with its own salt (a seeded CRC is affine in its
+    seed: items colliding in one row would collide in every row). Salts are
+    fixed, so sketches built in different processes use the same buckets and
+    merge by adding their tables.
+    """
+
+    def __init__(self, width=2048, depth=4):
+        if width < 1 or depth < 1:
+            raise ValueError("Count-Min width and depth must be positive")
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self.__table = np.zeros((depth, width), dtype=np.int64)
+        self.__salts = [row.to_bytes(hashlib.blake2b.SALT_SIZE, "little") for row in range(depth)]
+
+    @property
+    def epsilon(self):
+        """Relative overestimate bound (fraction of the total)."""
+        return math.e / self.width
+
+    @property
+    def delta(self):
+        """Probability that an estimate exceeds the bound."""
+        return math.exp(-self.depth)
+
+    def __buckets(self, item):
+        data = str(item).encode("utf-8", "replace")
+        return [
+            int.from_bytes(hashlib.blake2b(data, digest_size=8, salt=salt).digest(), "little") % self.width
+            for salt in self.__salts
+        ]
+
+    def update(self, counts):
+        """
+        Add weighted items.
+
+        Args:
+            counts (Mapping): Item -> count
+        """
+        if not counts:
+            return
+        columns = np.array([self.__buckets(item) for item in counts], dtype=np.int64)
+        weights = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+        for row in range(self.depth):
+            np.add.at(self.__table[row], columns[:, row], weights)
+        self.total += int(weights.sum())
+
+    def estimate(self, item):
+        """Upper bound on the item's count (exact if no other item collides)."""
+        return int(min(self.__table[row, column] for row, column in enumerate(self.__buckets(item))))
+
+    def merge(self, other):
+        """Add another sketch of the same shape into this one."""
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Cannot merge Count-Min sketches of different shapes")
+        self.__table += other.__table
+        self.total += other.total
+        return self
+
+    def to_dict(self):
+        return {"width": self.width, "depth": self.depth, "total": self.total, "table": self.__table.tolist()}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data["width"], data["depth"])
+        sketch.total = data["total"]
+        sketch.__table = np.asarray(data["table"], dtype=np.int64).reshape(sketch.depth, sketch.width)
+        return sketch
+
+class SpaceSaving:
+    """
+    Space-Saving summary: the most frequent items among at most `capacity`
+    counters.
+
+    Every item whose true count exceeds total / capacity is tracked, and
+    each tracked count overestimates the truth by at most its recorded
+    error (itself at most total / capacity). When all counters are in use,
+    a new item replaces the smallest counter and inherits its count as
+    error.
+    """
+
+    def __init__(self, capacity=1000):
+        if capacity < 1:
+            raise ValueError("Space-Saving capacity must be positive")
+        self.capacity = capacity
+        self.total = 0
+        self.__counts = {}
+        self.__errors = {}
+        # Lazy min-heap of (count, item); entries go stale as counts grow
+        self.__heap = []
+
+    def update(self, counts):
+        """
+        Add weighted items.
+
+        Args:
+            counts (Mapping): Item -> count
+        """
+        for item, weight in counts.items():
+            self.total += weight
+            if item in self.__counts:
+                self.__counts[item] += weight
+            elif len(self.__counts) < self.capacity:
+                self.__insert(item, weight, 0)
+            else:
+                minimum, evicted = self.__pop_min()
+                del self.__errors[evicted]
+                self.__insert(item, minimum + weight, minimum)
+
+    def __insert(self, item, count, error):
+        self.__counts[item] = count
+        self.__errors[item] = error
+        heapq.heappush(self.__heap, (count, item))
+
+    def __pop_min(self):
+        while True:
+            count, item = heapq.heappop(self.__heap)
+            current = self.__counts.get(item)
+            if current is None:
+                continue
+            if current != count:
+                heapq.heappush(self.__heap, (current, item))
+                continue
+            del self.__counts[item]
+            return count, item
+
+    @property
+    def minimum(self):
+        """Smallest tracked count when full (an upper bound for untracked items), else 0."""
+        if len(self.__counts) < self.capacity:
+            return 0
+        return min(self.__counts.values())
+
+    def items(self):
+        """(item, count, error) for every tracked item, most frequent first."""
+        return sorted(((item, count, self.__errors[item]) for item, count in self.__counts.items()),
+                      key=lambda entry: (-entry[1], str(entry[0])))
+
+    def merge(self, other):
+        """
+        Combine with another summary of the same capacity.
+
+        Items missing from a full summary are counted with that summary's
+        minimum as error, which keeps the total / capacity bound.
+        """
+        mine_min, other_min = self.minimum, other.minimum
+        counts, errors = {}, {}
+        for item in set(self.__counts) | set(other.__counts):
+            counts[item] = self.__counts.get(item, mine_min) + other.__counts.get(item, other_min)
+            errors[item] = self.__errors.get(item, mine_min) + other.__errors.get(item, other_min)
+        kept = heapq.nlargest(self.capacity, counts, key=lambda item: (counts[item], str(item)))
+        self.__counts = {item: counts[item] for item in kept}
+        self.__errors = {item: errors[item] for item in kept}
+        self.__heap = [(count, item) for item, count in self.__counts.items()]
+        heapq.heapify(self.__heap)
+        self.total += other.total
+        return self
+
+    def to_dict(self):
+        return {"capacity": self.capacity, "total": self.total,
+                "items": [[item, count, error] for item, count, error in self.items()]}
+
+    @classmethod
+    def from_dict(cls, data):
+        summary = cls(data["capacity"])
+        for item, count, error in data["items"]:
+            summary.__insert(item, count, error)
+        summary.total = data["total"]
+        return summary
+
+class HeavyHitters:
+    """
+    Streaming top-K of values (e.g. ECL error descriptions) in fixed memory.
+
+    Values are consumed in chunks and never kept: each chunk is counted, and
+    the counts go to a Space-Saving summary (approximate top-K with per-item
+    error bounds), a Count-Min sketch (a second, independent upper bound for
+    any value) and exact counters for an optional tracked set. Memory depends
+    only on the capacity, the sketch size and the tracked set, not on the
+    number of rows. Summaries of separate files or units can be merged.
+    """
+
+    CHUNK_SIZE = 65536
+
+    def __init__(self, capacity=1000, width=2048, depth=4, tracked=()):
+        """
+        Args:
+            capacity (int): Space-Saving counters (top-K needs capacity >> K)
+            width (int): Count-Min sketch width
+            depth (int): Count-Min sketch depth
+            tracked (iterable): Values whose exact counts are always kept
+        """
+        self.space_saving = SpaceSaving(capacity)
+        self.count_min = CountMinSketch(width, depth)
+        self.tracked = Counter({value: 0 for value in tracked})
+
+    @property
+    def total(self):
+        return self.space_saving.total
+
+    @property
+    def error_bound(self):
+        """
+        Largest possible overcount of any Space-Saving estimate: 0 until all
+        counters are in use, then the smallest counter (at most total / capacity).
+        """
+        return self.space_saving.minimum
+
+    def update(self, values):
+        """
+        Consume values from an iterable (e.g. ColumnStreamer.iter_column).
+
+        Returns:
+            HeavyHitters: self
+        """
+        values = iter(values)
+        while True:
+            chunk = Counter(islice(values, self.CHUNK_SIZE))
+            if not chunk:
+                return self
+            self.update_counts(chunk)
+
+    def update_counts(self, counts):
+        """Consume pre-counted values (Mapping value -> count)."""
+        self.space_saving.update(counts)
+        self.count_min.update(counts)
+        for value in self.tracked.keys() & counts.keys():
+            self.tracked[value] += counts[value]
+        return self
+
+    def estimate(self, value):
+        """Upper bound on a value's count (exact for tracked values)."""
+        if value in self.tracked:
+            return self.tracked[value]
+        return self.count_min.estimate(value)
+
+    def top(self, k=20):
+        """
+        The k most frequent values.
+
+        Returns:
+            list: Dicts with 'value', 'count' (best estimate), 'lower' and
+            'upper' bounds on the true count, 'exact', and 'guaranteed' (True
+            when the value is certainly among the true top k), by count
+        """
+        rows = {}
+        for value, count, error in self.space_saving.items():
+            # Both structures overcount, so the smaller estimate is the tighter bound
+            upper = min(count, self.count_min.estimate(value))
+            rows[value] = {"value": value, "count": upper, "lower": count - error, "upper": upper}
+        for value, count in self.tracked.items():
+            if count:
+                rows[value] = {"value": value, "count": count, "lower": count, "upper": count}
+        ranked = sorted(rows.values(), key=lambda row: (-row["count"], -row["lower"], str(row["value"])))
+        top, rest = ranked[:k], ranked[k:]
+
+        # Untracked values are bounded by the smallest Space-Saving counter
+        outside = max([row["upper"] for row in rest] + [self.space_saving.minimum])
+        for row in top:
+            row["exact"] = row["lower"] == row["upper"]
+            row["guaranteed"] = row["lower"] >= outside
+        return top
+
+    def merge(self, other):
+        """Add another summary built with the same parameters."""
+        if self.tracked.keys() != other.tracked.keys():
+            # A value tracked on one side only would get an exact count that misses the other side
+            raise ValueError("Cannot merge heavy hitters summaries with different tracked values")
+        self.space_saving.merge(other.space_saving)
+        self.count_min.merge(other.count_min)
+        self.tracked.update(other.tracked)
+        return self
+
+    def to_dict(self):
+        """Plain-data form, e.g. to return from a worker process."""
+        return {"space_saving": self.space_saving.to_dict(), "count_min": self.count_min.to_dict(),
+                "tracked": dict(self.tracked)}
+
+    @classmethod
+    def from_dict(cls, data):
+        hitters = cls.__new__(cls)
+        hitters.space_saving = SpaceSaving.from_dict(data["space_saving"])
+        hitters.count_min = CountMinSketch.from_dict(data["count_min"])
+        hitters.tracked = Counter(data["tracked"])
+        return hitters
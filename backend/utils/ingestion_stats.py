@@ -0,0 +1,205 @@
+import io
+import time
+import pstats
+import cProfile
+import threading
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+import pandas as pd
+
+class IngestionStats:
+    PROFILE_LINES = 25
+    TOP_ALLOCATIONS = 10
+
+    def __init__(self, profile=False, trace_memory=False):
+        """
+        Collect timing, size and memory measurements for one ingestion run.
+
+        Args:
+            profile (bool): Capture a cProfile report of the whole run. cProfile
+                only sees the thread it runs on, so DataHandler parses files
+                on the calling thread while profiling
+            trace_memory (bool): Capture peak memory and top allocations with tracemalloc
+        """
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.spans = {}
+        self.files = []
+        self.frames = {}
+        self.dropped_rows = {"ecl": 0, "dmp": 0}
+        self.total_seconds = 0.0
+        self.profile_report = None
+        self.memory_peak_bytes = None
+        self.top_allocations = []
+        self.__profiler = None
+        self.__started_tracing = False
+        self.__start = None
+        self.__stop = None
+        # (start, end) of every span call, for the wall-clock time of each stage
+        self.__intervals = {}
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def span_of(stats, name):
+        """Return stats.span(name), or a no-op context when stats is None."""
+        return stats.span(name) if stats is not None else nullcontext()
+
+    @contextmanager
+    def span(self, name):
+        """
+        Time a block of work. Repeated spans with the same name are summed,
+        including spans from parallel worker threads, so a stage's seconds can
+        exceed its wall-clock time; span_table reports both.
+
+        Args:
+            name (str): Stage name, e.g. 'parsing' or 'summary:ecl_frequency'
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self.__lock:
+                span = self.spans.setdefault(name, {"seconds": 0.0, "calls": 0})
+                span["seconds"] += end - start
+                span["calls"] += 1
+                self.__intervals.setdefault(name, []).append((start, end))
+
+    def wall_seconds(self, name, within_run=False):
+        """
+        Wall-clock time during which at least one `name` span was running.
+
+        Args:
+            name (str): Stage name
+            within_run (bool): Only count time between start() and stop()
+
+        Returns:
+            float: Seconds (overlapping calls from parallel threads count once)
+        """
+        with self.__lock:
+            intervals = sorted(self.__intervals.get(name, []))
+        low, high = (self.__start, self.__stop) if within_run else (None, None)
+        total, covered_until = 0.0, None
+        for start, end in intervals:
+            if low is not None:
+                start = max(start, low)
+            if high is not None:
+                end = min(end, high)
+            if covered_until is not None:
+                start = max(start, covered_until)
+            if end > start:
+                total += end - start
+            covered_until = end if covered_until is None else max(covered_until, end)
+        return total
+
+    def start(self):
+        """Start the overall clock and any optional profilers."""
+        self.__start = time.perf_counter()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.__started_tracing = True
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        if self.profile:
+            self.__profiler = cProfile.Profile()
+            self.__profiler.enable()
+
+    def stop(self):
+        """Stop the overall clock and collect profiler output."""
+        if self.__profiler is not None:
+            self.__profiler.disable()
+            buffer = io.StringIO()
+            pstats.Stats(self.__profiler, stream=buffer).sort_stats("cumulative").print_stats(self.PROFILE_LINES)
+            self.profile_report = buffer.getvalue()
+            self.__profiler = None
+        if self.trace_memory and tracemalloc.is_tracing():
+            self.memory_peak_bytes = tracemalloc.get_traced_memory()[1]
+            snapshot = tracemalloc.take_snapshot()
+            self.top_allocations = [
+                {"location": str(stat.traceback), "bytes": stat.size, "count": stat.count}
+                for stat in snapshot.statistics("lineno")[:self.TOP_ALLOCATIONS]
+            ]
+            if self.__started_tracing:
+                tracemalloc.stop()
+                self.__started_tracing = False
+        if self.__start is not None:
+            self.__stop = time.perf_counter()
+            self.total_seconds = self.__stop - self.__start
+
+    def record_file(self, file_path, file_type, size_bytes, rows, seconds, status="ok"):
+        """
+        Record the outcome of reading one file.
+
+        Args:
+            file_path (str): Path (or name) of the file
+            file_type (str): Detected file class name
+            size_bytes (int): File size in bytes
+            rows (int): Rows produced from the file
+            seconds (float): Time spent on the file
+            status (str): 'ok', 'skipped', 'duplicate' or 'error'
+        """
+        self.files.append({
+            "file": file_path,
+            "type": file_type,
+            "bytes": size_bytes,
+            "rows": rows,
+            "seconds": seconds,
+            "status": status,
+        })
+
+    def record_frame(self, name, df):
+        """
+        Record the shape and deep memory footprint of a resulting frame or series.
+
+        Args:
+            name (str): Attribute name, e.g. 'ecl'
+            df (pd.DataFrame | pd.Series): The frame to measure
+        """
+        memory = df.memory_usage(deep=True)
+        self.frames[name] = {
+            "rows": len(df),
+            "columns": df.shape[1] if df.ndim == 2 else 1,
+            "memory_bytes": int(memory.sum() if hasattr(memory, "sum") else memory),
+        }
+
+    def span_table(self):
+        """
+        Return spans as a dataframe. 'Seconds' sums every call (across worker
+        threads), 'Wall (s)' is the elapsed time the stage was running, and
+        'Share (%)' is the part of the ingestion run's wall-clock time it
+        covered (NaN for spans recorded outside the run, e.g. later queries).
+        Stages that run at the same time on different threads overlap, so
+        their shares can add up to more than 100%.
+        """
+        rows = []
+        for name, span in self.spans.items():
+            within_run = self.wall_seconds(name, within_run=True) if self.__stop is not None else 0.0
+            rows.append({
+                "Stage": name, "Seconds": span["seconds"], "Wall (s)": self.wall_seconds(name),
+                "Calls": span["calls"],
+                "Share (%)": 100 * within_run / self.total_seconds if within_run and self.total_seconds else float("nan"),
+            })
+        return pd.DataFrame(rows, columns=["Stage", "Seconds", "Wall (s)", "Calls", "Share (%)"])
+
+    def file_table(self):
+        """Return per-file measurements as a dataframe."""
+        return pd.DataFrame(self.files, columns=["file", "type", "bytes", "rows", "seconds", "status"])
+
+    def frame_table(self):
+        """Return resulting frame sizes as a dataframe."""
+        rows = [{"Frame": name, **info} for name, info in self.frames.items()]
+        return pd.DataFrame(rows, columns=["Frame", "rows", "columns", "memory_bytes"])
+
+    def to_dict(self):
+        """Return every measurement as plain Python data (JSON serialisable)."""
+        return {
+            "total_seconds": self.total_seconds,
+            "spans": self.spans,
+            "files": self.files,
+            "frames": self.frames,
+            "dropped_rows": self.dropped_rows,
+            "total_bytes": sum(f["bytes"] for f in self.files),
+            "memory_peak_bytes": self.memory_peak_bytes,
+            "top_allocations": self.top_allocations,
+            "profile_report": self.profile_report,
+        }
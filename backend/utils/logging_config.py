@@ -1,17 +1,125 @@
+import os
+import json
+import time
+import queue
+import atexit
 import logging
-import sys
-
-def configure_logging():
-    """Configure logging for the application."""
-    log_file = 'data_handler.log'
-    handlers = [logging.FileHandler(log_file)]
-
-    # Only add StreamHandler if running with console
-    # if sys.stdout is not None:
-    #     handlers.append(logging.StreamHandler())
-    
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(levelname)s: %(message)s',
-        handlers=handlers
-    )
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s: %(message)s'
+
+_lock = threading.Lock()
+_listener = None
+_queue_handler = None
+_configured_pid = None
+
+class RateLimitFilter(logging.Filter):
+    """
+    Let at most `burst` records per message template through every `interval`
+    seconds. Suppressed records are counted and the count is appended to the
+    next record of the same template that gets through.
+
+    Templates are the unformatted `record.msg`, so messages logged with
+    %-style arguments (e.g. logging.error("Error reading %s: %s", path, e))
+    share one budget regardless of the file name in them.
+    """
+
+    def __init__(self, burst=20, interval=10.0):
+        super().__init__()
+        self.burst = burst
+        self.interval = interval
+        self.__windows = {}
+        self.__lock = threading.Lock()
+
+    def filter(self, record):
+        key = (record.name, record.levelno, record.msg if isinstance(record.msg, str) else type(record.msg))
+        now = time.monotonic()
+        with self.__lock:
+            window_start, count, suppressed = self.__windows.get(key, (now, 0, 0))
+            if now - window_start >= self.interval:
+                window_start, count = now, 0
+            if count >= self.burst:
+                self.__windows[key] = (window_start, count, suppressed + 1)
+                return False
+            self.__windows[key] = (window_start, count + 1, 0)
+
+        if suppressed:
+            record.suppressed = suppressed
+            record.msg = f"{record.msg} [{suppressed} similar message(s) suppressed]"
+        return True
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line, including any `metrics` extra."""
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "suppressed", 0):
+            entry["suppressed"] = record.suppressed
+        if isinstance(getattr(record, "metrics", None), dict):
+            entry["metrics"] = record.metrics
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+def configure_logging(log_file='data_handler.log', json_format=None, level=logging.INFO):
+    """
+    Configure non-blocking logging for the application, once per process.
+
+    Records are put on an in-memory queue by a QueueHandler on the root
+    logger; a background QueueListener thread does the file writes, so the
+    ingestion loop never blocks on disk I/O. Repeated messages are rate
+    limited by RateLimitFilter. Later calls are no-ops, except in a forked
+    child process, where the inherited (listener-less) queue is replaced.
+
+    Args:
+        log_file (str): Log file path
+        json_format (bool): Write JSON lines instead of text. Defaults to the
+            ERROR_ANALYZER_LOG_JSON environment variable being set to '1'
+        level (int): Root logger level
+    """
+    global _listener, _queue_handler, _configured_pid
+
+    with _lock:
+        if _configured_pid == os.getpid():
+            return
+
+        root = logging.getLogger()
+        if _queue_handler is not None:
+            # Forked child: the parent's listener thread does not exist here
+            root.removeHandler(_queue_handler)
+
+        if json_format is None:
+            json_format = os.environ.get("ERROR_ANALYZER_LOG_JSON") == "1"
+
+        file_handler = logging.FileHandler(log_file)
+        file_handler.setFormatter(JsonFormatter() if json_format else logging.Formatter(LOG_FORMAT))
+        handlers = [file_handler]
+
+        # Only add StreamHandler if running with console
+        # if sys.stdout is not None:
+        #     handlers.append(logging.StreamHandler())
+
+        log_queue = queue.SimpleQueue()
+        _queue_handler = QueueHandler(log_queue)
+        _queue_handler.addFilter(RateLimitFilter())
+        _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+
+        root.setLevel(level)
+        root.addHandler(_queue_handler)
+        _configured_pid = os.getpid()
+
+def flush_logging():
+    """Block until every queued record has been written (e.g. before exit or in tests)."""
+    global _listener
+    with _lock:
+        if _listener is not None and _configured_pid == os.getpid():
+            _listener.stop()
+            _listener.start()
@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+from backend.data_processors.ecl_timestamps import ECLTimestamps
+
+class OverlapFilter:
+    """
+    Drop rows that repeat rows of previously merged files.
+
+    Every kept file contributes its key range and the hashes of its row keys.
+    A new file is only compared against earlier files whose range intersects
+    its own, so files covering different periods are merged without any
+    per-row lookups.
+
+    A report's ECF section counts the same events as its listing, so it is
+    adjusted along with the listing (see adjust_ecf).
+    """
+
+    # An ECL event is identified by its code and when it happened, not by its
+    # row number (reports are renumbered) or description text
+    ECL_KEY = ["Code(hex)", "Ticks(hex)", "Date", "Time"]
+    # DMP samples are identified by the module's tick counters
+    DMP_KEY = ["MOD_TICK", "MONTIME"]
+
+    def __init__(self):
+        self.__seen = {"ecl": [], "dmp": []}
+        self.dropped_rows = {"ecl": 0, "dmp": 0}
+        # ECF sections dropped (listing fully overlapped) or rebuilt (partly overlapped)
+        self.adjusted_ecf = {"dropped": 0, "rebuilt": 0}
+
+    def drop_ecl(self, df_ecl):
+        """
+        Drop ECL events already merged from another report.
+
+        Args:
+            df_ecl (pd.DataFrame): Formatted ECL rows of one file
+
+        Returns:
+            pd.DataFrame: Rows not seen in earlier files
+        """
+        if df_ecl.empty or not set(self.ECL_KEY).issubset(df_ecl.columns):
+            return df_ecl
+        if ECLTimestamps.COLUMN in df_ecl.columns:
+            timestamps = df_ecl[ECLTimestamps.COLUMN]
+        else:
+            timestamps = pd.Series(ECLTimestamps.parse_wall_clock(df_ecl["Date"], df_ecl["Time"]))
+        if timestamps.isna().any():
+            # Unparseable dates: compare against every earlier report
+            low, high = pd.Timestamp.min, pd.Timestamp.max
+        else:
+            low, high = timestamps.min(), timestamps.max()
+        return self.__drop("ecl", df_ecl, self.ECL_KEY, low, high)
+
+    def adjust_ecf(self, df_ecf, kept_ecl, listed_rows):
+        """
+        Keep a report's ECF counts consistent with its deduplicated listing.
+
+        If no listing row was dropped the ECF section is kept as is (it may
+        also count events the listing omits). If every row was dropped, the
+        events were already counted from an earlier report and the section
+        is dropped. If only some were, the section is rebuilt from the kept
+        listing rows (per code, keeping the section's descriptions).
+
+        Args:
+            df_ecf (pd.DataFrame): ECF rows of the report
+            kept_ecl (pd.DataFrame): The report's ECL rows left by drop_ecl
+            listed_rows (int): Number of ECL rows before drop_ecl
+
+        Returns:
+            pd.DataFrame: ECF rows to merge
+        """
+        if df_ecf.empty or len(kept_ecl) == listed_rows:
+            return df_ecf
+        if kept_ecl.empty:
+            self.adjusted_ecf["dropped"] += 1
+            return df_ecf.iloc[0:0]
+
+        self.adjusted_ecf["rebuilt"] += 1
+        counts = kept_ecl.groupby("Code(hex)", sort=False).agg(
+            Frequency=("Code(hex)", "size"), Description=("Description", "first")
+        )
+        if {"Code(hex)", "Description"}.issubset(df_ecf.columns):
+            descriptions = df_ecf.drop_duplicates("Code(hex)").set_index("Code(hex)")["Description"]
+            counts["Description"] = descriptions.reindex(counts.index).fillna(counts["Description"])
+        # Same layout and text dtype as ECFProcessor.format_ecf output
+        counts["Frequency"] = counts["Frequency"].astype(str)
+        columns = [col for col in df_ecf.columns if col in ("Code(hex)", "Frequency", "Description")]
+        return counts.reset_index()[columns or ["Code(hex)", "Frequency", "Description"]]
+
+    def drop_dmp(self, df_dmp):
+        """
+        Drop DMP samples already merged from an overlapping log.
+
+        Args:
+            df_dmp (pd.DataFrame): DMP rows of one file
+
+        Returns:
+            pd.DataFrame: Rows not seen in earlier files
+        """
+        if df_dmp.empty or not set(self.DMP_KEY).issubset(df_dmp.columns):
+            return df_dmp
+        ticks = df_dmp["MOD_TICK"]
+        return self.__drop("dmp", df_dmp, self.DMP_KEY, ticks.min(), ticks.max())
+
+    def __drop(self, kind, df, key_columns, low, high):
+        hashes = pd.util.hash_pandas_object(df[key_columns], index=False).to_numpy()
+        overlapping = [seen for seen in self.__seen[kind] if seen[0] <= high and low <= seen[1]]
+        if overlapping:
+            duplicate = np.isin(hashes, np.concatenate([seen[2] for seen in overlapping]))
+            if duplicate.any():
+                self.dropped_rows[kind] += int(duplicate.sum())
+                df = df[~duplicate]
+                hashes = hashes[~duplicate]
+        self.__seen[kind].append((low, high, hashes))
+        return df
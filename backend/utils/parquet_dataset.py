@@ -0,0 +1,247 @@
+import os
+import re
+import json
+import shutil
+import logging
+import importlib.util
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from backend.data_processors.ecl_timestamps import ECLTimestamps
+
+class ParquetDataset:
+    """
+    Partitioned Parquet layout for processed datasets:
+
+        <path>/manifest.json
+        <path>/ecl/date=YYYY-MM-DD/source=<file>/*.parquet
+        <path>/ecf/source=<file>/*.parquet
+        <path>/dmp/date=YYYY-MM-DD/source=<file>/*.parquet
+        <path>/summaries/<name>.parquet
+
+    Partitions use the hive layout, so readers prune whole directories when
+    filtering on date or source.
+    """
+
+    VERSION = 1
+    MANIFEST = "manifest.json"
+    SUMMARIES_DIR = "summaries"
+    DATE_COLUMN = "date"
+    SOURCE_PARTITION = "source"
+    UNKNOWN_DATE = "unknown"
+    PARTITIONS = {
+        "ecl": [DATE_COLUMN, SOURCE_PARTITION],
+        "ecf": [SOURCE_PARTITION],
+        "dmp": [DATE_COLUMN, SOURCE_PARTITION],
+    }
+    ECL_DATE_FORMAT = "%d/%m/%y"
+    # DMP rows carry no date; exports are named like 'log0058_2024-10-06 22-41-51.csv'
+    DMP_FILENAME_DATE = re.compile(r"(\d{4}-\d{2}-\d{2})")
+
+    @staticmethod
+    def require_pyarrow():
+        """
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        if importlib.util.find_spec("pyarrow") is None:
+            raise ImportError("Parquet datasets require the 'pyarrow' package")
+
+    @staticmethod
+    def partition_dates(name, df, source_column):
+        """
+        Return the date partition value of every row as YYYY-MM-DD strings.
+
+        Args:
+            name (str): 'ecl' or 'dmp'
+            df (pd.DataFrame): Frame to partition
+            source_column (str): Column holding each row's file name
+
+        Returns:
+            pd.Series: Date strings ('unknown' when no date is available)
+        """
+        if name == "ecl" and ECLTimestamps.COLUMN in df.columns:
+            # Format each distinct day once
+            days = df[ECLTimestamps.COLUMN].dt.floor("D")
+            codes, uniques = pd.factorize(days)
+            labels = np.append(pd.DatetimeIndex(uniques).strftime("%Y-%m-%d").to_numpy(dtype=object),
+                               ParquetDataset.UNKNOWN_DATE)
+            return pd.Series(labels[codes], index=df.index)
+        if name == "ecl" and "Date" in df.columns:
+            dates = pd.to_datetime(df["Date"], format=ParquetDataset.ECL_DATE_FORMAT, errors="coerce")
+            return dates.dt.strftime("%Y-%m-%d").fillna(ParquetDataset.UNKNOWN_DATE)
+        if source_column in df.columns:
+            # Parse each file name once rather than once per row
+            sources = df[source_column].astype("category")
+            dates = {
+                source: (match.group(1) if match else ParquetDataset.UNKNOWN_DATE)
+                for source, match in (
+                    (source, ParquetDataset.DMP_FILENAME_DATE.search(str(source)))
+                    for source in sources.cat.categories
+                )
+            }
+            return sources.map(dates).astype(str)
+        return pd.Series(ParquetDataset.UNKNOWN_DATE, index=df.index)
+
+    @staticmethod
+    def write(path, frames, summaries, source_column, metadata=None):
+        """
+        Write frames as partitioned Parquet datasets, plus summaries and a manifest.
+
+        Args:
+            path (str): Dataset directory (must be empty, missing, or a previous export)
+            frames (dict): 'ecl', 'ecf' and 'dmp' dataframes
+            summaries (dict): Summary dataframes, written unpartitioned
+            source_column (str): Column holding each row's file name
+            metadata (dict): Extra JSON-serialisable manifest entries
+
+        Returns:
+            dict: The manifest
+
+        Raises:
+            ImportError: If pyarrow is not installed
+            FileExistsError: If path is a non-empty directory that is not a dataset
+        """
+        ParquetDataset.require_pyarrow()
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        if os.path.isdir(path) and os.listdir(path):
+            if not os.path.exists(os.path.join(path, ParquetDataset.MANIFEST)):
+                raise FileExistsError(f"Refusing to overwrite non-dataset directory: {path}")
+            shutil.rmtree(path)
+        os.makedirs(path, exist_ok=True)
+
+        manifest = {
+            "version": ParquetDataset.VERSION,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "source_column": source_column,
+            "frames": {},
+            "summaries": {},
+            **(metadata or {}),
+        }
+
+        for name, df in frames.items():
+            if df is None or df.empty:
+                manifest["frames"][name] = {"rows": 0, "columns": [], "partitions": []}
+                continue
+            partitions = ParquetDataset.PARTITIONS[name]
+            table_df = df.copy(deep=False)
+            table_df.columns = table_df.columns.astype(str)
+            table_df[ParquetDataset.SOURCE_PARTITION] = (
+                table_df.pop(source_column).astype(str) if source_column in table_df.columns else "unknown"
+            )
+            if ParquetDataset.DATE_COLUMN in partitions:
+                table_df[ParquetDataset.DATE_COLUMN] = ParquetDataset.partition_dates(name, df, source_column)
+            table = pa.Table.from_pandas(table_df, preserve_index=False)
+            ds.write_dataset(
+                table,
+                os.path.join(path, name),
+                format="parquet",
+                partitioning=partitions,
+                partitioning_flavor="hive",
+                existing_data_behavior="overwrite_or_ignore",
+            )
+            manifest["frames"][name] = {
+                "rows": len(df),
+                "columns": [str(c) for c in df.columns],
+                "partitions": partitions,
+            }
+
+        os.makedirs(os.path.join(path, ParquetDataset.SUMMARIES_DIR), exist_ok=True)
+        for name, summary in summaries.items():
+            summary_df = summary.to_frame(name=summary.name or "value") if isinstance(summary, pd.Series) else summary
+            summary_df.to_parquet(os.path.join(path, ParquetDataset.SUMMARIES_DIR, f"{name}.parquet"))
+            manifest["summaries"][name] = {
+                "rows": len(summary_df),
+                "series": isinstance(summary, pd.Series),
+                "series_name": summary.name if isinstance(summary, pd.Series) else None,
+            }
+
+        with open(os.path.join(path, ParquetDataset.MANIFEST), "w") as f:
+            json.dump(manifest, f, indent=2, default=str)
+        logging.info("Exported dataset to %s: %s", path,
+                     ", ".join(f"{n} {info['rows']} rows" for n, info in manifest["frames"].items()))
+        return manifest
+
+    @staticmethod
+    def read_manifest(path):
+        """
+        Raises:
+            FileNotFoundError: If path is not an exported dataset
+        """
+        manifest_path = os.path.join(path, ParquetDataset.MANIFEST)
+        if not os.path.exists(manifest_path):
+            raise FileNotFoundError(f"No dataset manifest found in: {path}")
+        with open(manifest_path) as f:
+            return json.load(f)
+
+    @staticmethod
+    def read_frame(path, name, manifest, columns=None, filters=None):
+        """
+        Read one frame, loading only the requested columns and partitions.
+
+        Args:
+            path (str): Dataset directory
+            name (str): 'ecl', 'ecf' or 'dmp'
+            manifest (dict): The dataset manifest
+            columns (list): Columns to load; names missing from this frame are ignored
+            filters (list): (column, op, value) tuples, ANDed; terms on columns
+                missing from this frame are ignored. Filters on 'date' and
+                'source' prune partitions; others are applied while reading
+
+        Returns:
+            pd.DataFrame: The frame, with the source partition restored as the
+            (categorical) source column, and 'date' only when requested
+        """
+        ParquetDataset.require_pyarrow()
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+
+        info = manifest["frames"].get(name, {})
+        if not info.get("rows"):
+            return pd.DataFrame()
+        source_column = manifest["source_column"]
+        available = set(info["columns"]) | set(info["partitions"])
+
+        def physical(column):
+            return ParquetDataset.SOURCE_PARTITION if column == source_column else column
+
+        read_columns = None
+        if columns is not None:
+            read_columns = [physical(c) for c in columns if physical(c) in available or c in available]
+        frame_filters = [
+            (physical(column), op, value) for column, op, value in (filters or [])
+            if physical(column) in available
+        ]
+
+        table = pq.read_table(
+            os.path.join(path, name),
+            columns=read_columns,
+            filters=frame_filters or None,
+            # Partition values are always strings (e.g. a file named '123.csv')
+            partitioning=ds.partitioning(
+                pa.schema([(column, pa.string()) for column in info["partitions"]]), flavor="hive"
+            ),
+        )
+        df = table.to_pandas()
+        if ParquetDataset.SOURCE_PARTITION in df.columns:
+            # Categorical, as DataHandler builds the column when ingesting
+            df = df.rename(columns={ParquetDataset.SOURCE_PARTITION: source_column})
+            df[source_column] = df[source_column].astype("category")
+        if ParquetDataset.DATE_COLUMN in df.columns and (columns is None or ParquetDataset.DATE_COLUMN not in columns):
+            df = df.drop(columns=ParquetDataset.DATE_COLUMN)
+
+        # Restore the exported column order
+        order = [c for c in info["columns"] if c in df.columns]
+        return df[order + [c for c in df.columns if c not in order]]
+
+    @staticmethod
+    def read_summary(path, name, manifest):
+        """Read one stored summary (a Series if it was exported as one)."""
+        info = manifest["summaries"].get(name)
+        if info is None:
+            return None
+        df = pd.read_parquet(os.path.join(path, ParquetDataset.SUMMARIES_DIR, f"{name}.parquet"))
+        return df.iloc[:, 0].rename(info.get("series_name")) if info["series"] else df
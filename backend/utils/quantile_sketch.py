@@ -0,0 +1,147 @@
+import math
+import numpy as np
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with a relative error guarantee.
+
+    Values are counted in logarithmic buckets: bucket k holds magnitudes in
+    (gamma^(k-1), gamma^k] with gamma = (1 + a) / (1 - a), so every quantile
+    is returned within a relative error a of a true sample value. Two
+    sketches with the same accuracy merge by adding bucket counts, which
+    makes the result independent of how the data was split between workers.
+    Memory grows with the logarithm of the value range, not with the count.
+    """
+
+    DEFAULT_ACCURACY = 0.01
+    ZERO_THRESHOLD = 1e-9
+
+    def __init__(self, relative_accuracy=DEFAULT_ACCURACY):
+        """
+        Args:
+            relative_accuracy (float): Relative error bound a, 0 < a < 1
+
+        Raises:
+            ValueError: If the accuracy is out of range
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"Relative accuracy must be between 0 and 1: {relative_accuracy}")
+        self.relative_accuracy = relative_accuracy
+        self.__gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.__log_gamma = math.log(self.__gamma)
+        self.__positive = {}
+        self.__negative = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, values, weights=None):
+        """
+        Count an array of values (NaNs are ignored).
+
+        Args:
+            values (array-like): Values to count
+            weights (array-like): Integer count of each value (default 1), e.g.
+                distinct values and their frequencies
+
+        Returns:
+            QuantileSketch: self
+        """
+        values = np.asarray(values, dtype=float).ravel()
+        weights = np.ones(len(values), dtype=np.int64) if weights is None else np.asarray(weights, dtype=np.int64).ravel()
+        present = ~np.isnan(values)
+        values, weights = values[present], weights[present]
+        if not len(values):
+            return self
+        magnitude = np.abs(values)
+        zero = magnitude <= self.ZERO_THRESHOLD
+        self.zero_count += int(weights[zero].sum())
+        self.count += int(weights.sum())
+        for buckets, selected in ((self.__positive, (values > 0) & ~zero), (self.__negative, (values < 0) & ~zero)):
+            if not selected.any():
+                continue
+            keys = np.ceil(np.log(magnitude[selected]) / self.__log_gamma).astype(np.int64)
+            low = int(keys.min())
+            counts = np.bincount(keys - low, weights=weights[selected]).astype(np.int64)
+            for offset in np.flatnonzero(counts):
+                key = low + int(offset)
+                buckets[key] = buckets.get(key, 0) + int(counts[offset])
+        return self
+
+    def merge(self, other):
+        """
+        Add another sketch's counts to this one.
+
+        Returns:
+            QuantileSketch: self
+
+        Raises:
+            ValueError: If the sketches have different accuracies
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge quantile sketches with different accuracies")
+        for buckets, others in ((self.__positive, other.__positive), (self.__negative, other.__negative)):
+            for key, count in others.items():
+                buckets[key] = buckets.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        return self
+
+    def quantile(self, q):
+        """
+        Estimate the q-quantile (0 <= q <= 1), or NaN for an empty sketch.
+        """
+        if self.count == 0:
+            return np.nan
+        rank = q * (self.count - 1)
+        seen = 0
+        # Ascending values: large negative magnitudes first, then zeros, then positives
+        for key in sorted(self.__negative, reverse=True):
+            seen += self.__negative[key]
+            if seen > rank:
+                return -self.__value(key)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.__positive):
+            seen += self.__positive[key]
+            if seen > rank:
+                return self.__value(key)
+        return self.__value(max(self.__positive)) if self.__positive else 0.0
+
+    def quantiles(self, qs):
+        """Estimates for several quantiles."""
+        return [self.quantile(q) for q in qs]
+
+    def __value(self, key):
+        # Midpoint (in relative terms) of the bucket (gamma^(k-1), gamma^k]
+        return 2 * self.__gamma ** key / (self.__gamma + 1)
+
+    def to_dict(self):
+        """
+        Compact, JSON-serializable form: each sign's buckets as an offset and
+        dense counts.
+        """
+        def dense(buckets):
+            if not buckets:
+                return None
+            low, high = min(buckets), max(buckets)
+            return {"offset": low, "counts": [buckets.get(key, 0) for key in range(low, high + 1)]}
+        return {
+            "accuracy": self.relative_accuracy,
+            "zero": self.zero_count,
+            "positive": dense(self.__positive),
+            "negative": dense(self.__negative),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a sketch from to_dict output."""
+        sketch = cls(data["accuracy"])
+        for buckets, stored in ((sketch.__positive, data.get("positive")), (sketch.__negative, data.get("negative"))):
+            if stored:
+                for offset, count in enumerate(stored["counts"]):
+                    if count:
+                        buckets[stored["offset"] + offset] = count
+        sketch.zero_count = int(data.get("zero", 0))
+        sketch.count = sketch.zero_count + sum(sketch.__positive.values()) + sum(sketch.__negative.values())
+        return sketch
@@ -0,0 +1,128 @@
+import numpy as np
+
+class RunLength:
+    """
+    Run-length encoding of boolean channels.
+
+    Channels are (rows x channels) boolean arrays, so every channel of a log
+    is encoded in one pass. A run is reported as (channel, start, end) row
+    indices, end inclusive, and never crosses a segment boundary (a new log
+    file, or a restart of the log clock).
+    """
+
+    @staticmethod
+    def boundaries(time, sources=None):
+        """
+        Mark the first row of every segment.
+
+        Args:
+            time (np.ndarray): Log time of every row
+            sources (np.ndarray): Optional per-row file codes
+
+        Returns:
+            np.ndarray: Boolean array, True where a segment starts
+        """
+        time = np.asarray(time, dtype=float)
+        boundary = np.ones(len(time), dtype=bool)
+        boundary[1:] = np.diff(time) <= 0
+        if sources is not None:
+            sources = np.asarray(sources)
+            boundary[1:] |= sources[1:] != sources[:-1]
+        return boundary
+
+    @staticmethod
+    def intervals(active, boundary=None):
+        """
+        Encode the runs of True values of every channel.
+
+        Args:
+            active (np.ndarray): (rows,) or (rows, channels) boolean array
+            boundary (np.ndarray): Optional segment starts (see boundaries)
+
+        Returns:
+            tuple: (channel, start, end) integer arrays, ordered by channel then start
+        """
+        active = np.asarray(active, dtype=bool)
+        if active.ndim == 1:
+            active = active[:, None]
+        rows = active.shape[0]
+        if rows == 0:
+            empty = np.array([], dtype=np.intp)
+            return empty, empty, empty
+
+        if boundary is None:
+            boundary = np.zeros(rows, dtype=bool)
+        boundary = np.asarray(boundary, dtype=bool).copy()
+        boundary[0] = True
+        last = np.append(boundary[1:], True)
+
+        # A run starts where the previous row is off or a segment begins, and
+        # ends where the next row is off or the segment ends
+        previous = np.zeros_like(active)
+        previous[1:] = active[:-1]
+        following = np.zeros_like(active)
+        following[:-1] = active[1:]
+        run_start = active & (~previous | boundary[:, None])
+        run_end = active & (~following | last[:, None])
+
+        # Column-major flattening orders runs by channel, then row, so starts and ends pair up
+        start_positions = np.flatnonzero(run_start.T)
+        end_positions = np.flatnonzero(run_end.T)
+        return start_positions // rows, start_positions % rows, end_positions % rows
+
+    @staticmethod
+    def reduce(values, channel, start, end, ufunc):
+        """
+        Aggregate each run with a ufunc (e.g. np.maximum) in one reduceat call.
+
+        Args:
+            values (np.ndarray): (rows, channels) values aligned with the encoded array
+            channel, start, end (np.ndarray): Runs from intervals()
+            ufunc (np.ufunc): Reduction applied over each run
+
+        Returns:
+            np.ndarray: One value per run
+        """
+        values = np.asarray(values, dtype=float)
+        if values.ndim == 1:
+            values = values[:, None]
+        if not len(start):
+            return np.array([], dtype=float)
+        offsets = channel * values.shape[0]
+        bounds = np.column_stack([offsets + start, offsets + end + 1]).ravel()
+        flat = np.append(values.T.ravel(), 0.0)
+        return ufunc.reduceat(flat, bounds)[::2]
+
+    @staticmethod
+    def sample_period(time):
+        """Median spacing between consecutive samples (0 if there are none)."""
+        steps = np.diff(np.asarray(time, dtype=float))
+        steps = steps[steps > 0]
+        return float(np.median(steps)) if len(steps) else 0.0
+
+    @staticmethod
+    def durations(time, start, end, period=None):
+        """
+        Duration of each run in time units, counting the last sample's period.
+
+        Returns:
+            np.ndarray: One duration per run
+        """
+        time = np.asarray(time, dtype=float)
+        if period is None:
+            period = RunLength.sample_period(time)
+        return time[end] - time[start] + period
+
+    @staticmethod
+    def covered_time(time, boundary, period=None):
+        """
+        Total time covered by all segments (the denominator of duty cycles).
+        """
+        time = np.asarray(time, dtype=float)
+        if not len(time):
+            return 0.0
+        if period is None:
+            period = RunLength.sample_period(time)
+        first = np.flatnonzero(boundary)
+        last = np.append(first[1:] - 1, len(time) - 1)
+        return float(np.sum(time[last] - time[first] + period))
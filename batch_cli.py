@@ -0,0 +1,116 @@
+# batch_cli.py
+
+import argparse
+import os
+import sys
+from backend.batch_processor import BatchProcessor
+from backend.plotter import Plotter
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Process many vehicle log folders without the GUI and write fleet summaries."
+    )
+    parser.add_argument(
+        "folders",
+        nargs="+",
+        help="Vehicle folders or glob patterns (quote globs, e.g. 'archive/*'), "
+             "or partial summaries with --merge-partials"
+    )
+    parser.add_argument(
+        "-o", "--output-dir",
+        default="batch_output",
+        help="Directory for per-folder and fleet summaries (default: batch_output)"
+    )
+    parser.add_argument(
+        "-f", "--format",
+        choices=BatchProcessor.OUTPUT_FORMATS,
+        default="json",
+        help="Summary file format (default: json)"
+    )
+    parser.add_argument(
+        "-c", "--charts",
+        choices=Plotter.IMAGE_FORMATS,
+        default=None,
+        help="Also render per-folder and fleet charts in this image format"
+    )
+    parser.add_argument(
+        "-w", "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: CPU count)"
+    )
+    parser.add_argument(
+        "--keep-duplicates",
+        action="store_true",
+        help="Read duplicate files and overlapping rows instead of skipping them"
+    )
+    parser.add_argument(
+        "--merge-partials",
+        action="store_true",
+        help="Treat the arguments as saved partial summaries (or directories of them) "
+             "and only merge them into fleet summaries"
+    )
+    parser.add_argument(
+        "--log-json",
+        action="store_true",
+        help="Write data_handler.log as JSON lines with ingestion metrics"
+    )
+    return parser.parse_args(argv)
+
+def print_folder_result(result):
+    status = "OK  " if result["status"] == "ok" else "FAIL"
+    mb = result["bytes"] / 1e6
+    rate = mb / result["seconds"] if result["seconds"] > 0 else 0.0
+    print(f"[{status}] {result['folder']}: {result['seconds']:.2f}s, {mb:.2f} MB ({rate:.2f} MB/s), "
+          f"ECL {result['ecl_rows']}, DMP {result['dmp_rows']}")
+    if result["error"]:
+        print(f"       {result['error']}")
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.log_json:
+        # Read by configure_logging in this process and in every worker
+        os.environ["ERROR_ANALYZER_LOG_JSON"] = "1"
+
+    if args.merge_partials:
+        try:
+            merged = BatchProcessor.merge_partials(args.folders, args.output_dir, output_format=args.format)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return 1
+        print(f"Merged {merged['merged']} partial summar{'y' if merged['merged'] == 1 else 'ies'} "
+              f"({merged['parts']} dataset(s), ECL {merged['rows']['ecl']}, DMP {merged['rows']['dmp']})")
+        if merged["failed"]:
+            print(f"Could not read {merged['failed']} file(s)")
+        print(f"Summaries written to: {args.output_dir}")
+        return 0 if merged["failed"] == 0 and merged["merged"] > 0 else 2
+
+    folders = BatchProcessor.resolve_folders(args.folders)
+    if not folders:
+        print("No folders to process.")
+        return 1
+
+    print(f"Processing {len(folders)} folder(s)...")
+    try:
+        report = BatchProcessor.run(
+            folders,
+            args.output_dir,
+            output_format=args.format,
+            max_workers=args.workers,
+            on_result=print_folder_result,
+            chart_format=args.charts,
+            deduplicate=not args.keep_duplicates
+        )
+    except (ValueError, ImportError) as e:
+        print(f"Error: {e}")
+        return 1
+
+    print(f"\nProcessed {report['succeeded']}/{report['folders']} folder(s) in {report['wall_seconds']:.2f}s "
+          f"({report['folders_per_second']:.2f} folders/s, {report['mb_per_second']:.2f} MB/s)")
+    if args.charts:
+        print(f"Rendered {report['charts_rendered']} chart(s) in {report['chart_seconds']:.2f}s")
+    print(f"Summaries written to: {args.output_dir}")
+    return 0 if report["failed"] == 0 else 2
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,262 @@
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import tracemalloc
+from types import SimpleNamespace
+import pandas as pd
+
+if __package__ in (None, ""):
+    # `python benchmarks/run_benchmarks.py` puts benchmarks/ first on sys.path;
+    # the backend, frontend and benchmarks packages live one level up
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.data_handler import DataHandler
+from backend.plotter import Plotter
+from backend.utils.file_classifier import FileClassifier
+from backend.utils.file_types import FileClasses
+from backend.data_processors.ecl_processor import ECLProcessor
+from backend.data_processors.dmp_processor import DMPProcessor
+from frontend.compute.visualizations import create_bar_chart, create_pie_chart, create_treemap, get_color
+from benchmarks.synthetic_log_generator import SyntheticLogGenerator
+
+DEFAULT_SIZES = [10**3, 10**4, 10**5]
+ROWS_PER_FILE = 10**6
+
+class BenchmarkSuite:
+    def __init__(self, folder_path, rows):
+        """
+        Prepare the stages of one benchmark run over a generated folder.
+
+        Args:
+            folder_path (str): Folder with synthetic ECL reports and DMP logs
+            rows (int): Row count the folder was generated with
+        """
+        self.folder_path = folder_path
+        self.rows = rows
+        self.files = sorted(os.path.join(folder_path, f) for f in os.listdir(folder_path))
+        self.ecl_files = [f for f in self.files if os.path.basename(f).startswith("Error")]
+        self.dmp_files = [f for f in self.files if os.path.basename(f).startswith("log")]
+        self.bytes = sum(os.path.getsize(f) for f in self.files)
+
+        # Intermediate results shared between stages
+        self.ecl_parts = []
+        self.dmp_parts = []
+        self.ecl = pd.DataFrame()
+        self.dmp = pd.DataFrame()
+        self.ecl_freq_summary = pd.DataFrame()
+        self.dmp_freq_summary = pd.Series()
+
+    def stages(self):
+        """Return (name, callable) pairs in execution order."""
+        return [
+            ("classification", self.classify),
+            ("parse_ecl_ecf", self.parse_ecl_ecf),
+            ("parse_dmp", self.parse_dmp),
+            ("merge", self.merge),
+            ("aggregate_ecl", self.aggregate_ecl),
+            ("aggregate_dmp", self.aggregate_dmp),
+            ("figures_plotly", self.build_plotly_figures),
+            ("figures_matplotlib", self.build_matplotlib_figures),
+            ("data_handler_end_to_end", self.end_to_end),
+        ]
+
+    def classify(self):
+        for path in self.files:
+            if FileClassifier.get_file_class(path) == FileClasses.UNKNOWN:
+                raise RuntimeError(f"Synthetic file was not classified: {path}")
+
+    def parse_ecl_ecf(self):
+        self.ecl_parts = [ECLProcessor.read_ecl_ecf(path)[0] for path in self.ecl_files]
+
+    def parse_dmp(self):
+        self.dmp_parts = [DMPProcessor.read_dmp(path) for path in self.dmp_files]
+
+    def merge(self):
+        self.ecl = pd.concat(self.ecl_parts, ignore_index=True)
+        self.dmp = pd.concat(self.dmp_parts, ignore_index=True)
+
+    def aggregate_ecl(self):
+        self.ecl_freq_summary = ECLProcessor.get_frequency_summary(self.ecl)
+
+    def aggregate_dmp(self):
+        self.dmp_freq_summary = DMPProcessor.get_frequency_summary(DMPProcessor.filter_dmp(self.dmp))
+
+    def build_plotly_figures(self):
+        session_state = SimpleNamespace(axes_swapped=False, show_percentage=True)
+        create_bar_chart(self.ecl_freq_summary, get_color, session_state)
+        create_pie_chart(self.ecl_freq_summary, get_color)
+        create_treemap(self.ecl_freq_summary)
+
+    def build_matplotlib_figures(self):
+        top = self.ecl_freq_summary.nlargest(20, "Frequency")
+        with tempfile.TemporaryDirectory() as temp_dir:
+            Plotter.render_batch([{
+                "kind": "bar",
+                "name": "ecl_frequency",
+                "labels": top["Description"].tolist(),
+                "values": top["Frequency"].tolist(),
+            }], temp_dir, "png", max_workers=1)
+
+    def end_to_end(self):
+        DataHandler(self.folder_path, show_progress=False)
+
+def warm_up():
+    """Build each figure type once so lazy plotting imports are not timed."""
+    summary = pd.DataFrame({"Description": ["A", "B"], "Frequency": [2, 1]})
+    suite = BenchmarkSuite.__new__(BenchmarkSuite)
+    suite.ecl_freq_summary = summary
+    suite.build_plotly_figures()
+    suite.build_matplotlib_figures()
+
+def measure(stage, track_memory):
+    """
+    Run one stage and return its wall time and (optionally) peak traced memory.
+
+    Args:
+        stage (callable): Stage to run
+        track_memory (bool): Trace allocations with tracemalloc (slows the stage)
+
+    Returns:
+        tuple: (seconds, peak_mb or None)
+    """
+    if track_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    stage()
+    seconds = time.perf_counter() - start
+    peak_mb = None
+    if track_memory:
+        peak_mb = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+    return seconds, peak_mb
+
+def run_size(rows, work_dir, repeat, track_memory, seed):
+    """
+    Generate a folder with the given row count and benchmark every stage.
+
+    Timing runs without tracemalloc (best of `repeat`); peak memory is taken
+    from a separate traced run so it does not distort the timings.
+
+    Returns:
+        list: Result records, one per stage
+    """
+    folder = os.path.join(work_dir, f"rows_{rows}")
+    files = max(1, -(-rows // ROWS_PER_FILE))
+    print(f"\nGenerating {rows:,} ECL rows and {rows:,} DMP samples in {files} file(s) each...")
+    SyntheticLogGenerator.generate_folder(folder, rows, rows, ecl_files=files, dmp_files=files, seed=seed)
+
+    suite = BenchmarkSuite(folder, rows)
+    timings = {name: float("inf") for name, _ in suite.stages()}
+    for _ in range(repeat):
+        for name, stage in suite.stages():
+            seconds, _ = measure(stage, track_memory=False)
+            timings[name] = min(timings[name], seconds)
+
+    peaks = {}
+    if track_memory:
+        for name, stage in suite.stages():
+            peaks[name] = measure(stage, track_memory=True)[1]
+
+    records = []
+    for name, _ in suite.stages():
+        seconds = timings[name]
+        record = {
+            "stage": name,
+            "rows": rows,
+            "bytes": suite.bytes,
+            "seconds": seconds,
+            "rows_per_second": (2 * rows) / seconds if seconds > 0 else None,
+            "mb_per_second": (suite.bytes / 1e6) / seconds if seconds > 0 else None,
+            "peak_mb": peaks.get(name),
+        }
+        records.append(record)
+        peak = f"{record['peak_mb']:.1f} MB" if record["peak_mb"] is not None else "-"
+        print(f"  {name:<26}{seconds:>10.4f}s {record['mb_per_second'] or 0:>10.2f} MB/s  peak {peak}")
+    return records
+
+def compare_with_baseline(records, baseline_path, threshold):
+    """
+    Print a comparison against a saved baseline and return the regressions.
+
+    Args:
+        records (list): Current result records
+        baseline_path (str): JSON file written by --save-baseline
+        threshold (float): Slowdown ratio that counts as a regression
+
+    Returns:
+        list: (stage, rows, ratio) for every regressed stage
+    """
+    with open(baseline_path) as f:
+        baseline = {(r["stage"], r["rows"]): r for r in json.load(f)["results"]}
+
+    regressions = []
+    print(f"\nComparison with baseline {baseline_path} (regression threshold {threshold:.2f}x):")
+    print(f"  {'stage':<26}{'rows':>12}{'baseline':>12}{'current':>12}{'ratio':>8}")
+    for record in records:
+        base = baseline.get((record["stage"], record["rows"]))
+        if base is None or not base["seconds"]:
+            continue
+        ratio = record["seconds"] / base["seconds"]
+        flag = "  REGRESSION" if ratio > threshold else ""
+        print(f"  {record['stage']:<26}{record['rows']:>12,}{base['seconds']:>11.4f}s{record['seconds']:>11.4f}s{ratio:>7.2f}x{flag}")
+        if ratio > threshold:
+            regressions.append((record["stage"], record["rows"], ratio))
+    return regressions
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark ingestion and analytics on synthetic logs")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Row counts to benchmark, e.g. 1000 10000 10000000 (default: 10^3..10^5)")
+    parser.add_argument("--repeat", type=int, default=1, help="Timing repetitions, best is kept (default: 1)")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak memory pass")
+    parser.add_argument("--seed", type=int, default=0, help="Generator seed (default: 0)")
+    parser.add_argument("--work-dir", default=None, help="Keep generated data here instead of a temp folder")
+    parser.add_argument("--output", default=None, help="Write results as JSON to this path")
+    parser.add_argument("--save-baseline", default=None, help="Write results as the new baseline JSON")
+    parser.add_argument("--baseline", default=None, help="Compare against this baseline JSON")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Slowdown ratio treated as a regression (default: 1.25)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    Plotter.use_headless_backend()
+    warm_up()
+
+    records = []
+    if args.work_dir:
+        os.makedirs(args.work_dir, exist_ok=True)
+        for rows in args.sizes:
+            records += run_size(rows, args.work_dir, args.repeat, not args.no_memory, args.seed)
+    else:
+        with tempfile.TemporaryDirectory() as work_dir:
+            for rows in args.sizes:
+                records += run_size(rows, work_dir, args.repeat, not args.no_memory, args.seed)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": records,
+    }
+    for path in filter(None, [args.output, args.save_baseline]):
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to: {path}")
+
+    if args.baseline:
+        regressions = compare_with_baseline(records, args.baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} stage(s) regressed beyond {args.threshold:.2f}x")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
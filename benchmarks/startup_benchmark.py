@@ -0,0 +1,138 @@
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must stay unloaded until a tab actually needs them
+LAZY_MODULES = [
+    "plotly.express",
+    "matplotlib",
+    "seaborn",
+    "tqdm",
+    "backend.data_handler",
+    "frontend.compute.visualizations",
+]
+
+FIRST_PAINT_SCRIPT = """
+import sys, json, time
+from streamlit.testing.v1 import AppTest
+# The test harness itself imports some of these (e.g. matplotlib)
+preloaded = set(m for m in LAZY_MODULES if m in sys.modules)
+start = time.perf_counter()
+at = AppTest.from_file("streamlit_gui.py", default_timeout=120)
+at.run()
+seconds = time.perf_counter() - start
+print(json.dumps({
+    "seconds": seconds,
+    "exceptions": len(at.exception),
+    "loaded": [m for m in LAZY_MODULES if m in sys.modules and m not in preloaded],
+}))
+"""
+
+def parse_importtime(stderr):
+    """
+    Parse `python -X importtime` output.
+
+    Returns:
+        list: (module, self_us, cumulative_us, depth) tuples in output order
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return entries
+
+def profile_import(module):
+    """
+    Import streamlit, then `module`, in a fresh interpreter with -X importtime.
+
+    Returns:
+        tuple: (app_ms, top_entries, loaded_lazy_modules), where app_ms is the
+        cumulative import time of `module` on top of Streamlit
+    """
+    code = (
+        "import sys, json, streamlit; "
+        f"import {module}; "
+        f"print(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT_DIR, capture_output=True, text=True, check=True
+    )
+    entries = parse_importtime(result.stderr)
+    app_entry = next(e for e in reversed(entries) if e[0] == module and e[3] == 0)
+
+    # Modules imported (at any depth) while importing the app module
+    app_index = entries.index(app_entry)
+    start_index = app_index
+    while start_index > 0 and entries[start_index - 1][3] > 0:
+        start_index -= 1
+    children = sorted(entries[start_index:app_index + 1], key=lambda e: e[1], reverse=True)
+
+    return app_entry[2] / 1000, children, json.loads(result.stdout.strip().splitlines()[-1])
+
+def measure_first_paint():
+    """Run the app once with no uploads in a fresh interpreter via AppTest."""
+    code = f"LAZY_MODULES = {LAZY_MODULES!r}\n{FIRST_PAINT_SCRIPT}"
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Profile app import time and enforce a startup budget")
+    parser.add_argument("--module", default="streamlit_gui", help="App module to import (default: streamlit_gui)")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh-interpreter runs, median is used (default: 5)")
+    parser.add_argument("--import-budget-ms", type=float, default=100.0,
+                        help="Budget for the app's own import time on top of Streamlit (default: 100)")
+    parser.add_argument("--first-paint-budget-ms", type=float, default=None,
+                        help="Optional budget for the first script run with no uploads")
+    parser.add_argument("--top", type=int, default=15, help="Slowest app imports to list (default: 15)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    failures = []
+
+    runs = [profile_import(args.module) for _ in range(args.repeat)]
+    import_ms = statistics.median(run[0] for run in runs)
+    _, children, loaded = runs[-1]
+
+    print(f"Import time of '{args.module}' on top of Streamlit: {import_ms:.1f} ms "
+          f"(median of {args.repeat}, budget {args.import_budget_ms:.0f} ms)")
+    print("\nSlowest imports (self time):")
+    for name, self_us, cumulative_us, depth in children[:args.top]:
+        print(f"  {self_us / 1000:>8.2f} ms self {cumulative_us / 1000:>8.2f} ms cumulative  {name}")
+
+    if import_ms > args.import_budget_ms:
+        failures.append(f"import time {import_ms:.1f} ms exceeds budget {args.import_budget_ms:.0f} ms")
+    if loaded:
+        failures.append(f"modules loaded eagerly at import: {', '.join(loaded)}")
+
+    paint = measure_first_paint()
+    paint_ms = paint["seconds"] * 1000
+    print(f"\nFirst paint (no uploads): {paint_ms:.0f} ms, lazily loaded modules present: {paint['loaded'] or 'none'}")
+    if paint["exceptions"]:
+        failures.append(f"first paint raised {paint['exceptions']} exception(s)")
+    if paint["loaded"]:
+        failures.append(f"modules loaded during first paint: {', '.join(paint['loaded'])}")
+    if args.first_paint_budget_ms is not None and paint_ms > args.first_paint_budget_ms:
+        failures.append(f"first paint {paint_ms:.0f} ms exceeds budget {args.first_paint_budget_ms:.0f} ms")
+
+    if failures:
+        print("\nStartup budget FAILED:")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+    print("\nStartup budget OK")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,296 @@
+import os
+import argparse
+import numpy as np
+import pandas as pd
+
+class SyntheticLogGenerator:
+    """
+    Deterministic generator for ECL/ECF reports and DMP logs.
+
+    Output files use the same layout as the real exports: the ECL report has
+    the title line, LEGEND block, ';' separated listing and ERROR CODE
+    FREQUENCY section, and DMP logs are comma separated with the full
+    channel header. The same seed always produces byte-identical files.
+    """
+
+    ECL_TITLE = "|------------------------------------------------- ERROR CODE LISTING -------------------------------------------------|"
+    ECF_TITLE = "|------------------------------------------------ ERROR CODE FREQUENCY ------------------------------------------------|"
+    LEGEND = [
+        "LEGEND:",
+        "Ticks (hex):       Internal time from power-on (1 Tick = 2ms)",
+        "Speed (km/h):      Train speed",
+        "Speed1 (km/h):     Axle 1 speed",
+        "Speed2 (km/h):     Axle 2 speed",
+        "Speed3 (km/h):     Axle 3 speed",
+        "Speed4 (km/h):     Axle 4 speed",
+        "Odometer (km):     Travel distance",
+    ]
+    ECL_COLUMNS = [
+        "Nr", "Code(hex)", "Ticks(hex)", "Date", "Time", "SW(hex)", "Speed(km/h)",
+        "Speed1(km/h)", "Speed2(km/h)", "Speed3(km/h)", "Speed4(km/h)", "Odometer(km)",
+        "FILL_1", "VENT_1", "FILL_2", "VENT_2", "FILL_3", "VENT_3", "FILL_4", "VENT_4",
+        "DEVICE_ON", "V5", "V45", "ZERO_SPEED", "WSP_FAILURE", "V5_2", "V30", "V5_1",
+        "Condition", "Description",
+    ]
+    DMP_COLUMNS = [
+        "Time", "MOD_TICK", "MONTIME", "REF_SPEED", "RF_SP_NF20",
+        "SPEED_1", "SPEED_2", "SPEED_3", "SPEED_4",
+        "SP_1_NF20", "SP_2_NF20", "SP_3_NF20", "SP_4_NF20",
+        "ACC_1", "ACC_2", "ACC_3", "ACC_4", "ODOMETER",
+        "DEV_ON", "V5", "V45", "ZEROSPD", "WSP_FAIL", "V5_2", "V30", "V5_1",
+        "FILL_1", "VENT_1", "FILL_2", "VENT_2", "FILL_3", "VENT_3", "FILL_4", "VENT_4",
+        "SW_REL", "DIA_BYTE_0", "DIA_BYTE_1", "DIA_BYTE_2", "DIA_BYTE_3", "DIA_BYTE_4",
+        "SD_TR_SLIDE", "SD_TR_ERR",
+    ]
+    # (code, description, relative weight) for events after power-on
+    ECL_EVENTS = [
+        ("0x0017", "AXLE1_LOCK", 20), ("0x6017", "AXLE1_LOCK  GONE", 12),
+        ("0x0027", "AXLE2_LOCK", 18), ("0x6027", "AXLE2_LOCK  GONE", 10),
+        ("0x0037", "AXLE3_LOCK", 20), ("0x6037", "AXLE3_LOCK  GONE", 12),
+        ("0x0047", "AXLE4_LOCK", 20), ("0x6047", "AXLE4_LOCK  GONE", 12),
+        ("0x0012", "E_SENS_FR1", 4), ("0x6012", "E_SENS_FR1 GONE", 2),
+        ("0x0022", "E_SENS_FR2", 8), ("0x6022", "E_SENS_FR2 GONE", 2),
+        ("0x0032", "E_SENS_FR3", 2), ("0x0042", "E_SENS_FR4", 2),
+        ("0x0015", "E_DV1_TOUT", 3), ("0x6015", "E_DV1_TOUT GONE", 4),
+        ("0x0025", "E_DV2_TOUT", 1), ("0x0035", "E_DV3_TOUT", 2),
+        ("0x0045", "E_DV4_TOUT", 4), ("0x6045", "E_DV4_TOUT GONE", 4),
+        ("0x0021", "E_SS_SC_OC2", 11), ("0x6021", "E_SS_SC_OC2 GONE", 11),
+        ("0x6027", "E_SPEED_30", 3), ("0x6037", "E_SPEED_45", 3),
+        ("0x6017", "E_SPEED_5", 2), ("0x6047", "E_ZERO_SPEED", 2),
+        ("0x6037", "E_DEVICE_ON", 2), ("0x6027", "E_WSP_FAILURE", 1),
+    ]
+    POWER_ON = ("0xA000", "I_POWER_ON")
+    CHUNK_ROWS = 500_000
+
+    @staticmethod
+    def write_ecl_report(file_path, rows, seed=0, events_per_power_on=40):
+        """
+        Write an ECL/ECF report with the given number of listing rows.
+
+        Args:
+            file_path (str): Destination path
+            rows (int): Number of ECL listing rows
+            seed (int): Random seed
+            events_per_power_on (int): Mean listing rows per power-on segment
+
+        Returns:
+            str: The written path
+        """
+        rng = np.random.default_rng(seed)
+        codes = np.array([e[0] for e in SyntheticLogGenerator.ECL_EVENTS] + [SyntheticLogGenerator.POWER_ON[0]])
+        descriptions = np.array([e[1] for e in SyntheticLogGenerator.ECL_EVENTS] + [SyntheticLogGenerator.POWER_ON[1]])
+        weights = np.array([e[2] for e in SyntheticLogGenerator.ECL_EVENTS], dtype=float)
+        weights /= weights.sum()
+        power_on_index = len(codes) - 1
+        event_counts = np.zeros(len(codes), dtype=np.int64)
+
+        clock = pd.Timestamp("2024-07-01 06:00:00") + pd.Timedelta(seconds=int(rng.integers(0, 86400)))
+        ticks_at_end = 0
+        odometer = 0
+        nr = 1
+
+        with open(file_path, "w", newline="\n") as f:
+            f.write(SyntheticLogGenerator.ECL_TITLE + "\n")
+            f.write("\n".join(SyntheticLogGenerator.LEGEND) + "\n\n")
+            f.write(";".join(SyntheticLogGenerator.ECL_COLUMNS) + ";\n")
+
+            for chunk_start in range(0, rows, SyntheticLogGenerator.CHUNK_ROWS):
+                n = min(SyntheticLogGenerator.CHUNK_ROWS, rows - chunk_start)
+
+                # Event types, with power-on rows starting new tick segments
+                event = rng.choice(len(weights), size=n, p=weights)
+                power_on = rng.random(n) < 1.0 / events_per_power_on
+                if chunk_start == 0:
+                    power_on[0] = True
+                event[power_on] = power_on_index
+                event_counts += np.bincount(event, minlength=len(codes))
+
+                # Ticks increase within a segment and restart after each power-on
+                step = rng.integers(1, 60_000, size=n)
+                step[power_on] = 0
+                segment = np.cumsum(power_on)
+                cumulative = np.cumsum(step)
+                segment_base = np.zeros(segment[-1] + 1, dtype=np.int64)
+                starts = np.flatnonzero(power_on)
+                segment_base[segment[starts]] = cumulative[starts]
+                if not power_on[0]:
+                    segment_base[0] = -ticks_at_end
+                ticks = cumulative - segment_base[segment] + 0xA90
+                ticks_at_end = ticks[-1] - 0xA90
+
+                # Wall clock advances with ticks, plus an off period before each power-on
+                off_seconds = np.where(power_on, rng.integers(600, 36_000, size=n), 0)
+                elapsed_ms = np.cumsum(step * 2 + off_seconds * 1000)
+                wall = clock + pd.to_timedelta(elapsed_ms, unit="ms")
+                clock = wall[-1]
+
+                speed = rng.integers(0, 120, size=n)
+                speed[power_on] = 0
+                axle_speeds = [np.where(rng.random(n) < 0.25, 0, speed) for _ in range(4)]
+                odometer_values = odometer + np.cumsum(rng.integers(0, 3, size=n))
+                odometer = int(odometer_values[-1])
+                valves = rng.random((n, 8)) < 0.2
+                flags = rng.integers(0, 2, size=(n, 8))
+
+                frame = pd.DataFrame({
+                    "Nr": np.arange(nr, nr + n),
+                    "Code(hex)": codes[event],
+                    "Ticks(hex)": [f"0x{t:08X}" for t in ticks],
+                    "Date": wall.day.astype(str) + "/" + wall.month.astype(str) + "/" + (wall.year % 100).astype(str),
+                    "Time": wall.hour.astype(str) + ":" + wall.minute.astype(str) + ":" + wall.second.astype(str),
+                    "SW(hex)": "0x000",
+                    "Speed(km/h)": speed,
+                    "Speed1(km/h)": axle_speeds[0],
+                    "Speed2(km/h)": axle_speeds[1],
+                    "Speed3(km/h)": axle_speeds[2],
+                    "Speed4(km/h)": axle_speeds[3],
+                    "Odometer(km)": odometer_values,
+                })
+                for i, name in enumerate(SyntheticLogGenerator.ECL_COLUMNS[12:20]):
+                    frame[name] = valves[:, i].astype(np.int8)
+                for i, name in enumerate(SyntheticLogGenerator.ECL_COLUMNS[20:28]):
+                    frame[name] = flags[:, i]
+                frame["Condition"] = rng.integers(0, 3, size=n)
+                frame["Description"] = descriptions[event]
+                frame.to_csv(f, sep=";", header=False, index=False, lineterminator="\n")
+                nr += n
+
+            f.write(SyntheticLogGenerator.ECF_TITLE + "\n")
+            f.write("Code(hex);Frequency;Description;\n")
+            for i in np.flatnonzero(event_counts):
+                f.write(f"{codes[i]};{event_counts[i]};{descriptions[i]}\n")
+
+        return file_path
+
+    @staticmethod
+    def write_dmp_log(file_path, rows, seed=0, sample_period=0.1):
+        """
+        Write a DMP log with the given number of samples.
+
+        Args:
+            file_path (str): Destination path
+            rows (int): Number of samples
+            seed (int): Random seed
+            sample_period (float): Seconds between samples
+
+        Returns:
+            str: The written path
+        """
+        rng = np.random.default_rng(seed)
+        mod_tick = int(rng.integers(100_000_000, 140_000_000))
+        montime = mod_tick // 2
+        speed = float(rng.integers(50, 320))
+        odometer = int(rng.integers(1000, 3000))
+        tick_step = int(round(sample_period * 1000))
+
+        with open(file_path, "w", newline="\n") as f:
+            f.write(",".join(SyntheticLogGenerator.DMP_COLUMNS) + "\n")
+
+            for chunk_start in range(0, rows, SyntheticLogGenerator.CHUNK_ROWS):
+                n = min(SyntheticLogGenerator.CHUNK_ROWS, rows - chunk_start)
+                index = np.arange(chunk_start, chunk_start + n)
+
+                ref_speed = np.clip(speed + np.cumsum(rng.normal(0, 0.6, size=n)), 0, 350)
+                speed = float(ref_speed[-1])
+                ref_speed = np.round(ref_speed).astype(np.int64)
+
+                # Axles track the reference speed; short slides drop one axle below it
+                slide = rng.random((n, 4)) < 0.002
+                slide_mask = np.zeros((n, 4), dtype=bool)
+                for offset in range(8):
+                    slide_mask[offset:] |= slide[:n - offset]
+                axle_speeds = ref_speed[:, None] + rng.integers(-2, 3, size=(n, 4))
+                axle_speeds = np.where(slide_mask, (axle_speeds * 0.6).astype(np.int64), axle_speeds)
+                axle_speeds = np.clip(axle_speeds, 0, None)
+                nf20 = np.round(axle_speeds * 4.6).astype(np.int64)
+                acc = rng.integers(-25, 25, size=(n, 4)) - slide_mask * 40
+
+                odometer_values = odometer + np.cumsum(rng.random(n) < speed / 36_000)
+                odometer = int(odometer_values[-1])
+
+                frame = pd.DataFrame({
+                    "Time": np.round(index * sample_period, 3),
+                    "MOD_TICK": mod_tick + index * tick_step,
+                    "MONTIME": montime + index * tick_step // 2,
+                    "REF_SPEED": ref_speed,
+                    "RF_SP_NF20": np.round(ref_speed * 4.6).astype(np.int64),
+                })
+                for axle in range(4):
+                    frame[f"SPEED_{axle + 1}"] = axle_speeds[:, axle]
+                for axle in range(4):
+                    frame[f"SP_{axle + 1}_NF20"] = nf20[:, axle]
+                for axle in range(4):
+                    frame[f"ACC_{axle + 1}"] = acc[:, axle]
+                frame["ODOMETER"] = odometer_values
+                frame["DEV_ON"] = 1
+                frame["V5"] = (ref_speed > 5).astype(np.int8)
+                frame["V45"] = (ref_speed > 45).astype(np.int8)
+                frame["ZEROSPD"] = (ref_speed == 0).astype(np.int8)
+                frame["WSP_FAIL"] = 1
+                frame["V5_2"] = 0
+                frame["V30"] = (ref_speed > 30).astype(np.int8)
+                frame["V5_1"] = 1
+                for axle in range(4):
+                    frame[f"FILL_{axle + 1}"] = slide_mask[:, axle].astype(np.int8)
+                    frame[f"VENT_{axle + 1}"] = (slide_mask[:, axle] & (acc[:, axle] < -45)).astype(np.int8)
+                frame["SW_REL"] = 2822
+                frame["DIA_BYTE_0"] = np.where(rng.random(n) < 0.995, 1, rng.integers(0, 256, size=n))
+                for byte in range(1, 5):
+                    frame[f"DIA_BYTE_{byte}"] = np.where(rng.random(n) < 0.999, 0, rng.integers(0, 256, size=n))
+                frame["SD_TR_SLIDE"] = slide_mask.any(axis=1).astype(np.int8)
+                frame["SD_TR_ERR"] = 0
+                frame.to_csv(f, header=False, index=False, lineterminator="\n", float_format="%g")
+
+        return file_path
+
+    @staticmethod
+    def generate_folder(folder_path, ecl_rows, dmp_rows, ecl_files=1, dmp_files=1, seed=0):
+        """
+        Write a vehicle folder with ECL reports and DMP logs.
+
+        Rows are split evenly across files. Each file gets its own seed
+        derived from the folder seed, so the folder is reproducible.
+
+        Args:
+            folder_path (str): Destination folder (created if missing)
+            ecl_rows (int): Total ECL listing rows
+            dmp_rows (int): Total DMP samples
+            ecl_files (int): Number of ECL/ECF reports
+            dmp_files (int): Number of DMP logs
+            seed (int): Random seed
+
+        Returns:
+            list: Paths of the written files
+        """
+        os.makedirs(folder_path, exist_ok=True)
+        paths = []
+        for i, rows in enumerate(np.array_split(np.arange(ecl_rows), max(ecl_files, 1))):
+            if ecl_files == 0:
+                break
+            path = os.path.join(folder_path, f"Error {i + 1}.csv")
+            paths.append(SyntheticLogGenerator.write_ecl_report(path, len(rows), seed=seed * 1000 + i))
+        for i, rows in enumerate(np.array_split(np.arange(dmp_rows), max(dmp_files, 1))):
+            if dmp_files == 0:
+                break
+            path = os.path.join(folder_path, f"log{i + 1:04d}_synthetic.csv")
+            paths.append(SyntheticLogGenerator.write_dmp_log(path, len(rows), seed=seed * 1000 + 500 + i))
+        return paths
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic ECL/ECF reports and DMP logs")
+    parser.add_argument("folder", help="Destination folder")
+    parser.add_argument("--ecl-rows", type=int, default=1000, help="Total ECL listing rows (default: 1000)")
+    parser.add_argument("--dmp-rows", type=int, default=1000, help="Total DMP samples (default: 1000)")
+    parser.add_argument("--ecl-files", type=int, default=1, help="Number of ECL/ECF reports (default: 1)")
+    parser.add_argument("--dmp-files", type=int, default=1, help="Number of DMP logs (default: 1)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    args = parser.parse_args()
+
+    paths = SyntheticLogGenerator.generate_folder(
+        args.folder, args.ecl_rows, args.dmp_rows, args.ecl_files, args.dmp_files, args.seed
+    )
+    for path in paths:
+        print(f"Wrote {path} ({os.path.getsize(path) / 1e6:.2f} MB)")
+
+if __name__ == "__main__":
+    main()
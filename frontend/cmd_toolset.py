@@ -1,9 +1,18 @@
 import os
-import pandas as pd
-import matplotlib.pyplot as plt
+import sys
+import argparse
 from collections import Counter
+from functools import partial
+from multiprocessing import Pool
+
+# The backend helpers are imported by the modes that use them, so the plotting
+# mode keeps working without them
 
 def analyze_csv_files(folder_path):
+    # pandas and matplotlib are only needed by this plotting mode
+    import pandas as pd
+    import matplotlib.pyplot as plt
+
     if not os.path.exists(folder_path):
         print(f"Folder '{folder_path}' does not exist.")
         return
@@ -94,9 +103,183 @@ def analyze_csv_files(folder_path):
             print(f"Error processing file '{file}': {e}")
 
         
-        
+
+
+def print_frequency_table(table_data, title):
+    print(f"\n{title}")
+    print(f"{'Item':<30}{'Frequency':<10}")
+    print("-" * 40)
+    for item, count in table_data:
+        print(f"{item:<30}{count:<10}")
+
+def count_frequencies_streaming(folder_path, column_name="description", top_n=20, workers=1):
+    """
+    Count one column across all CSV files without pandas or plot windows.
+
+    Files are streamed line by line, so memory stays flat regardless of file
+    size. Per-file counters are merged into one combined table.
+
+    Args:
+        folder_path (str): Folder containing CSV files
+        column_name (str): Column to count (case-insensitive)
+        top_n (int): Number of rows in the combined table (0 for all)
+        workers (int): Number of processes used to count files in parallel
+
+    Returns:
+        Counter: Combined frequencies across all files
+    """
+    from backend.utils.column_streamer import ColumnStreamer
+
+    if not os.path.exists(folder_path):
+        print(f"Folder '{folder_path}' does not exist.")
+        return Counter()
+
+    csv_files = sorted(f for f in os.listdir(folder_path) if f.endswith('.csv'))
+    if not csv_files:
+        print(f"No CSV files found in the folder '{folder_path}'.")
+        return Counter()
+
+    file_paths = [os.path.join(folder_path, f) for f in csv_files]
+    count_file = partial(ColumnStreamer.count_column, column_name=column_name)
+
+    if workers > 1:
+        with Pool(processes=workers) as pool:
+            counters = pool.map(count_file, file_paths)
+    else:
+        counters = map(count_file, file_paths)
+
+    combined = Counter()
+    for file, counter in zip(csv_files, counters):
+        print(f"{file}: {sum(counter.values())} values, {len(counter)} distinct")
+        combined.update(counter)
+
+    if not combined:
+        print(f"Column '{column_name}' not found in any file.")
+        return combined
+
+    table_data = combined.most_common(top_n if top_n > 0 else None)
+    print_frequency_table(table_data, f"Combined Frequency Table (top {len(table_data)} of {len(combined)}):")
+    return combined
+
+def list_units(folder_path):
+    """
+    Units of an archive: each subfolder with CSV files, plus the folder
+    itself if it holds CSV files directly.
+
+    Returns:
+        list: (unit name, sorted CSV paths) pairs
+    """
+    units = []
+    for root in [folder_path] + sorted(
+        os.path.join(folder_path, d) for d in os.listdir(folder_path) if os.path.isdir(os.path.join(folder_path, d))
+    ):
+        files = sorted(os.path.join(root, f) for f in os.listdir(root) if f.endswith('.csv'))
+        if files:
+            units.append((os.path.basename(os.path.normpath(root)), files))
+    return units
+
+def stream_unit_heavy_hitters(unit, column_name, capacity, tracked):
+    """
+    Stream one unit's files into a HeavyHitters summary (runs in a worker).
+
+    Returns:
+        tuple: (unit name, HeavyHitters.to_dict())
+    """
+    from backend.utils.column_streamer import ColumnStreamer
+    from backend.utils.heavy_hitters import HeavyHitters
+
+    name, files = unit
+    hitters = HeavyHitters(capacity=capacity, tracked=tracked)
+    for file_path in files:
+        try:
+            hitters.update(ColumnStreamer.iter_column(file_path, column_name))
+        except OSError as e:
+            print(f"Error streaming file {file_path}: {e}")
+    return name, hitters.to_dict()
+
+def print_heavy_hitters(hitters, top_n, title):
+    rows = hitters.top(top_n)
+    print(f"\n{title}")
+    print(f"{'Item':<30}{'Count':>10}{'Bounds':>20}  ")
+    print("-" * 62)
+    for row in rows:
+        bounds = "exact" if row["exact"] else f"{row['lower']}-{row['upper']}"
+        marker = "" if row["guaranteed"] else "  ?"
+        print(f"{str(row['value'])[:29]:<30}{row['count']:>10}{bounds:>20}{marker}")
+    print(f"{hitters.total} values; counts overestimate by at most {hitters.error_bound:.1f} "
+          f"('?' = may not be in the true top {top_n})")
+
+def track_heavy_hitters(folder_path, column_name="description", top_n=20, workers=1, capacity=1000, tracked=()):
+    """
+    Approximate top values overall and per unit in fixed memory.
+
+    Rows are streamed from the files and never kept; each unit (subfolder)
+    gets a HeavyHitters summary and the overall table is their merge.
+    Values in `tracked` are always counted exactly.
+
+    Args:
+        folder_path (str): Archive folder (unit subfolders and/or CSV files)
+        column_name (str): Column to count (case-insensitive)
+        top_n (int): Rows per table
+        workers (int): Number of processes streaming units in parallel
+        capacity (int): Space-Saving counters per unit
+        tracked (iterable): Values to count exactly
+
+    Returns:
+        tuple: (overall HeavyHitters, dict of unit name -> HeavyHitters)
+    """
+    from backend.utils.heavy_hitters import HeavyHitters
+
+    if not os.path.exists(folder_path):
+        print(f"Folder '{folder_path}' does not exist.")
+        return None, {}
+    units = list_units(folder_path)
+    if not units:
+        print(f"No CSV files found in the folder '{folder_path}'.")
+        return None, {}
+
+    stream_unit = partial(stream_unit_heavy_hitters, column_name=column_name, capacity=capacity,
+                          tracked=list(tracked))
+    if workers > 1:
+        with Pool(processes=workers) as pool:
+            results = pool.map(stream_unit, units)
+    else:
+        results = map(stream_unit, units)
+
+    per_unit = {name: HeavyHitters.from_dict(data) for name, data in results}
+    overall = HeavyHitters(capacity=capacity, tracked=tracked)
+    for name, hitters in per_unit.items():
+        if len(per_unit) > 1:
+            print_heavy_hitters(hitters, top_n, f"Unit {name} (top {top_n}):")
+        overall.merge(hitters)
+    print_heavy_hitters(overall, top_n, f"Overall (top {top_n}, {len(per_unit)} unit(s)):")
+    return overall, per_unit
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="CMD Toolset for CSV error logs")
+    parser.add_argument("folder", nargs="?", help="Folder containing CSV files (prompted if omitted)")
+    parser.add_argument("--stream", action="store_true", help="Stream files and print combined tables without plotting")
+    parser.add_argument("--column", default="description", help="Column to count in streaming mode (default: description)")
+    parser.add_argument("--top", type=int, default=20, help="Rows in the combined table, 0 for all (default: 20)")
+    parser.add_argument("--workers", type=int, default=1, help="Processes used in streaming mode (default: 1)")
+    parser.add_argument("--heavy-hitters", action="store_true",
+                        help="Approximate top values overall and per unit subfolder in fixed memory")
+    parser.add_argument("--capacity", type=int, default=1000,
+                        help="Counters per unit in heavy-hitters mode (default: 1000)")
+    parser.add_argument("--track", action="append", default=[],
+                        help="Value counted exactly in heavy-hitters mode (repeatable)")
+    return parser.parse_args()
 
 if __name__ == "__main__":
+    # `python frontend/cmd_toolset.py` puts frontend/ first on sys.path; the
+    # backend package lives in the repository root one level up
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    args = parse_args()
     print("Welcome to CMD Toolset")
-    folder_path = input("Enter the folder path containing CSV files: ").strip()
-    analyze_csv_files(folder_path)
+    folder_path = args.folder or input("Enter the folder path containing CSV files: ").strip()
+    if args.heavy_hitters:
+        track_heavy_hitters(folder_path, args.column, args.top, args.workers, args.capacity, args.track)
+    elif args.stream:
+        count_frequencies_streaming(folder_path, args.column, args.top, args.workers)
+    else:
+        analyze_csv_files(folder_path)
@@ -1,11 +1,13 @@
 import streamlit as st
 
 from frontend.utils.css_utils import get_metrics_css
-from frontend.compute.visualizations import create_bar_chart, create_pie_chart, create_treemap, get_color
 def update_chart(data_handler, selected_errors, chart_type):
         if not data_handler or len(selected_errors) == 0:
             st.warning("No data to display. Please select errors to visualize.")
             return
+
+        # Plotly is only loaded once there is something to draw
+        from frontend.compute.visualizations import create_bar_chart, create_pie_chart, create_treemap, get_color
         
         filtered_data = data_handler.ecl_freq_summary[
             data_handler.ecl_freq_summary['Description'].isin(selected_errors)
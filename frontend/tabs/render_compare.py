@@ -0,0 +1,102 @@
+import streamlit as st
+from frontend.utils.render_section_header import render_section_header
+
+COMPARE_TABLES = {
+    "ECL Events": ("ecl", "Frequency", "Share of events (%)"),
+    "ECF Counts": ("ecf", "Frequency", "Share of events (%)"),
+    "DMP Channels": ("dmp", "Samples", "Samples per hour"),
+    "Valve Activations": ("valves", "Activations", "Activations per hour"),
+}
+
+def largest_differences(table, top_n, normalised):
+    """
+    Rows to chart: the top_n largest rate differences, or count differences
+    when not normalised.
+    """
+    # Tables come sorted by the largest rate difference
+    if not normalised:
+        table = table.sort_values("Delta", key=lambda delta: delta.abs(), ascending=False, kind="stable")
+    return table.head(int(top_n))
+
+def render_compare():
+    render_section_header(
+        "Dataset Comparison",
+        "Compare two vehicles, or the same vehicle before and after maintenance.",
+        "⚖️"
+    )
+
+    baseline = st.session_state.data_handler
+    other = st.session_state.comparison_handler
+    if not baseline:
+        st.warning("Please upload the files of the first dataset to begin comparison")
+        return
+    if not other:
+        st.info("Upload the files of a second dataset under 'Compare With' in the sidebar")
+        return
+
+    # Loaded only once there are two datasets to chart
+    import plotly.graph_objects as go
+
+    labels = ("A", "B")
+    # The comparison only reads cached summaries; keep it for reruns of this pair
+    pair = (getattr(baseline, 'key', id(baseline)), getattr(other, 'key', id(other)))
+    cached = st.session_state.get('comparison')
+    if cached is None or cached[0] != pair:
+        cached = (pair, baseline.compare(other, labels))
+        st.session_state.comparison = cached
+    comparison = cached[1]
+
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        table_name = st.radio("Compare", list(COMPARE_TABLES), horizontal=True, key='compare_table')
+    with col2:
+        normalised = st.toggle("Normalise", value=True, key='compare_normalised',
+                               help="Compare shares of all events (ECL/ECF) or rates per logged hour (DMP)")
+    with col3:
+        top_n = st.number_input("Top", min_value=5, max_value=100, value=20, step=5, key='compare_top_n',
+                                help="Largest differences to chart")
+
+    key, value, rate_title = COMPARE_TABLES[table_name]
+    table = comparison.get(key)
+    if table is None or table.empty:
+        st.info(f"No {table_name} data in either dataset")
+        return
+
+    totals = [int(table[f"{value} {label}"].sum()) for label in labels]
+    metric_cols = st.columns(3)
+    metric_cols[0].metric(f"Total {value} A", f"{totals[0]:,}")
+    metric_cols[1].metric(f"Total {value} B", f"{totals[1]:,}", delta=f"{totals[1] - totals[0]:+,}",
+                          delta_color="inverse")
+    metric_cols[2].metric("Changed", f"{int((table['Delta'] != 0).sum()):,}",
+                          help="Codes or channels whose count differs between the datasets")
+
+    shown = largest_differences(table, top_n, normalised)
+    names = shown.iloc[:, 0].astype(str)
+    if key == "ecf":
+        names = shown["Code(hex)"].astype(str) + " " + shown["Description"].astype(str)
+
+    fig = go.Figure()
+    for label, color in zip(labels, ('rgba(58, 71, 180, 0.7)', 'rgba(253, 126, 20, 0.7)')):
+        column = f"Rate {label}" if normalised else f"{value} {label}"
+        fig.add_trace(go.Bar(
+            name=label,
+            y=names,
+            x=shown[column],
+            orientation='h',
+            marker_color=color,
+            hovertemplate='<b>%{y}</b><br>' + label + ': %{x:,.3f}<extra></extra>'
+        ))
+    fig.update_layout(
+        barmode='group',
+        title=f"{table_name}: A vs B",
+        xaxis_title=rate_title if normalised else value,
+        yaxis=dict(autorange='reversed'),
+        height=max(400, 28 * len(shown) + 120),
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='right', x=1)
+    )
+    fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='LightGrey')
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.dataframe(table, use_container_width=True, hide_index=True)
@@ -1,7 +1,4 @@
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
-import pandas as pd
 from frontend.utils.render_section_header import render_section_header
 
 def render_dump_log():
@@ -15,6 +12,12 @@ def render_dump_log():
         st.warning("Please upload DMP log files to begin analysis")
         return
 
+    # Loaded only once there is DMP data to chart
+    import plotly.express as px
+    import plotly.graph_objects as go
+    import pandas as pd
+    import numpy as np
+
     # Create two columns for layout
     col1, col2 = st.columns([2, 1])
     
@@ -71,19 +74,69 @@ def render_dump_log():
             fig_pie.update_traces(textposition='inside', textinfo='percent+label')
             st.plotly_chart(fig_pie, use_container_width=True)
     
+    # Valve actuations, drawn from the run-length encoded intervals
+    st.subheader("Valve Activations")
+
+    activation_summary = st.session_state.data_handler.valve_activation_summary
+    activations = st.session_state.data_handler.valve_activations
+
+    if not activation_summary.empty:
+        st.dataframe(activation_summary, hide_index=True)
+
+        log_files = activations["Source File"].dropna().unique().tolist()
+        if log_files:
+            selected_log = st.selectbox("Log file", log_files, key="activation_log_select")
+            shown = activations[activations["Source File"] == selected_log]
+        else:
+            shown = activations
+
+        fig_timeline = go.Figure(go.Bar(
+            base=shown["Start Time"],
+            x=shown["Duration (s)"],
+            y=shown["Channel"].astype(str),
+            orientation='h',
+            marker_color='rgba(58, 71, 180, 0.6)',
+            hovertemplate='<b>%{y}</b><br>Start: %{base:.1f} s<br>Duration: %{x:.1f} s<extra></extra>'
+        ))
+        fig_timeline.update_layout(
+            title="Activation Timeline",
+            xaxis_title="Time (s)",
+            yaxis_title="Channel",
+            height=300,
+            showlegend=False,
+            plot_bgcolor='white',
+            paper_bgcolor='white'
+        )
+        st.plotly_chart(fig_timeline, use_container_width=True)
+    else:
+        st.info("No valve activations found")
+
     # Filtered Data Table Section
     st.subheader("Detailed Event Log")
     
     filtered_dmp = st.session_state.data_handler.filtered_dmp
     
     if not filtered_dmp.empty:
-        # # Add search functionality
-        # search = st.text_input("Search events", "")
+        # Filter on any DMP channel, e.g. "REF_SPEED > 200 and FILL_2 == 1"
+        expression = st.text_input(
+            "Filter samples",
+            "",
+            placeholder="REF_SPEED > 200 and FILL_2 == 1 and ACC_3 < -20",
+            help="Compare DMP columns with ==, !=, <, <=, >, >=; combine with and / or / not; "
+                 "use + - * / and abs() for derived values"
+        )
         
-        # # Filter based on search
-        # if search:
-        #     mask = filtered_dmp.astype(str).apply(lambda x: x.str.contains(search, case=False)).any(axis=1)
-        #     filtered_dmp = filtered_dmp[mask]
+        if expression.strip():
+            from backend.utils.exceptions import DMPFilterError
+
+            dmp_filter = st.session_state.data_handler.dmp_filter()
+            try:
+                # Count first; rows are only taken when something matches
+                matches = dmp_filter.count(expression)
+                st.caption(f"{matches:,} of {len(filtered_dmp):,} samples match")
+                filtered_dmp = dmp_filter.apply(expression, filtered_dmp) if matches else filtered_dmp.iloc[0:0]
+            except DMPFilterError as e:
+                st.error(str(e))
         
         # Add column selector
         selected_columns = st.multiselect(
@@ -124,29 +177,111 @@ def render_dump_log():
     else:
         st.info("No filtered data available")
     
+    with st.expander("Wheel Slide Detection"):
+        from backend.data_processors.wheel_slide_detector import WheelSlideDetector
+
+        slide_col1, slide_col2 = st.columns(2)
+        with slide_col1:
+            slip_threshold = st.slider(
+                "Slip threshold (%)", 5, 50,
+                int(WheelSlideDetector.DEFAULTS["slip_threshold"] * 100), key="slide_slip_threshold"
+            )
+        with slide_col2:
+            min_duration = st.slider(
+                "Minimum duration (s)", 0.1, 2.0,
+                float(WheelSlideDetector.DEFAULTS["min_duration"]), step=0.1, key="slide_min_duration"
+            )
+
+        events = st.session_state.data_handler.detect_wheel_slide(
+            slip_threshold=slip_threshold / 100, min_duration=min_duration
+        )
+        if events.empty:
+            st.info("No sustained wheel slide detected")
+        else:
+            slide_summary = WheelSlideDetector.summarize(events)
+            s1, s2, s3 = st.columns(3)
+            s1.metric("Slide Events", f"{len(events):,}")
+            s2.metric("Axle Locks", f"{events['Description'].str.endswith('_LOCK').sum():,}")
+            s3.metric("Total Slide Time", f"{events['Duration (s)'].sum():.1f} s")
+
+            fig_slide = px.bar(
+                slide_summary, x="Description", y="Frequency",
+                hover_data=["Total Duration (s)"], title="Detected Events by Axle"
+            )
+            fig_slide.update_layout(height=350, plot_bgcolor='white', paper_bgcolor='white')
+            st.plotly_chart(fig_slide, use_container_width=True)
+            st.dataframe(events, height=300)
+
+    with st.expander("Diagnostic Flags"):
+        diagnostic_summary = st.session_state.data_handler.diagnostic_freq_summary
+        if diagnostic_summary.empty:
+            st.info("No diagnostic flags set")
+        else:
+            fig_diag = go.Figure(go.Bar(
+                x=diagnostic_summary.index,
+                y=diagnostic_summary.values,
+                marker_color='rgba(180, 71, 58, 0.6)',
+                hovertemplate='<b>Flag:</b> %{x}<br><b>Samples set:</b> %{y:,.0f}<extra></extra>'
+            ))
+            fig_diag.update_layout(
+                title="Samples with Each Flag Set",
+                xaxis_title="Flag (DIA<byte>_B<bit>)",
+                yaxis_title="Samples",
+                height=350,
+                plot_bgcolor='white',
+                paper_bgcolor='white'
+            )
+            st.plotly_chart(fig_diag, use_container_width=True)
+            st.dataframe(st.session_state.data_handler.diagnostic_intervals(), height=300, hide_index=True)
+
     # Add additional analysis options
     with st.expander("Advanced Analysis Options"):
         st.write("Time Series Analysis")
-        if 'Time' in filtered_dmp.columns:
+        data_handler = st.session_state.data_handler
+        timeline = data_handler.dmp_timeline
+        if not timeline.empty:
+            # All logs on one clock (MOD_TICK); gaps between recordings are left blank
+            st.dataframe(data_handler.dmp_segments, hide_index=True)
+            
+            numeric_columns = [col for col in data_handler.dmp.select_dtypes("number").columns
+                               if col not in ('Time', 'MOD_TICK', 'MONTIME')]
             selected_column = st.selectbox(
                 "Select column for time series analysis",
-                options=[col for col in filtered_dmp.columns if col != 'Time']
+                options=numeric_columns,
+                index=numeric_columns.index('REF_SPEED') if 'REF_SPEED' in numeric_columns else 0
+            )
+            
+            span = float(timeline['Timeline (s)'].iloc[-1])
+            time_start, time_end = st.slider(
+                "Time range (s)", 0.0, max(span, 0.1), (0.0, max(span, 0.1)), key="timeline_range"
             )
+            series = data_handler.dmp_time_range(time_start, time_end, [selected_column])
+            
+            # NaN at each segment start breaks the line across recording gaps
+            breaks = (series['Segment'].diff().fillna(0) != 0).to_numpy().nonzero()[0]
+            x = np.insert(series['Timeline (s)'].to_numpy(dtype=float), breaks, np.nan)
+            y = np.insert(series[selected_column].to_numpy(dtype=float), breaks, np.nan)
             
             # Create time series plot
             fig_time = go.Figure()
             fig_time.add_trace(go.Scatter(
-                x=filtered_dmp['Time'],
-                y=filtered_dmp[selected_column],
-                mode='lines+markers',
+                x=x,
+                y=y,
+                mode='lines',
                 name=selected_column
             ))
             
             fig_time.update_layout(
                 title=f"Time Series Analysis: {selected_column}",
-                xaxis_title="Time",
+                xaxis_title="Time since first sample (s)",
                 yaxis_title="Value",
                 height=400
             )
             
-            st.plotly_chart(fig_time, use_container_width=True)
\ No newline at end of file
+            st.plotly_chart(fig_time, use_container_width=True)
+            
+            if not data_handler.dmp_transitions.empty:
+                st.write("Log Transitions")
+                st.dataframe(data_handler.dmp_transitions, hide_index=True)
+        else:
+            st.info("No MOD_TICK timeline available")
\ No newline at end of file
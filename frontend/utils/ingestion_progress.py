@@ -0,0 +1,63 @@
+import os
+import streamlit as st
+
+def render_ingestion_progress(job, state_key):
+    """Progress bar, counters and a Cancel button for a running IngestionJob."""
+    progress = job.progress()
+    if progress["total"]:
+        text = f"Reading files: {progress['done']} / {progress['total']}"
+        if progress["file"]:
+            text += f" ({os.path.basename(progress['file'])})"
+    else:
+        text = "Preparing files..."
+    st.progress(progress["fraction"], text=text)
+
+    details = f"{progress['bytes'] / 1e6:.1f} MB, {progress['rows']:,} rows in {progress['elapsed']:.0f}s"
+    if progress["remaining"] is not None:
+        details += f", about {progress['remaining']:.0f}s left"
+    if progress["failed"]:
+        details += f", {progress['failed']} file(s) failed"
+    st.caption(details)
+
+    if st.button("Cancel", key=f"cancel_{state_key}", help="Stop reading; files already read are discarded"):
+        job.cancel()
+    if job.cancelling:
+        st.caption("Cancelling after the files being read...")
+
+def render_partial_preview(job, section):
+    """
+    Summaries of the files read so far, while the rest are still loading.
+
+    Args:
+        job (IngestionJob): Running job
+        section (str): 'ecl' for error frequencies, 'dmp' for valve counts
+    """
+    progress = job.progress()
+    partial = job.partial
+    st.info(
+        f"Showing the first {progress['done']} of {progress['total'] or '?'} files; "
+        "the full analysis opens when loading finishes."
+    )
+    if section == "ecl":
+        summary = partial.ecl_frequency()
+        if summary.empty:
+            st.caption("No error log rows read yet")
+            return
+        # Loaded only once there is something to chart
+        import plotly.graph_objects as go
+
+        top = summary.head(20)
+        fig = go.Figure(go.Bar(x=top['Frequency'], y=top['Description'], orientation='h',
+                               marker_color='rgba(58, 71, 180, 0.6)'))
+        fig.update_layout(title="Most Frequent Errors So Far", yaxis={'autorange': 'reversed'},
+                          height=max(300, 22 * len(top)), margin={'l': 10, 'r': 10, 't': 40, 'b': 10})
+        st.plotly_chart(fig, use_container_width=True)
+        st.dataframe(summary, hide_index=True, use_container_width=True, height=300)
+    else:
+        frequency = partial.dmp_frequency()
+        if frequency.empty:
+            st.caption("No dump log rows read yet")
+            return
+        st.subheader("Valve Samples So Far")
+        st.bar_chart(frequency)
+        st.dataframe(partial.activation_summary(), hide_index=True, use_container_width=True)
@@ -1,6 +1,8 @@
 
+import os
 import streamlit as st
 
+
 def show_help():
     with st.sidebar.expander("Help", expanded=False):
         st.markdown("""
@@ -26,6 +28,7 @@ def show_help():
            - Multiple chart types
         """)
 
+
 def show_credits():
     with st.sidebar.expander("Credits", expanded=False):
         st.markdown("""
@@ -41,4 +44,62 @@ def show_credits():
         Wabtec Corporation
         
         © 2024 Wabtec Corporation
-        """)
\ No newline at end of file
+        """)
+
+
+def show_diagnostics(data_handler, registry_stats=None):
+    with st.sidebar.expander("Diagnostics", expanded=False):
+        st.checkbox(
+            "Capture cProfile report",
+            key="diagnostics_profile",
+            help="Profile the next ingestion (slower)"
+        )
+        st.checkbox(
+            "Trace memory allocations",
+            key="diagnostics_trace_memory",
+            help="Record peak memory and top allocations with tracemalloc (slower)"
+        )
+
+        if not data_handler:
+            st.info("Upload files to see ingestion diagnostics")
+            return
+
+        stats = data_handler.stats
+        file_table = stats.file_table()
+        file_table['file'] = file_table['file'].map(os.path.basename)
+        c1, c2 = st.columns(2)
+        c1.metric("Ingestion Time", f"{stats.total_seconds:.2f}s")
+        c2.metric("Input Size", f"{file_table['bytes'].sum() / 1e6:.2f} MB")
+        c1, c2 = st.columns(2)
+        c1.metric("Duplicate Files", int((file_table['status'] == 'duplicate').sum()))
+        c2.metric("Overlapping Rows Dropped", sum(stats.dropped_rows.values()))
+        c1, c2 = st.columns(2)
+        c1.metric("Failed Files", int((file_table['status'] == 'error').sum()))
+        c2.metric("Skipped Files", int((file_table['status'] == 'skipped').sum()))
+
+        st.markdown("**Stages**")
+        st.dataframe(stats.span_table(), hide_index=True, use_container_width=True)
+
+        st.markdown("**Files**")
+        st.dataframe(file_table, hide_index=True, use_container_width=True)
+
+        st.markdown("**Frame Memory**")
+        st.dataframe(stats.frame_table(), hide_index=True, use_container_width=True)
+
+        if stats.memory_peak_bytes is not None:
+            st.metric("Peak Traced Memory", f"{stats.memory_peak_bytes / 1e6:.1f} MB")
+            st.dataframe(stats.top_allocations, use_container_width=True)
+
+        if stats.profile_report:
+            st.markdown("**cProfile (cumulative)**")
+            st.code(stats.profile_report, language="text")
+
+        if registry_stats:
+            st.markdown("**Shared Datasets**")
+            c1, c2 = st.columns(2)
+            c1.metric("Loaded", len(registry_stats["datasets"]))
+            c2.metric(
+                "Memory",
+                f"{registry_stats['memory_bytes'] / 1e6:.1f} / {registry_stats['memory_budget_bytes'] / 1e6:.0f} MB"
+            )
+            st.dataframe(registry_stats["datasets"], use_container_width=True)
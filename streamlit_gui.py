@@ -1,26 +1,32 @@
 # src/frontend/streamlit_gui.py
 
+import time
+import pandas as pd
 import streamlit as st
-import plotly.graph_objects as go
-import plotly.express as px
-from backend.data_handler import DataHandler
-import tempfile
-import os
-from pathlib import Path
-from functools import lru_cache
-from frontend.compute.visualizations import create_bar_chart, create_pie_chart, create_treemap, get_color
 from frontend.utils.css_utils import inject_main_css, inject_column_css, get_metrics_css  # Import CSS utilities
-from frontend.utils.sidebar_utils import show_help, show_credits  # Import sidebar utilities
-from frontend.tabs.render_brakes_log import render_brakes_log;
-from frontend.tabs.render_dump_log import render_dump_log;
-from frontend.tabs.render_summary import render_summary;
+from frontend.utils.sidebar_utils import show_help, show_credits, show_diagnostics  # Import sidebar utilities
+
+# The backend, Plotly and the tab modules are imported where they are first
+# needed, so the first paint only pays for Streamlit itself.
+# (Plain import statements keep them visible to PyInstaller's analysis.)
+
+# Sessions share loaded datasets through shallow copies (see
+# backend.dataset_registry), which copy-on-write keeps isolated from each
+# other. Enabled once for the whole app; Streamlit has already imported pandas.
+pd.set_option("mode.copy_on_write", True)
 
 class StreamlitGUI:
+    # Seconds between reruns that refresh the progress of background loads
+    PROGRESS_POLL_SECONDS = 0.5
+
     def __init__(self):
         self.init_page_config()
         self.init_session_state()
-        # Use the get_color function from visualizations.py
-        self.get_color = get_color
+
+    def get_color(self, i):
+        # Use the get_color function from visualizations.py (loads Plotly on first use)
+        from frontend.compute.visualizations import get_color
+        return get_color(i)
     
     def init_page_config(self):
         st.set_page_config(
@@ -127,58 +133,186 @@ class StreamlitGUI:
         # Add new state variable for annotation toggle
         if 'show_percentage' not in st.session_state:
             st.session_state.show_percentage = True  # Default to showing percentages
+        if 'comparison_handler' not in st.session_state:
+            st.session_state.comparison_handler = None
+        # Background loads by target state key ('data_handler', 'comparison_handler')
+        if 'ingestion_jobs' not in st.session_state:
+            st.session_state.ingestion_jobs = {}
+        # Fingerprints of the current uploads and of uploads whose load was cancelled
+        if 'upload_fingerprints' not in st.session_state:
+            st.session_state.upload_fingerprints = {}
+        if 'cancelled_uploads' not in st.session_state:
+            st.session_state.cancelled_uploads = {}
         if 'selected_tags' not in st.session_state:
             st.session_state.selected_tags = set()
         if 'tab_badges' not in st.session_state:
             st.session_state.tab_badges = {
                 'Brakes Log': {'count': 0, 'color': '#dc3545'},
                 'Dump Log': {'count': 0, 'color': '#fd7e14'},
-                'Summary': {'count': 0, 'color': '#198754'}
+                'Summary': {'count': 0, 'color': '#198754'},
+                'Compare': {'count': 0, 'color': '#0d6efd'}
             }
     
+    @staticmethod
+    def fingerprint_uploads(uploaded_files, state_key):
+        from backend.dataset_registry import DatasetRegistry
+        # Hashing every buffer on each rerun would dominate the progress polling
+        upload_ids = tuple((f.file_id, f.name, f.size) for f in uploaded_files)
+        cached = st.session_state.upload_fingerprints.get(state_key)
+        if cached is None or cached[0] != upload_ids:
+            cached = (upload_ids, DatasetRegistry.fingerprint(
+                (uploaded_file.name, uploaded_file.getbuffer()) for uploaded_file in uploaded_files
+            ))
+            st.session_state.upload_fingerprints[state_key] = cached
+        return cached[1]
+
+    def acquire_dataset(self, uploaded_files, state_key):
+        from backend.dataset_registry import get_registry
+        from backend.ingestion_job import IngestionJob
+        from frontend.utils.ingestion_progress import render_ingestion_progress
+        # Sessions uploading the same files share one loaded dataset
+        dataset_key = self.fingerprint_uploads(uploaded_files, state_key)
+        current = st.session_state[state_key]
+        if current is not None and getattr(current, 'key', None) == dataset_key:
+            return
+
+        jobs = st.session_state.ingestion_jobs
+        job = jobs.get(state_key)
+        if job is not None and job.key != dataset_key:
+            # A new upload replaced the one being read
+            jobs.pop(state_key).cancel()
+            job = None
+        if job is None:
+            if current is not None:
+                # The dataset of the replaced upload is no longer shown
+                current.release()
+                st.session_state[state_key] = None
+            if st.session_state.cancelled_uploads.get(state_key) == dataset_key:
+                self.show_cancelled(state_key)
+                return
+            # Files are parsed in a background thread; this script run only
+            # shows progress and reruns until the load finishes
+            job = jobs[state_key] = IngestionJob(
+                files=list(uploaded_files),
+                registry=get_registry(),
+                key=dataset_key,
+                profile=st.session_state.get('diagnostics_profile', False),
+                trace_memory=st.session_state.get('diagnostics_trace_memory', False)
+            ).start()
+
+        if not job.finished:
+            render_ingestion_progress(job, state_key)
+            return
+
+        del jobs[state_key]
+        if job.state == IngestionJob.DONE:
+            st.session_state[state_key] = job.result
+        elif job.state == IngestionJob.CANCELLED:
+            st.session_state.cancelled_uploads[state_key] = dataset_key
+            self.show_cancelled(state_key)
+        else:
+            st.error(f"Failed to load data: {str(job.error)}")
+
+    @staticmethod
+    def release_dataset(state_key):
+        """Drop the dataset (and any load) of an upload that was cleared."""
+        job = st.session_state.ingestion_jobs.pop(state_key, None)
+        if job is not None:
+            job.cancel()
+        if st.session_state[state_key] is not None:
+            # Unpin it in the shared registry instead of waiting for the session to end
+            st.session_state[state_key].release()
+            st.session_state[state_key] = None
+        st.session_state.cancelled_uploads.pop(state_key, None)
+        st.session_state.upload_fingerprints.pop(state_key, None)
+
+    @staticmethod
+    def show_cancelled(state_key):
+        # The upload is kept; it is only read again on request
+        st.warning("Loading was cancelled")
+        if st.button("Load Again", key=f"reload_{state_key}"):
+            del st.session_state.cancelled_uploads[state_key]
+            st.rerun()
+
+    def loading_job(self, state_key):
+        """The running background load for `state_key`, if any."""
+        job = st.session_state.ingestion_jobs.get(state_key)
+        return job if job is not None and not job.finished else None
+
     def render(self):
         # Create tabs for navigation
         # Create tabs with plain text labels
-        tabs = st.tabs(["Brakes Log", "Dump Log", "Summary"])
+        tabs = st.tabs(["Brakes Log", "Dump Log", "Summary", "Compare"])
         
         # Sidebar content
         with st.sidebar:
             st.header("Settings")
             uploaded_files = st.file_uploader(
                 "Upload CSV Files",
-                type=['csv'],
+                type=['csv', 'gz', 'xz', 'zst', 'zip', 'tar', 'tgz'],
                 accept_multiple_files=True,
-                help="Select one or more CSV files containing error data"
+                help="Select one or more CSV files containing error data, compressed CSVs or .zip/.tar bundles"
             )
             
             if uploaded_files:
-                with st.spinner('Processing files...'):
-                    with tempfile.TemporaryDirectory() as temp_dir:
-                        for uploaded_file in uploaded_files:
-                            temp_file_path = os.path.join(temp_dir, uploaded_file.name)
-                            with open(temp_file_path, 'wb') as f:
-                                f.write(uploaded_file.getvalue())
-                        
-                        try:
-                            st.session_state.data_handler = DataHandler(temp_dir)
-                            if len(st.session_state.data_handler.ecl_freq_summary) == 0:
-                                st.error("No data found in the uploaded files or files are empty!")
-                        except Exception as e:
-                            st.error(f"Failed to load data: {str(e)}")
+                from backend.dataset_registry import get_registry
+                self.acquire_dataset(uploaded_files, 'data_handler')
+                if st.session_state.data_handler is not None and len(st.session_state.data_handler.ecl_freq_summary) == 0:
+                    st.error("No data found in the uploaded files or files are empty!")
             elif not uploaded_files:
+                self.release_dataset('data_handler')
                 st.info("👆 Please upload CSV files to begin analysis")
+
+            # A second dataset (another vehicle, or the same one after
+            # maintenance) for the Compare tab
+            with st.expander("Compare With", expanded=False):
+                comparison_files = st.file_uploader(
+                    "Upload CSV Files to Compare",
+                    type=['csv', 'gz', 'xz', 'zst', 'zip', 'tar', 'tgz'],
+                    accept_multiple_files=True,
+                    key='comparison_files',
+                    help="Files of the dataset to compare against the main upload"
+                )
+                if comparison_files:
+                    self.acquire_dataset(comparison_files, 'comparison_handler')
+                else:
+                    self.release_dataset('comparison_handler')
             show_help()
+            show_diagnostics(
+                st.session_state.data_handler,
+                get_registry().stats() if uploaded_files else None
+            )
             show_credits()
         
         # Render content based on active tab
+        # While the first upload loads, the first two tabs preview the files read so far
+        loading = self.loading_job('data_handler') if st.session_state.data_handler is None else None
         with tabs[0]:
-            render_brakes_log()
+            if loading is not None:
+                from frontend.utils.ingestion_progress import render_partial_preview
+                render_partial_preview(loading, 'ecl')
+            else:
+                from frontend.tabs.render_brakes_log import render_brakes_log
+                render_brakes_log()
         with tabs[1]:
-            render_dump_log()
-            pass
+            if loading is not None:
+                from frontend.utils.ingestion_progress import render_partial_preview
+                render_partial_preview(loading, 'dmp')
+            else:
+                from frontend.tabs.render_dump_log import render_dump_log
+                render_dump_log()
         with tabs[2]:
+            from frontend.tabs.render_summary import render_summary
             render_summary()
             pass
+        with tabs[3]:
+            from frontend.tabs.render_compare import render_compare
+            render_compare()
+
+        # Keep polling until every background load has finished
+        if any(not job.finished for job in st.session_state.ingestion_jobs.values()):
+            time.sleep(self.PROGRESS_POLL_SECONDS)
+            st.rerun()
 
 def main():
     gui = StreamlitGUI()
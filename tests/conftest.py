@@ -0,0 +1,20 @@
+import os
+import sys
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_FOLDER = os.path.join(REPO_ROOT, "csv")
+
+# The backend and frontend packages are imported from the repository root
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+@pytest.fixture
+def sample_folder():
+    """Folder with the sample ECL/ECF reports and DMP logs."""
+    return SAMPLE_FOLDER
+
+@pytest.fixture
+def sample_file(sample_folder):
+    """Path of one sample file by name."""
+    return lambda name: os.path.join(sample_folder, name)
@@ -0,0 +1,134 @@
+import gc
+import io
+import os
+import gzip
+import tarfile
+import tempfile
+import zipfile
+import pytest
+from backend.data_handler import DataHandler
+from backend.utils.archive_reader import ArchiveReader
+
+SAMPLE_FILES = ["Error 1.csv", "Error 2.csv", "log0058_2024-10-06 22-41-51.csv"]
+
+def sample_bytes(sample_file):
+    contents = {}
+    for name in SAMPLE_FILES:
+        with open(sample_file(name), "rb") as f:
+            contents[name] = f.read()
+    return contents
+
+def write_tar(path, contents, mode):
+    with tarfile.open(path, mode) as archive:
+        for name, data in contents.items():
+            info = tarfile.TarInfo(f"unit/{name}")
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+        info = tarfile.TarInfo("unit/notes.txt")
+        info.size = 5
+        archive.addfile(info, io.BytesIO(b"notes"))
+
+def read_members(members):
+    return {os.path.basename(member.name): member.read() for member in members}
+
+@pytest.mark.parametrize("archive_name, mode", [
+    ("bundle.tar", "w"), ("bundle.tar.gz", "w:gz"), ("bundle.tgz", "w:gz"), ("bundle.tar.xz", "w:xz"),
+])
+def test_tar_members_match_the_original_files(tmp_path, sample_file, archive_name, mode):
+    contents = sample_bytes(sample_file)
+    path = str(tmp_path / archive_name)
+    write_tar(path, contents, mode)
+    members = ArchiveReader.expand([path])
+    assert read_members(members) == contents
+    assert members[0].name == os.path.join(path, "unit", SAMPLE_FILES[0])
+
+    # Rewinding rereads the member from the start
+    members[0].seek(0)
+    assert members[0].read() == contents[SAMPLE_FILES[0]]
+
+def test_tar_in_memory_buffer(tmp_path, sample_file):
+    contents = sample_bytes(sample_file)
+    write_tar(str(tmp_path / "bundle.tar"), contents, "w")
+    buffer = io.BytesIO((tmp_path / "bundle.tar").read_bytes())
+    buffer.name = "bundle.tar"
+    assert read_members(ArchiveReader.expand([buffer])) == contents
+
+def test_compressed_tar_members_spill_to_temporary_files(tmp_path, sample_file, monkeypatch):
+    spool_dir = tmp_path / "spool"
+    spool_dir.mkdir()
+    monkeypatch.setattr(tempfile, "tempdir", str(spool_dir))
+    monkeypatch.setattr(ArchiveReader, "SPOOL_MEMORY_BYTES", 0)
+    contents = sample_bytes(sample_file)
+    write_tar(str(tmp_path / "bundle.tar.gz"), contents, "w:gz")
+
+    members = ArchiveReader.expand([str(tmp_path / "bundle.tar.gz")])
+    assert len(os.listdir(spool_dir)) == len(contents)
+    assert read_members(members) == contents
+
+    # Each spool is removed with its member
+    del members
+    gc.collect()
+    assert os.listdir(spool_dir) == []
+
+def test_zip_and_gzip_members(tmp_path, sample_file):
+    contents = sample_bytes(sample_file)
+    with zipfile.ZipFile(tmp_path / "bundle.zip", "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in contents.items():
+            archive.writestr(name, data)
+        archive.writestr("__MACOSX/._Error 1.csv", b"junk")
+    with gzip.open(tmp_path / "Error 1.csv.gz", "wb") as f:
+        f.write(contents["Error 1.csv"])
+
+    assert read_members(ArchiveReader.expand([str(tmp_path / "bundle.zip")])) == contents
+    member, = ArchiveReader.expand([str(tmp_path / "Error 1.csv.gz")])
+    assert member.name.endswith("Error 1.csv")
+    assert member.read() == contents["Error 1.csv"]
+
+def test_unsupported_names():
+    assert ArchiveReader.is_supported("a.csv")
+    assert ArchiveReader.is_supported("a.csv.gz")
+    assert ArchiveReader.is_supported("a.tar.xz")
+    assert not ArchiveReader.is_supported("a.txt.gz")
+    assert not ArchiveReader.is_supported("a.txt")
+
+def test_archive_ingests_like_the_extracted_files(tmp_path, sample_file):
+    contents = sample_bytes(sample_file)
+    extracted = tmp_path / "extracted"
+    extracted.mkdir()
+    for name, data in contents.items():
+        (extracted / name).write_bytes(data)
+    archived = tmp_path / "archived"
+    archived.mkdir()
+    write_tar(str(archived / "bundle.tar.gz"), contents, "w:gz")
+
+    expected = DataHandler(str(extracted), show_progress=False)
+    actual = DataHandler(str(archived), show_progress=False)
+    assert len(actual.ecl) == len(expected.ecl) > 0
+    assert len(actual.dmp) == len(expected.dmp) > 0
+    assert actual.ecl_freq_summary.equals(expected.ecl_freq_summary)
+
+def test_zip_streams_are_closed_with_their_members(tmp_path, sample_file, monkeypatch):
+    opened = []
+
+    class RecordingZipFile(zipfile.ZipFile):
+        def __init__(self, file, *args, **kwargs):
+            super().__init__(file, *args, **kwargs)
+            opened.append(self.fp)
+
+    monkeypatch.setattr(zipfile, "ZipFile", RecordingZipFile)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in sample_bytes(sample_file).items():
+            archive.writestr(name, data)
+    buffer.name = "bundle.zip"
+    opened.clear()
+
+    members = ArchiveReader.expand([buffer])
+    read_members(members)
+    stream, = opened
+    del members[:-1]
+    gc.collect()
+    assert not stream.closed
+    del members
+    gc.collect()
+    assert stream.closed
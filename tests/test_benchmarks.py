@@ -0,0 +1,15 @@
+import json
+import os
+import subprocess
+import sys
+from conftest import REPO_ROOT
+
+def test_benchmarks_run_as_a_script(tmp_path):
+    output = tmp_path / "results.json"
+    result = subprocess.run(
+        [sys.executable, os.path.join(REPO_ROOT, "benchmarks", "run_benchmarks.py"), "--sizes", "1000",
+         "--repeat", "1", "--no-memory", "--work-dir", str(tmp_path / "work"), "--output", str(output)],
+        cwd=tmp_path, capture_output=True, text=True, timeout=300,
+    )
+    assert result.returncode == 0, result.stderr
+    assert json.loads(output.read_text())
@@ -0,0 +1,21 @@
+import os
+import subprocess
+import sys
+from conftest import REPO_ROOT
+
+def run_toolset(*args, cwd):
+    return subprocess.run(
+        [sys.executable, os.path.join(REPO_ROOT, "frontend", "cmd_toolset.py"), *args],
+        cwd=cwd, capture_output=True, text=True, timeout=120,
+    )
+
+def test_streaming_mode_runs_as_a_script(sample_folder, tmp_path):
+    result = run_toolset(sample_folder, "--stream", "--top", "3", cwd=tmp_path)
+    assert result.returncode == 0, result.stderr
+    assert "Combined Frequency Table" in result.stdout
+    assert "I_POWER_ON" in result.stdout
+
+def test_heavy_hitters_mode_runs_as_a_script(sample_folder, tmp_path):
+    result = run_toolset(sample_folder, "--heavy-hitters", "--top", "3", cwd=tmp_path)
+    assert result.returncode == 0, result.stderr
+    assert "Overall (top 3" in result.stdout
@@ -0,0 +1,33 @@
+import shutil
+import pandas as pd
+import pytest
+from backend.data_handler import DataHandler
+from frontend.tabs.render_compare import largest_differences
+
+@pytest.fixture
+def comparison(tmp_path, sample_folder, sample_file):
+    for name in ("report.csv", "log0058_2024-10-06 22-41-51.csv"):
+        shutil.copy(sample_file(name), tmp_path / name)
+    return DataHandler(sample_folder, show_progress=False).compare(DataHandler(str(tmp_path), show_progress=False))
+
+def test_counts_and_deltas(comparison):
+    ecl = comparison["ecl"]
+    assert ecl["Frequency A"].sum() == 147
+    assert ecl["Frequency B"].sum() == 27
+    assert (ecl["Delta"] == ecl["Frequency B"] - ecl["Frequency A"]).all()
+    assert ecl["Rate Delta"].abs().is_monotonic_decreasing
+    assert set(comparison) == {"ecl", "ecf", "dmp", "valves"}
+
+def test_largest_count_differences_are_ranked_before_the_cut():
+    table = pd.DataFrame({
+        "Description": ["a", "b", "c", "d"],
+        "Delta": [1, -2, 30, -40],
+        "Rate Delta": [9.0, -8.0, 2.0, -1.0],
+    })
+    assert largest_differences(table, 2, normalised=True)["Description"].tolist() == ["a", "b"]
+    assert largest_differences(table, 2, normalised=False)["Description"].tolist() == ["d", "c"]
+
+def test_largest_differences_of_the_sample_folders(comparison):
+    ecl = comparison["ecl"]
+    shown = largest_differences(ecl, 5, normalised=False)
+    assert shown["Delta"].abs().tolist() == sorted(ecl["Delta"].abs(), reverse=True)[:5]
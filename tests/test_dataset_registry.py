@@ -0,0 +1,57 @@
+import gc
+import numpy as np
+import pandas as pd
+import pytest
+from backend.dataset_registry import DatasetRegistry
+
+class FakeHandler:
+    def __init__(self):
+        self.ecl = pd.DataFrame({"Description": ["A", "B", "C"], "Speed": [1.0, 2.0, 3.0]})
+
+@pytest.fixture
+def registry():
+    return DatasetRegistry(memory_budget_bytes=0)
+
+def test_registry_leaves_pandas_options_alone():
+    before = pd.get_option("mode.copy_on_write")
+    DatasetRegistry()
+    assert pd.get_option("mode.copy_on_write") == before
+
+def test_loader_runs_once_per_key(registry):
+    calls = []
+    def loader():
+        calls.append(1)
+        return FakeHandler()
+    first = registry.acquire("k", loader)
+    second = registry.acquire("k", loader)
+    assert len(calls) == 1
+    assert registry.stats()["datasets"][0]["refs"] == 2
+    first.release()
+    second.release()
+    # Unreferenced and over the (zero) budget: evicted
+    assert registry.stats()["datasets"] == []
+
+def test_handles_are_isolated_without_copy_on_write(registry):
+    with pd.option_context("mode.copy_on_write", False):
+        first = registry.acquire("k", FakeHandler)
+        second = registry.acquire("k", FakeHandler)
+        ecl = first.ecl
+        ecl.loc[0, "Speed"] = 99.0
+        assert second.ecl.loc[0, "Speed"] == 1.0
+
+def test_handles_share_memory_under_copy_on_write(registry):
+    with pd.option_context("mode.copy_on_write", True):
+        first = registry.acquire("k", FakeHandler)
+        second = registry.acquire("k", FakeHandler)
+        assert np.shares_memory(first.ecl["Speed"].to_numpy(), second.ecl["Speed"].to_numpy())
+        ecl = first.ecl
+        ecl.loc[0, "Speed"] = 99.0
+        assert second.ecl.loc[0, "Speed"] == 1.0
+
+def test_handles_are_read_only_and_released_on_collection(registry):
+    handle = registry.acquire("k", FakeHandler)
+    with pytest.raises(AttributeError):
+        handle.ecl = pd.DataFrame()
+    del handle
+    gc.collect()
+    assert registry.stats()["datasets"] == []
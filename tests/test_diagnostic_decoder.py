@@ -0,0 +1,83 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from backend.data_processors.diagnostic_decoder import DiagnosticDecoder
+
+def diagnostic_log(byte_0, times=None, source=None):
+    """DMP rows with DIA_BYTE_0 set as given and the other diagnostic bytes clear."""
+    df = pd.DataFrame({column: 0 for column in DiagnosticDecoder.BYTE_COLUMNS}, index=range(len(byte_0)))
+    df["DIA_BYTE_0"] = byte_0
+    df["Time"] = np.arange(len(byte_0), dtype=float) if times is None else times
+    if source is not None:
+        df["Source File"] = source
+    return df
+
+def test_default_decoder_names_every_bit():
+    decoder = DiagnosticDecoder()
+    assert len(decoder.flag_names) == 8 * len(DiagnosticDecoder.BYTE_COLUMNS)
+    flags = decoder.decode(diagnostic_log([0b101, 0x80]))
+    assert flags.loc[0, ["DIA0_B0", "DIA0_B1", "DIA0_B2"]].tolist() == [True, False, True]
+    assert flags.loc[1, "DIA0_B7"]
+    assert flags.iloc[:, 8:].to_numpy().sum() == 0
+
+def test_bit_map_picks_and_names_bits(tmp_path):
+    path = tmp_path / "bits.json"
+    path.write_text(json.dumps({"SENSOR_1_FAULT": ["DIA_BYTE_0", 0], "SENSOR_2_FAULT": [0, 3]}))
+    decoder = DiagnosticDecoder.from_file(str(path))
+    flags = decoder.decode(diagnostic_log([0b1000, 0b1001, 0]))
+    assert flags.to_dict("list") == {"SENSOR_1_FAULT": [False, True, False], "SENSOR_2_FAULT": [True, True, False]}
+    assert DiagnosticDecoder.flag_counts(flags).to_dict() == {"SENSOR_1_FAULT": 1, "SENSOR_2_FAULT": 2}
+
+@pytest.mark.parametrize("bit_map", [{"X": ("DIA_BYTE_9", 0)}, {"X": (0, 8)}, {"X": (5, 0)}])
+def test_bit_map_out_of_range(bit_map):
+    with pytest.raises(ValueError):
+        DiagnosticDecoder(bit_map)
+
+def test_active_only_and_missing_columns():
+    flags = DiagnosticDecoder().decode(diagnostic_log([1, 3]), active_only=True)
+    assert list(flags.columns) == ["DIA0_B0", "DIA0_B1"]
+    assert DiagnosticDecoder().decode(diagnostic_log([1]).drop(columns="DIA_BYTE_4")).empty
+
+def test_intervals_split_at_file_boundaries():
+    df = pd.concat([diagnostic_log([0, 1, 1], source="a.csv"), diagnostic_log([1, 1, 0], source="b.csv")],
+                   ignore_index=True)
+    decoder = DiagnosticDecoder({"FAULT": (0, 0)})
+    intervals = decoder.intervals(df, "Source File")
+    assert intervals[["Source File", "Start Row", "End Row", "Duration (s)"]].values.tolist() == [
+        ["a.csv", 1, 2, 2.0], ["b.csv", 3, 4, 2.0],
+    ]
+
+def test_state_at():
+    df = diagnostic_log([0, 1, 0], times=[0.0, 1.0, 2.0])
+    flags = DiagnosticDecoder({"FAULT": (0, 0)}).decode(df)
+    assert DiagnosticDecoder.state_at(df, flags, 1.5)["FAULT"]
+    assert not DiagnosticDecoder.state_at(df, flags, 2.0)["FAULT"]
+    assert DiagnosticDecoder.state_at(df, flags, -1.0).empty
+
+def test_state_at_needs_the_file_when_several_are_loaded():
+    df = pd.concat([diagnostic_log([0, 0], source="a.csv"), diagnostic_log([1, 1], source="b.csv")],
+                   ignore_index=True)
+    flags = DiagnosticDecoder({"FAULT": (0, 0)}).decode(df)
+    with pytest.raises(ValueError, match="source_file"):
+        DiagnosticDecoder.state_at(df, flags, 1.0, source_column="Source File")
+    assert DiagnosticDecoder.state_at(df, flags, 1.0, "Source File", "b.csv")["FAULT"]
+    assert not DiagnosticDecoder.state_at(df, flags, 1.0, "Source File", "a.csv")["FAULT"]
+    single = df[df["Source File"] == "b.csv"]
+    assert DiagnosticDecoder.state_at(single, flags.loc[single.index], 0.0, source_column="Source File")["FAULT"]
+
+def test_state_at_rejects_a_file_without_its_column():
+    df = diagnostic_log([0, 1])
+    flags = DiagnosticDecoder({"FAULT": (0, 0)}).decode(df)
+    with pytest.raises(ValueError, match="source column"):
+        DiagnosticDecoder.state_at(df, flags, 1.0, source_file="a.csv")
+    with pytest.raises(ValueError, match="source column"):
+        DiagnosticDecoder.state_at(df, flags, 1.0, "Source File", "a.csv")
+
+def test_state_at_rejects_restarted_log_time():
+    df = diagnostic_log([1, 1, 0, 0], times=[0.0, 1.0, 0.0, 1.0])
+    flags = DiagnosticDecoder({"FAULT": (0, 0)}).decode(df)
+    with pytest.raises(ValueError, match="backwards"):
+        DiagnosticDecoder.state_at(df, flags, 0.5)
+    repeated = diagnostic_log([1, 0], times=[1.0, 1.0])
+    assert not DiagnosticDecoder.state_at(repeated, DiagnosticDecoder({"FAULT": (0, 0)}).decode(repeated), 1.0)["FAULT"]
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backend.data_processors.dmp_processor import DMPProcessor
+from backend.utils.dmp_filter import DMPFilter
+from backend.utils.exceptions import DMPFilterError
+
+@pytest.fixture
+def dmp(sample_file):
+    return DMPProcessor.read_dmp(sample_file("log0058_2024-10-06 22-41-51.csv"))
+
+@pytest.mark.parametrize("expression, expected", [
+    ("REF_SPEED > 200", lambda df: df["REF_SPEED"] > 200),
+    ("REF_SPEED > 200 and FILL_2 == 1", lambda df: (df["REF_SPEED"] > 200) & (df["FILL_2"] == 1)),
+    ("abs(REF_SPEED - SPEED_1) >= 3 or not DEV_ON",
+     lambda df: ((df["REF_SPEED"] - df["SPEED_1"]).abs() >= 3) | (df["DEV_ON"] == 0)),
+    ("100 < REF_SPEED <= 250", lambda df: (df["REF_SPEED"] > 100) & (df["REF_SPEED"] <= 250)),
+    ("ACC_3 * 2 % 7 != -(1) and ACC_1 / 2 < 5", lambda df: (df["ACC_3"] * 2 % 7 != -1) & (df["ACC_1"] / 2 < 5)),
+    ("FILL_1", lambda df: df["FILL_1"] != 0),
+])
+def test_matches_pandas(dmp, expression, expected):
+    dmp_filter = DMPFilter(dmp)
+    expected_mask = expected(dmp).to_numpy()
+    assert np.array_equal(dmp_filter.mask(expression), expected_mask)
+    assert dmp_filter.count(expression) == expected_mask.sum()
+    pd.testing.assert_frame_equal(dmp_filter.apply(expression), dmp[expected_mask])
+
+@pytest.mark.parametrize("expression", [
+    "__import__('os').system('true')",
+    "open('/etc/passwd')",
+    "REF_SPEED.__class__",
+    "REF_SPEED[0] > 1",
+    "[x for x in REF_SPEED]",
+    "lambda: 1",
+    "REF_SPEED if DEV_ON else 0",
+    "REF_SPEED ** 2 > 1",
+    "REF_SPEED in (1, 2)",
+    "REF_SPEED is 1",
+    "'a' == 'a'",
+    "True",
+    "abs(REF_SPEED, 1)",
+    "abs(x=REF_SPEED)",
+    "(x := 1)",
+    "REF_SPEED > ",
+    "NO_SUCH_COLUMN > 1",
+    "",
+    "REF_SPEED > 1 and " * 100 + "1",
+])
+def test_rejects_unsafe_or_invalid_expressions(dmp, expression):
+    with pytest.raises(DMPFilterError):
+        DMPFilter(dmp).compile(expression)
+
+def test_errors_are_value_errors(dmp):
+    with pytest.raises(ValueError):
+        DMPFilter(dmp).count("os.system")
+
+def test_masks_are_cached_per_normalised_expression(dmp):
+    dmp_filter = DMPFilter(dmp)
+    compiled = dmp_filter.compile("REF_SPEED>200")
+    assert compiled.columns == ["REF_SPEED"]
+    assert dmp_filter.mask("REF_SPEED>200") is dmp_filter.mask("( REF_SPEED  >  200 )")
+    assert dmp_filter.mask(compiled) is dmp_filter.mask("REF_SPEED > 200")
+
+def test_apply_to_another_frame_with_the_same_index(dmp):
+    dmp_filter = DMPFilter(dmp)
+    subset = dmp[["Time", "REF_SPEED"]]
+    rows = dmp_filter.apply("REF_SPEED > 200", frame=subset)
+    assert list(rows.columns) == ["Time", "REF_SPEED"]
+    assert rows.index.equals(dmp.index[dmp["REF_SPEED"] > 200])
+
+def test_columns_are_numeric_only():
+    dmp_filter = DMPFilter(pd.DataFrame({"A": [1, 2], "B": ["x", "y"]}))
+    assert dmp_filter.columns == ["A"]
+    with pytest.raises(DMPFilterError, match="Unknown DMP column"):
+        dmp_filter.compile("B == 1")
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backend.data_processors.dmp_stitcher import DMPStitcher
+
+SOURCE = "Source File"
+
+def dmp_log(name, start, seconds, period=0.1, tick_column="MOD_TICK"):
+    """One log sampled every period seconds from start, with Time restarting at 0."""
+    rows = int(round(seconds / period))
+    tick = DMPStitcher.TICK_COLUMNS[tick_column]
+    return pd.DataFrame({
+        "Time": np.arange(rows) * period,
+        tick_column: np.round((start + np.arange(rows) * period) / tick).astype(np.int64),
+        SOURCE: name,
+    })
+
+def logs(*frames):
+    return pd.concat(frames, ignore_index=True)
+
+def transitions_of(df):
+    return DMPStitcher.stitch(df, SOURCE)[2][DMPStitcher.TRANSITION_COLUMNS].values.tolist()
+
+def test_disjoint_logs_are_appended_in_tick_order():
+    df = logs(dmp_log("b.csv", 10.0, 10.0), dmp_log("a.csv", 0.0, 10.0))
+    timeline, segments, transitions = DMPStitcher.stitch(df, SOURCE)
+    assert timeline.index.tolist() == list(range(100, 200)) + list(range(100))
+    assert timeline[SOURCE].iloc[[0, -1]].tolist() == ["a.csv", "b.csv"]
+    assert np.allclose(timeline[DMPStitcher.TIMELINE_COLUMN], np.arange(200) * 0.1)
+    assert len(segments) == 1
+    assert transitions.values.tolist() == [["a.csv", "b.csv", 0.1, "contiguous"]]
+
+def test_overlapping_logs_are_merged_sample_by_sample():
+    df = logs(dmp_log("a.csv", 0.0, 10.0), dmp_log("b.csv", 5.05, 10.0))
+    timeline, segments, _ = DMPStitcher.stitch(df, SOURCE)
+    assert (np.diff(timeline[DMPStitcher.TIMELINE_COLUMN]) >= 0).all()
+    assert set(timeline[SOURCE].iloc[50:100]) == {"a.csv", "b.csv"}
+    assert segments["Rows"].tolist() == [200]
+    assert transitions_of(df) == [["a.csv", "b.csv", -4.85, "overlap"]]
+
+def test_gaps_split_segments():
+    df = logs(dmp_log("a.csv", 0.0, 10.0), dmp_log("b.csv", 30.0, 10.0))
+    _, segments, _ = DMPStitcher.stitch(df, SOURCE)
+    assert segments[["Segment", "Rows", "Source Files", "Gap Before (s)"]].values.tolist() == [
+        [0, 100, "a.csv", 0.0], [1, 100, "b.csv", 20.1],
+    ]
+    assert segments["Start (s)"].tolist() == pytest.approx([0.0, 30.0])
+    assert segments["Duration (s)"].tolist() == pytest.approx([10.0, 10.0])
+    assert transitions_of(df) == [["a.csv", "b.csv", 20.1, "gap"]]
+
+def test_nested_logs_overlap_the_log_covering_them():
+    df = logs(dmp_log("a.csv", 0.0, 100.0), dmp_log("b.csv", 20.0, 5.0), dmp_log("c.csv", 60.0, 5.0))
+    _, segments, _ = DMPStitcher.stitch(df, SOURCE)
+    assert len(segments) == 1
+    assert transitions_of(df) == [["a.csv", "b.csv", -79.9, "overlap"], ["a.csv", "c.csv", -39.9, "overlap"]]
+
+def test_gap_after_nested_logs_is_measured_from_the_latest_end():
+    df = logs(dmp_log("a.csv", 0.0, 100.0), dmp_log("b.csv", 20.0, 5.0), dmp_log("c.csv", 130.0, 5.0))
+    _, segments, _ = DMPStitcher.stitch(df, SOURCE)
+    assert segments["Gap Before (s)"].tolist() == [0.0, 30.1]
+    assert transitions_of(df)[-1] == ["a.csv", "c.csv", 30.1, "gap"]
+
+def test_montime_only_logs():
+    df = logs(dmp_log("a.csv", 0.0, 1.0, tick_column="MONTIME"), dmp_log("b.csv", 1.0, 1.0, tick_column="MONTIME"))
+    assert np.allclose(DMPStitcher.tick_seconds(df), np.arange(20) * 0.1)
+    timeline, segments, _ = DMPStitcher.stitch(df, SOURCE)
+    assert timeline[DMPStitcher.TIMELINE_COLUMN].iloc[-1] == pytest.approx(1.9)
+    assert len(segments) == 1
+
+def test_missing_tick_column_is_not_stitched():
+    df = dmp_log("a.csv", 0.0, 1.0).drop(columns="MOD_TICK")
+    timeline, segments, transitions = DMPStitcher.stitch(df, SOURCE)
+    assert timeline.empty and segments.empty and transitions.empty
+    assert DMPStitcher.tick_seconds(df) is None
+
+def test_time_range():
+    df = logs(dmp_log("b.csv", 10.0, 10.0), dmp_log("a.csv", 0.0, 10.0))
+    timeline = DMPStitcher.stitch(df, SOURCE)[0]
+    assert DMPStitcher.time_range(timeline, 9.85, 10.25).tolist() == [199, 0, 1, 2]
+    assert DMPStitcher.time_range(timeline, end=0.0).tolist() == [100]
+    assert len(DMPStitcher.time_range(timeline)) == 200
+    assert DMPStitcher.time_range(timeline, 50.0).empty
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+from backend.data_processors.ecl_processor import ECLProcessor
+from backend.data_processors.ecl_timestamps import ECLTimestamps
+
+def listing(rows):
+    """ECL rows from (code, ticks, date, time) tuples."""
+    return pd.DataFrame(rows, columns=["Code(hex)", "Ticks(hex)", "Date", "Time"])
+
+def test_parse_hex():
+    fixed = pd.Series(["0x00000AAC", "0x000057e3", "0x0000ZZZZ", "1234567890"])
+    assert ECLTimestamps.parse_hex(fixed).tolist() == [0xAAC, 0x57E3, -1, -1]
+    mixed = pd.Series(["0xA000", "0x37", "junk", None])
+    assert ECLTimestamps.parse_hex(mixed).tolist() == [0xA000, 0x37, -1, -1]
+    assert ECLTimestamps.parse_hex(pd.Series([], dtype=object)).tolist() == []
+
+def test_parse_wall_clock():
+    parsed = ECLTimestamps.parse_wall_clock(
+        pd.Series(["31/7/24", "1/8/24", "31/7/24", "32/7/24", None]),
+        pd.Series(["16:6:55", "0:0:0", "24:00:00", "10:00:00", "10:00:00"]),
+    )
+    assert parsed[:2].tolist() == [pd.Timestamp("2024-07-31 16:06:55"), pd.Timestamp("2024-08-01 00:00:00")]
+    assert np.isnat(parsed[2:]).all()
+
+def test_ticks_supply_the_milliseconds_of_each_segment():
+    # Powered on at 10:00:00.300 (tick 0) and at 12:00:00.750; 2 ms per tick.
+    # Each segment has an event on a whole second, which pins down its phase
+    df = listing([
+        ("0xA000", "0x00000000", "31/7/24", "10:0:0"),
+        ("0x0037", "0x000001F4", "31/7/24", "10:0:1"),    # +1000 ms
+        ("0x0038", "0x00000640", "31/7/24", "10:0:3"),    # +3200 ms
+        ("0x0039", "0x00000D16", "31/7/24", "10:0:7"),    # +6700 ms
+        ("0xA000", "0x00000000", "31/7/24", "12:0:0"),
+        ("0x0037", "0x00000080", "31/7/24", "12:0:1"),    # +256 ms
+        ("0x0038", "0x00000271", "31/7/24", "12:0:2"),    # +1250 ms
+    ])
+    timestamps = ECLTimestamps.reconstruct(df)
+    assert timestamps.dt.strftime("%H:%M:%S.%f").str[:-3].tolist() == [
+        "10:00:00.300", "10:00:01.300", "10:00:03.500", "10:00:07.000",
+        "12:00:00.750", "12:00:01.006", "12:00:02.000",
+    ]
+    assert (timestamps.dt.floor("s") == pd.Series(ECLTimestamps.parse_wall_clock(df["Date"], df["Time"]))).all()
+
+def test_unparseable_rows():
+    df = listing([
+        ("0xA000", "0x00000000", "31/7/24", "10:0:0"),
+        ("0x0037", "junk", "31/7/24", "10:0:1"),
+        ("0x0038", "0x000001F4", "bad", "10:0:1"),
+    ])
+    timestamps = ECLTimestamps.reconstruct(df)
+    assert timestamps.iloc[1] == pd.Timestamp("2024-07-31 10:00:01")
+    assert pd.isna(timestamps.iloc[2])
+
+def test_add_needs_the_listing_columns():
+    df = listing([("0xA000", "0x00000000", "31/7/24", "10:0:0")])
+    assert ECLTimestamps.COLUMN in ECLTimestamps.add(df).columns
+    without_ticks = df.drop(columns="Ticks(hex)")
+    assert ECLTimestamps.add(without_ticks) is without_ticks
+
+def test_sample_listing_stays_within_its_seconds(sample_file):
+    df_ecl, _ = ECLProcessor.read_ecl_ecf(sample_file("Error 1.csv"))
+    timestamps = ECLTimestamps.reconstruct(df_ecl)
+    wall = pd.Series(ECLTimestamps.parse_wall_clock(df_ecl["Date"], df_ecl["Time"]), index=df_ecl.index)
+    assert timestamps.notna().all()
+    assert (timestamps.dt.floor("s") == wall).all()
+    assert (timestamps != wall).any()
@@ -0,0 +1,100 @@
+import math
+from collections import Counter
+import numpy as np
+import pytest
+from backend.utils.heavy_hitters import CountMinSketch, HeavyHitters, SpaceSaving
+
+@pytest.fixture
+def stream():
+    """Zipf-distributed error descriptions."""
+    rng = np.random.default_rng(11)
+    return [f"ERROR_{value:04d}" for value in rng.zipf(1.3, 50000) % 5000]
+
+def test_count_min_rows_do_not_share_collisions():
+    sketch = CountMinSketch(width=64, depth=4)
+    sketch.update({"HEAVY_00": 1000})
+    # Items of the same length that collide with HEAVY_00 in one row must
+    # not collide with it in every row
+    overcounted = [item for item in (f"ITEM_{i:03d}" for i in range(1000)) if sketch.estimate(item)]
+    assert not overcounted
+
+def test_count_min_error_bound(stream):
+    counts = Counter(stream)
+    sketch = CountMinSketch(width=512, depth=4)
+    sketch.update(counts)
+    assert sketch.total == len(stream)
+    errors = np.array([sketch.estimate(item) - count for item, count in counts.items()])
+    assert (errors >= 0).all()
+    assert (errors > sketch.epsilon * sketch.total).mean() <= sketch.delta
+    assert sketch.epsilon == math.e / 512
+
+def test_count_min_merge_and_round_trip(stream):
+    whole = CountMinSketch(256, 3)
+    whole.update(Counter(stream))
+    halves = [CountMinSketch(256, 3), CountMinSketch(256, 3)]
+    halves[0].update(Counter(stream[:20000]))
+    halves[1].update(Counter(stream[20000:]))
+    merged = CountMinSketch.from_dict(halves[0].merge(halves[1]).to_dict())
+    assert merged.to_dict() == whole.to_dict()
+    with pytest.raises(ValueError):
+        whole.merge(CountMinSketch(128, 3))
+
+def test_space_saving_bounds(stream):
+    counts = Counter(stream)
+    summary = SpaceSaving(capacity=200)
+    for start in range(0, len(stream), 1000):
+        summary.update(Counter(stream[start:start + 1000]))
+    tracked = {item: (count, error) for item, count, error in summary.items()}
+    assert len(tracked) == 200
+    bound = summary.total / summary.capacity
+    for item, true_count in counts.items():
+        if true_count > bound:
+            assert item in tracked
+        if item in tracked:
+            count, error = tracked[item]
+            assert count - error <= true_count <= count
+            assert error <= bound
+
+def test_space_saving_merge_keeps_the_bounds(stream):
+    counts = Counter(stream)
+    parts = [SpaceSaving(100), SpaceSaving(100)]
+    parts[0].update(Counter(stream[::2]))
+    parts[1].update(Counter(stream[1::2]))
+    merged = SpaceSaving.from_dict(parts[0].merge(parts[1]).to_dict())
+    assert merged.total == len(stream)
+    for item, count, error in merged.items():
+        assert count - error <= counts[item] <= count
+        assert error <= merged.total / merged.capacity
+
+def test_heavy_hitters_top(stream):
+    counts = Counter(stream)
+    hitters = HeavyHitters(capacity=300, width=1024, tracked=["ERROR_0042"]).update(iter(stream))
+    top = hitters.top(10)
+    true_top = {item for item, _ in counts.most_common(10)}
+    assert [row["value"] for row in top if row["guaranteed"]]
+    for row in top:
+        assert row["lower"] <= counts[row["value"]] <= row["upper"]
+        if row["guaranteed"]:
+            assert row["value"] in true_top
+    assert hitters.estimate("ERROR_0042") == counts["ERROR_0042"]
+    assert hitters.estimate("ERROR_0001") >= counts["ERROR_0001"]
+    assert hitters.total == len(stream)
+
+def test_heavy_hitters_merge(stream):
+    counts = Counter(stream)
+    units = [HeavyHitters(capacity=300, tracked=["ERROR_0042"]).update(stream[start::3]) for start in range(3)]
+    overall = HeavyHitters(capacity=300, tracked=["ERROR_0042"])
+    for unit in units:
+        overall.merge(HeavyHitters.from_dict(unit.to_dict()))
+    assert overall.total == len(stream)
+    assert overall.estimate("ERROR_0042") == counts["ERROR_0042"]
+    top = overall.top(5)
+    assert [row["value"] for row in top] == [item for item, _ in counts.most_common(5)]
+
+def test_heavy_hitters_merge_needs_the_same_tracked_values():
+    overall = HeavyHitters(tracked=["ERROR_0042"]).update(["ERROR_0042", "ERROR_0001"])
+    with pytest.raises(ValueError, match="tracked"):
+        overall.merge(HeavyHitters(tracked=["ERROR_0001"]).update(["ERROR_0001"]))
+    with pytest.raises(ValueError, match="tracked"):
+        overall.merge(HeavyHitters().update(["ERROR_0042"]))
+    assert overall.total == 2 and overall.estimate("ERROR_0042") == 1
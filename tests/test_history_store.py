@@ -0,0 +1,57 @@
+import shutil
+import sqlite3
+import pytest
+from backend.data_handler import DataHandler
+from backend.history_store import HistoryStore
+
+@pytest.fixture
+def exports(tmp_path, sample_file):
+    """Two exports of one unit that reuse the file names report.csv and log.csv."""
+    folders = {}
+    for name, (report, log) in {
+        "first": ("report.csv", "log0058_2024-10-06 22-41-51.csv"),
+        "second": ("Error 1.csv", "log0059_2024-10-06 22-48-25.csv"),
+    }.items():
+        folder = tmp_path / name
+        folder.mkdir()
+        shutil.copy(sample_file(report), folder / "report.csv")
+        shutil.copy(sample_file(log), folder / "log.csv")
+        folders[name] = str(folder)
+    return folders
+
+def count_rows(db_path, table):
+    with sqlite3.connect(db_path) as connection:
+        return connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+def test_files_with_the_same_name_keep_their_own_history(tmp_path, exports):
+    db_path = str(tmp_path / "history.db")
+    first, second = DataHandler(exports["first"], show_progress=False), DataHandler(exports["second"], show_progress=False)
+    with HistoryStore(db_path) as history:
+        first.save_to_history(history, unit="unit_42")
+        second.save_to_history(history, unit="unit_42")
+    assert count_rows(db_path, "ecf_counts") == len(first.ecf) + len(second.ecf)
+    rollups = len(HistoryStore.dmp_rollup_rows(first.dmp)) + len(HistoryStore.dmp_rollup_rows(second.dmp))
+    assert count_rows(db_path, "dmp_rollups") == rollups
+
+def test_loading_the_same_files_again_replaces_their_rows(tmp_path, exports):
+    db_path = str(tmp_path / "history.db")
+    data_handler = DataHandler(exports["first"], show_progress=False)
+    with HistoryStore(db_path) as history:
+        first = data_handler.save_to_history(history, unit="unit_42")
+        again = data_handler.save_to_history(history, unit="unit_42")
+    assert again["ecl_events"] == 0
+    assert count_rows(db_path, "ecl_events") == first["ecl_events"] == len(data_handler.ecl)
+    assert count_rows(db_path, "ecf_counts") == len(data_handler.ecf)
+    assert count_rows(db_path, "dmp_rollups") == len(HistoryStore.dmp_rollup_rows(data_handler.dmp))
+    with sqlite3.connect(db_path) as connection:
+        ingestion_ids = {row[0] for row in connection.execute("SELECT DISTINCT ingestion_id FROM ecf_counts")}
+    assert ingestion_ids == {again["ingestion_id"]}
+
+def test_query_events(tmp_path, sample_folder):
+    with HistoryStore(str(tmp_path / "history.db")) as history:
+        DataHandler(sample_folder, show_progress=False).save_to_history(history, unit="unit_42")
+        events = history.query_events(unit="unit_42", description="I_POWER_ON")
+        assert len(events) == 17
+        assert events["event_time"].is_monotonic_increasing
+        frequency = history.event_frequency(unit="unit_42")
+        assert frequency["Frequency"].sum() == len(history.query_events(unit="unit_42"))
@@ -0,0 +1,54 @@
+import os
+import shutil
+import pytest
+from backend.data_handler import DataHandler
+from backend.data_processors.dmp_processor import DMPProcessor
+from backend.data_processors.ecl_processor import ECLProcessor
+from backend.utils.exceptions import FileProcessingError
+
+DMP_LOG = "log0058_2024-10-06 22-41-51.csv"
+
+@pytest.fixture
+def broken_folder(tmp_path, sample_file):
+    # An ECL report whose listing has no rows before the ECF section
+    with open(sample_file("Error 1.csv"), encoding="utf-8") as f:
+        lines = f.readlines()
+    ecf_start = next(i for i, line in enumerate(lines) if "ERROR CODE FREQUENCY" in line)
+    (tmp_path / "Error 9.csv").write_text("".join(lines[:9] + lines[ecf_start:ecf_start + 8]), encoding="utf-8")
+
+    # A DMP log with an unterminated quote after the rows the classifier reads
+    with open(sample_file(DMP_LOG), encoding="utf-8") as f:
+        lines = f.readlines()
+    (tmp_path / "log_bad.csv").write_text("".join(lines[:80] + ['1,"2,3\n'] + lines[80:130]), encoding="utf-8")
+
+    shutil.copy(sample_file("Error 2.csv"), tmp_path)
+    return tmp_path
+
+@pytest.fixture
+def broken_ecf(tmp_path, sample_file):
+    # An ECL report whose ECF section lost its ';' separators
+    with open(sample_file("Error 1.csv"), encoding="utf-8") as f:
+        lines = f.readlines()
+    ecf_start = next(i for i, line in enumerate(lines) if "ERROR CODE FREQUENCY" in line)
+    broken = [line.replace(";", " ") for line in lines[ecf_start + 1:]]
+    (tmp_path / "Error 8.csv").write_text("".join(lines[:ecf_start + 1] + broken), encoding="utf-8")
+    return tmp_path
+
+def test_processors_raise_on_unparseable_files(broken_folder):
+    with pytest.raises(FileProcessingError):
+        ECLProcessor.read_ecl_ecf(str(broken_folder / "Error 9.csv"))
+    with pytest.raises(FileProcessingError):
+        DMPProcessor.read_dmp(str(broken_folder / "log_bad.csv"))
+
+def test_malformed_ecf_section_fails_the_file(broken_ecf):
+    with pytest.raises(FileProcessingError, match="Insufficient columns"):
+        ECLProcessor.read_ecl_ecf(str(broken_ecf / "Error 8.csv"))
+    data_handler = DataHandler(str(broken_ecf), show_progress=False)
+    assert data_handler.stats.file_table()["status"].tolist() == ["error"]
+
+def test_failed_files_are_recorded(broken_folder):
+    data_handler = DataHandler(str(broken_folder), show_progress=False)
+    statuses = data_handler.stats.file_table().set_index("file")["status"].rename(os.path.basename)
+    assert statuses.to_dict() == {"Error 2.csv": "ok", "Error 9.csv": "error", "log_bad.csv": "error"}
+    # The good file is still ingested
+    assert len(data_handler.ecl) > 0
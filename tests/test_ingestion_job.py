@@ -0,0 +1,61 @@
+import shutil
+import pytest
+from backend.dataset_registry import DatasetRegistry
+from backend.ingestion_job import IngestionJob
+
+FILES = ["Error 1.csv", "report.csv", "log0058_2024-10-06 22-41-51.csv",
+         "log0059_2024-10-06 22-48-25.csv", "log0060_2024-10-07 01-10-17.csv"]
+
+@pytest.fixture
+def folder(tmp_path, sample_file):
+    # No overlapping listings, so the per-file partial summaries add up to the result
+    for name in FILES:
+        shutil.copy(sample_file(name), tmp_path / name)
+    return str(tmp_path)
+
+def test_progress_and_partial_summary(folder):
+    job = IngestionJob(folder)
+    empty = job.partial
+    assert job.start().wait(60)
+    assert job.state == IngestionJob.DONE and job.error is None
+    progress = job.progress()
+    assert (progress["done"], progress["total"], progress["failed"]) == (len(FILES), len(FILES), 0)
+    assert progress["fraction"] == 1.0 and progress["remaining"] is None
+    assert progress["rows"] == sum(len(frame) for frame in (job.result.ecl, job.result.ecf, job.result.dmp))
+    assert progress["bytes"] > 0 and progress["elapsed"] > 0
+    # Every file is merged into a new snapshot; the old one is never updated in place
+    assert job.partial is not empty and empty.ecl_frequency().empty
+    assert job.partial.ecl_frequency()["Frequency"].sum() == len(job.result.ecl)
+    assert job.partial.dmp_frequency().to_dict() == job.result.dmp_freq_summary.to_dict()
+
+def test_cancel_leaves_no_result_or_registry_entry(folder):
+    registry = DatasetRegistry()
+    job = IngestionJob(folder, registry=registry, key="unit")
+    job.cancel()
+    assert job.start().wait(60)
+    assert job.state == IngestionJob.CANCELLED
+    assert job.result is None and job.error is None and not job.cancelling
+    assert job.progress()["done"] < len(FILES)
+    assert registry.stats()["datasets"] == []
+
+def test_registry_shares_the_loaded_dataset(folder):
+    registry = DatasetRegistry()
+    job = IngestionJob(folder, registry=registry, key="unit").start()
+    assert job.wait(60) and job.state == IngestionJob.DONE
+    assert [(entry["key"], entry["refs"]) for entry in registry.stats()["datasets"]] == [("unit", 1)]
+    again = IngestionJob(folder, registry=registry, key="unit").start()
+    assert again.wait(60) and again.progress()["done"] == 0
+    assert len(again.result.ecl) == len(job.result.ecl)
+
+def test_missing_folder_fails(tmp_path):
+    job = IngestionJob(str(tmp_path / "missing")).start()
+    assert job.wait(60)
+    assert job.state == IngestionJob.FAILED
+    assert isinstance(job.error, FileNotFoundError) and job.result is None
+    assert job.progress()["fraction"] == 0.0
+
+def test_arguments_are_checked(folder):
+    with pytest.raises(ValueError):
+        IngestionJob()
+    with pytest.raises(ValueError, match="key"):
+        IngestionJob(folder, registry=DatasetRegistry())
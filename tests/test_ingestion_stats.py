@@ -0,0 +1,38 @@
+import time
+import threading
+from backend.data_handler import DataHandler
+from backend.utils.ingestion_stats import IngestionStats
+
+def test_parallel_spans_share_is_based_on_wall_clock():
+    stats = IngestionStats()
+    stats.start()
+
+    def work():
+        with stats.span("parsing"):
+            time.sleep(0.2)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats.stop()
+
+    row = stats.span_table().set_index("Stage").loc["parsing"]
+    assert row["Calls"] == 4
+    assert row["Seconds"] >= 0.8
+    assert 0.2 <= row["Wall (s)"] < 0.5
+    assert row["Share (%)"] <= 100
+
+def test_spans_after_the_run_have_no_share():
+    stats = IngestionStats()
+    stats.start()
+    stats.stop()
+    with stats.span("compare"):
+        pass
+    assert stats.span_table()["Share (%)"].isna().all()
+
+def test_profile_covers_file_parsing(sample_folder):
+    data_handler = DataHandler(sample_folder, show_progress=False, profile=True)
+    assert "read_ecl_ecf" in data_handler.stats.profile_report
+    assert "read_dmp" in data_handler.stats.profile_report
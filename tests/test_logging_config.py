@@ -0,0 +1,46 @@
+import ast
+import glob
+import logging
+import os
+from conftest import REPO_ROOT
+from backend.utils.logging_config import RateLimitFilter
+
+class Collector(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+def test_rate_limit_shares_one_budget_per_template():
+    logger = logging.getLogger("test_rate_limit")
+    logger.propagate = False
+    collector = Collector()
+    collector.addFilter(RateLimitFilter(burst=3, interval=3600))
+    logger.addHandler(collector)
+    try:
+        for index in range(10):
+            logger.warning("Error reading %s: %s", f"file_{index}.csv", "bad header")
+        logger.warning("Another message")
+    finally:
+        logger.removeHandler(collector)
+    assert [record.getMessage() for record in collector.records] == [
+        "Error reading file_0.csv: bad header",
+        "Error reading file_1.csv: bad header",
+        "Error reading file_2.csv: bad header",
+        "Another message",
+    ]
+
+def test_backend_logs_with_arguments_not_f_strings():
+    # f-string messages get one rate-limit budget per interpolated text
+    offenders = []
+    for path in glob.glob(os.path.join(REPO_ROOT, "backend", "**", "*.py"), recursive=True):
+        with open(path, encoding="utf-8") as f:
+            tree = ast.parse(f.read(), path)
+        for node in ast.walk(tree):
+            if (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                    and isinstance(node.func.value, ast.Name) and node.func.value.id == "logging"
+                    and node.args and isinstance(node.args[0], ast.JoinedStr)):
+                offenders.append(f"{os.path.relpath(path, REPO_ROOT)}:{node.lineno}")
+    assert not offenders
@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+from backend.data_handler import DataHandler
+from backend.data_processors.dmp_processor import DMPProcessor
+from backend.data_processors.ecl_processor import ECLProcessor
+from backend.utils.overlap_filter import OverlapFilter
+
+@pytest.fixture
+def reports(sample_file):
+    return {name: ECLProcessor.read_ecl_ecf(sample_file(name)) for name in ("Error 1.csv", "Error 2.csv", "report.csv")}
+
+def test_second_export_of_the_same_events_is_dropped(reports):
+    overlap_filter = OverlapFilter()
+    first = overlap_filter.drop_ecl(reports["Error 1.csv"][0])
+    second = overlap_filter.drop_ecl(reports["Error 2.csv"][0])
+    other = overlap_filter.drop_ecl(reports["report.csv"][0])
+    assert len(first) == len(reports["Error 1.csv"][0])
+    assert second.empty
+    assert len(other) == len(reports["report.csv"][0])
+    assert overlap_filter.dropped_rows == {"ecl": len(reports["Error 2.csv"][0]), "dmp": 0}
+
+def test_repeated_dmp_samples_are_dropped(sample_file):
+    dmp = DMPProcessor.read_dmp(sample_file("log0058_2024-10-06 22-41-51.csv"))
+    overlap_filter = OverlapFilter()
+    assert len(overlap_filter.drop_dmp(dmp)) == len(dmp)
+    # A later export repeating the second half of the log
+    assert overlap_filter.drop_dmp(dmp.iloc[len(dmp) // 2:]).empty
+    assert overlap_filter.dropped_rows["dmp"] == len(dmp) - len(dmp) // 2
+
+def test_ecf_of_a_fully_overlapping_report_is_dropped(reports):
+    overlap_filter = OverlapFilter()
+    overlap_filter.drop_ecl(reports["Error 1.csv"][0])
+    ecl, ecf = reports["Error 2.csv"]
+    kept = overlap_filter.drop_ecl(ecl)
+    assert overlap_filter.adjust_ecf(ecf, kept, len(ecl)).empty
+    assert overlap_filter.adjusted_ecf == {"dropped": 1, "rebuilt": 0}
+
+def test_ecf_of_a_partly_overlapping_report_is_rebuilt(reports):
+    ecl, ecf = reports["Error 1.csv"]
+    kept = ecl.iloc[:50]
+    rebuilt = OverlapFilter().adjust_ecf(ecf, kept, len(ecl))
+    assert list(rebuilt.columns) == list(ecf.columns)
+    counts = rebuilt.set_index("Code(hex)")["Frequency"].astype(int)
+    assert counts.to_dict() == kept.groupby("Code(hex)").size().to_dict()
+    descriptions = ecf.set_index("Code(hex)")["Description"]
+    assert (rebuilt.set_index("Code(hex)")["Description"] == descriptions.reindex(counts.index)).all()
+
+def test_ecf_of_a_report_without_overlap_is_kept(reports):
+    ecl, ecf = reports["report.csv"]
+    assert OverlapFilter().adjust_ecf(ecf, ecl, len(ecl)) is ecf
+
+def test_ecf_counts_match_the_deduplicated_events(sample_folder):
+    data_handler = DataHandler(sample_folder, show_progress=False)
+    ecf_counts = pd.to_numeric(data_handler.ecf["Frequency"]).groupby(data_handler.ecf["Code(hex)"]).sum()
+    ecl_counts = data_handler.ecl.groupby("Code(hex)", observed=True).size()
+    assert ecf_counts.sort_index().to_dict() == ecl_counts.sort_index().to_dict()
@@ -0,0 +1,76 @@
+import pandas as pd
+import pytest
+from backend.data_handler import DataHandler
+
+pytest.importorskip("pyarrow")
+
+@pytest.fixture
+def ingested(sample_folder):
+    return DataHandler(sample_folder, show_progress=False)
+
+@pytest.fixture
+def dataset(tmp_path, ingested):
+    path = str(tmp_path / "unit_42")
+    ingested.export_dataset(path)
+    return path
+
+def rows(df):
+    """Rows in a canonical order (partitions are read back grouped by date and file)."""
+    return df.astype({column: str for column in df.columns}).sort_values(list(df.columns)).reset_index(drop=True)
+
+@pytest.mark.parametrize("name", ["ecl", "ecf", "dmp"])
+def test_round_trip(dataset, ingested, name):
+    loaded = getattr(DataHandler.load_dataset(dataset), name)
+    expected = getattr(ingested, name)
+    assert list(loaded.columns) == list(expected.columns)
+    assert loaded.dtypes.to_dict() == expected.dtypes.to_dict()
+    pd.testing.assert_frame_equal(rows(loaded), rows(expected), check_names=False)
+
+def test_summaries_match_the_ingested_dataset(dataset, ingested):
+    loaded = DataHandler.load_dataset(dataset)
+    pd.testing.assert_frame_equal(loaded.ecl_freq_summary, ingested.ecl_freq_summary, check_dtype=False)
+    assert loaded.dmp_freq_summary.to_dict() == ingested.dmp_freq_summary.to_dict()
+    pd.testing.assert_frame_equal(loaded.valve_activation_summary, ingested.valve_activation_summary)
+
+def test_frames_load_lazily(dataset):
+    loaded = DataHandler.load_dataset(dataset)
+    assert "ecl" not in vars(loaded) and "dmp" not in vars(loaded)
+    assert not loaded.dmp_freq_summary.empty
+    # Stored summaries are read without loading the frames
+    assert "dmp" not in vars(loaded)
+    assert len(loaded.ecl) == 147
+    assert "ecl" in vars(loaded) and "dmp" not in vars(loaded)
+
+def test_column_projection(dataset):
+    loaded = DataHandler.load_dataset(dataset, columns={"ecl": ["Code(hex)", "Description", "Source File"]})
+    assert list(loaded.ecl.columns) == ["Code(hex)", "Description", "Source File"]
+    assert loaded.ecl["Source File"].dtype == "category"
+    assert "REF_SPEED" in loaded.dmp.columns
+
+def test_partition_filters(dataset, ingested):
+    by_source = DataHandler.load_dataset(dataset, filters=[("Source File", "==", "report.csv")])
+    assert len(by_source.ecl) == (ingested.ecl["Source File"] == "report.csv").sum()
+    assert len(by_source.ecf) == (ingested.ecf["Source File"] == "report.csv").sum()
+    assert by_source.dmp.empty
+    # Summaries are recomputed from the filtered rows
+    assert by_source.ecl_freq_summary["Frequency"].sum() == len(by_source.ecl)
+
+    by_date = DataHandler.load_dataset(dataset, filters=[("date", ">=", "2024-10-07")])
+    assert set(by_date.dmp["Source File"]) == {"log0060_2024-10-07 01-10-17.csv"}
+    assert "date" not in by_date.dmp.columns
+
+def test_queries_on_a_loaded_dataset_match_the_ingested_one(dataset, ingested):
+    def frequency(dh):
+        result = dh.query("ecl").description("AXLE3_LOCK").group_by("Source File").count().sort("Source File").collect()
+        # Pushed-down scans only see the matching files, so compare labels rather than category sets
+        return result.astype({"Source File": str})
+    pd.testing.assert_frame_equal(frequency(DataHandler.load_dataset(dataset)), frequency(ingested))
+
+def test_export_and_load_errors(tmp_path, ingested):
+    (tmp_path / "other").mkdir()
+    (tmp_path / "other" / "notes.txt").write_text("keep me")
+    with pytest.raises(FileExistsError):
+        ingested.export_dataset(str(tmp_path / "other"))
+    assert (tmp_path / "other" / "notes.txt").exists()
+    with pytest.raises(FileNotFoundError):
+        DataHandler.load_dataset(str(tmp_path / "missing"))
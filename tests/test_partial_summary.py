@@ -0,0 +1,90 @@
+import itertools
+import shutil
+import pandas as pd
+import pytest
+from backend.batch_processor import BatchProcessor
+from backend.data_handler import DataHandler
+from backend.data_processors.dmp_processor import DMPProcessor
+from backend.partial_summary import PartialSummary
+
+FILES = ["Error 1.csv", "report.csv", "log0058_2024-10-06 22-41-51.csv",
+         "log0059_2024-10-06 22-48-25.csv", "log0060_2024-10-07 01-10-17.csv"]
+
+@pytest.fixture
+def data_handler(tmp_path, sample_file):
+    # No overlapping listings: per-file partials then add up to the whole dataset
+    for name in FILES:
+        shutil.copy(sample_file(name), tmp_path / name)
+    return DataHandler(str(tmp_path), show_progress=False)
+
+@pytest.fixture
+def per_file(data_handler):
+    def rows(frame, name):
+        return frame[frame[DataHandler.SOURCE_COLUMN] == name] if not frame.empty else None
+    return [
+        PartialSummary.from_frames(rows(data_handler.ecl, name), rows(data_handler.ecf, name), rows(data_handler.dmp, name))
+        for name in FILES
+    ]
+
+def assert_same_summary(left, right):
+    pd.testing.assert_frame_equal(left.ecl_frequency(), right.ecl_frequency())
+    pd.testing.assert_frame_equal(left.ecf_frequency(), right.ecf_frequency())
+    pd.testing.assert_series_equal(left.dmp_frequency(), right.dmp_frequency())
+    pd.testing.assert_series_equal(left.diagnostic_frequency().sort_index(), right.diagnostic_frequency().sort_index())
+    pd.testing.assert_frame_equal(left.activation_summary(), right.activation_summary())
+    pd.testing.assert_frame_equal(left.channel_statistics(), right.channel_statistics(), check_exact=False, rtol=1e-9)
+    assert left.rows == right.rows
+    assert left.logged_seconds == pytest.approx(right.logged_seconds)
+    assert (left.ecl_start, left.ecl_end) == (right.ecl_start, right.ecl_end)
+
+def test_merging_is_order_independent(per_file):
+    reference = PartialSummary.combine(per_file)
+    for order in itertools.islice(itertools.permutations(per_file), 1, None, 17):
+        assert_same_summary(PartialSummary.combine(order), reference)
+    nested = PartialSummary.combine([
+        PartialSummary.combine(per_file[3:]), PartialSummary.combine([per_file[1], None, per_file[0]]), per_file[2],
+    ])
+    assert_same_summary(nested, reference)
+
+def test_per_file_partials_add_up_to_the_dataset(data_handler, per_file):
+    combined = PartialSummary.combine(per_file)
+    whole = PartialSummary.from_handler(data_handler)
+    assert_same_summary(combined, whole)
+    assert combined.parts == len(FILES)
+    pd.testing.assert_frame_equal(
+        combined.ecl_frequency().reset_index(drop=True), data_handler.ecl_freq_summary.reset_index(drop=True),
+        check_dtype=False,
+    )
+    assert combined.dmp_frequency().to_dict() == data_handler.dmp_freq_summary.astype(int).to_dict()
+
+def test_channel_statistics_match_the_rows(data_handler, per_file):
+    stats = PartialSummary.combine(per_file).channel_statistics().set_index("Channel")
+    speed = data_handler.dmp["REF_SPEED"]
+    assert stats.loc["REF_SPEED", "Count"] == len(speed)
+    assert stats.loc["REF_SPEED", "Mean"] == pytest.approx(speed.mean(), abs=1e-3)
+    assert stats.loc["REF_SPEED", "Std"] == pytest.approx(speed.std(), abs=1e-3)
+    assert stats.loc["REF_SPEED", "P95"] == pytest.approx(speed.quantile(0.95), rel=0.02)
+
+def test_empty_summary_is_the_identity(per_file):
+    partial = per_file[0]
+    assert_same_summary(PartialSummary.combine([PartialSummary(), partial, PartialSummary()]), partial)
+
+def test_serialization_round_trip(tmp_path, per_file):
+    combined = PartialSummary.combine(per_file)
+    assert_same_summary(PartialSummary.from_bytes(combined.to_bytes()), combined)
+    path = combined.save(str(tmp_path / "partial_summary.json.gz"))
+    assert_same_summary(PartialSummary.load(path), combined)
+    assert PartialSummary.load(str(tmp_path / "missing.json.gz")) is None
+    with pytest.raises(ValueError):
+        PartialSummary.from_dict(dict(combined.to_dict(), version=0))
+
+def test_fleet_dmp_frequency_is_sorted_by_frequency(tmp_path):
+    dmp = pd.DataFrame(0, index=range(6), columns=DMPProcessor.VALVE_COLUMNS)
+    dmp["Time"] = range(6)
+    dmp["Source File"] = "log.csv"
+    dmp.loc[[1, 3], "VENT_4"] = 1
+    dmp.loc[1, "FILL_2"] = 1
+    BatchProcessor.write_fleet_summaries(PartialSummary.from_frames(dmp=dmp), str(tmp_path), "json")
+    written = pd.read_json(tmp_path / "fleet_dmp_frequency.json")
+    assert written["Frequency"].is_monotonic_decreasing
+    assert written["Column"].tolist()[:2] == ["VENT_4", "FILL_2"]
@@ -0,0 +1,57 @@
+import json
+import numpy as np
+import pytest
+from backend.utils.quantile_sketch import QuantileSketch
+
+QUANTILES = (0.0, 0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95, 0.99, 1.0)
+
+@pytest.fixture
+def values():
+    rng = np.random.default_rng(7)
+    return np.concatenate([rng.lognormal(3, 2, 20000), -rng.lognormal(1, 1, 5000), np.zeros(500)])
+
+@pytest.mark.parametrize("accuracy", [0.01, 0.05])
+def test_quantiles_are_within_the_relative_accuracy(values, accuracy):
+    sketch = QuantileSketch(accuracy).add(values)
+    ordered = np.sort(values)
+    for q in QUANTILES:
+        exact = ordered[int(np.floor(q * (len(values) - 1)))]
+        assert abs(sketch.quantile(q) - exact) <= accuracy * abs(exact) + 1e-12, q
+
+def test_merging_is_independent_of_the_split(values):
+    whole = QuantileSketch().add(values).to_dict()
+    parts = [QuantileSketch().add(part) for part in np.array_split(values, 5)]
+    forward = QuantileSketch()
+    for part in parts:
+        forward.merge(part)
+    backward = QuantileSketch()
+    for part in reversed(parts):
+        backward.merge(part)
+    assert forward.to_dict() == backward.to_dict() == whole
+
+def test_weights_count_repeated_values():
+    weighted = QuantileSketch().add([1.0, 10.0, 100.0], weights=[5, 1, 3])
+    repeated = QuantileSketch().add([1.0] * 5 + [10.0] + [100.0] * 3)
+    assert weighted.to_dict() == repeated.to_dict()
+    assert weighted.count == 9
+
+def test_round_trip_through_json(values):
+    sketch = QuantileSketch(0.02).add(values)
+    restored = QuantileSketch.from_dict(json.loads(json.dumps(sketch.to_dict())))
+    assert restored.count == sketch.count
+    assert restored.quantiles(QUANTILES) == sketch.quantiles(QUANTILES)
+
+def test_nans_are_ignored_and_empty_sketches_return_nan():
+    sketch = QuantileSketch()
+    assert np.isnan(sketch.quantile(0.5))
+    sketch.add([np.nan, 2.0])
+    assert sketch.count == 1
+    assert sketch.quantile(0.5) == pytest.approx(2.0, rel=0.01)
+
+def test_invalid_accuracy_and_mismatched_merge():
+    with pytest.raises(ValueError):
+        QuantileSketch(0)
+    with pytest.raises(ValueError):
+        QuantileSketch(1.5)
+    with pytest.raises(ValueError):
+        QuantileSketch(0.01).merge(QuantileSketch(0.02))
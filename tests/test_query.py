@@ -0,0 +1,34 @@
+import pandas as pd
+import pytest
+from backend.data_handler import DataHandler
+
+@pytest.fixture
+def data_handler(sample_folder):
+    return DataHandler(sample_folder, show_progress=False)
+
+def test_numeric_aggregations_of_text_columns(data_handler):
+    speeds = pd.to_numeric(data_handler.ecl["Speed(km/h)"])
+    result = data_handler.query("ecl").agg(
+        Low=("Speed(km/h)", "min"), High=("Speed(km/h)", "max"), Total=("Speed(km/h)", "sum")
+    ).collect()
+    assert result.iloc[0].to_dict() == {"Low": speeds.min(), "High": speeds.max(), "Total": speeds.sum()}
+
+def test_grouped_max_compares_numbers(data_handler):
+    result = data_handler.query("ecl").group_by("Description").agg(High=("Speed(km/h)", "max")) \
+        .sort("High", ascending=False).collect()
+    expected = pd.to_numeric(data_handler.ecl["Speed(km/h)"]).groupby(data_handler.ecl["Description"]).max()
+    assert result.set_index("Description")["High"].to_dict() == expected.to_dict()
+    assert result["High"].is_monotonic_decreasing
+
+@pytest.mark.parametrize("column", ["Code(hex)", "Ticks(hex)"])
+def test_numeric_aggregations_reject_hex_columns(data_handler, column):
+    with pytest.raises(ValueError, match="non-numeric"):
+        data_handler.query("ecl").agg(High=(column, "max")).collect()
+
+def test_counts_of_text_columns_are_unchanged(data_handler):
+    result = data_handler.query("ecl").agg(Codes=("Code(hex)", "nunique"), Rows=("Code(hex)", "size")).collect()
+    assert result.iloc[0].to_dict() == {"Codes": data_handler.ecl["Code(hex)"].nunique(), "Rows": len(data_handler.ecl)}
+
+def test_numeric_filter_on_text_column(data_handler):
+    result = data_handler.query("ecl").where("Speed(km/h)", ">", 30).select("Speed(km/h)").collect()
+    assert len(result) == (pd.to_numeric(data_handler.ecl["Speed(km/h)"]) > 30).sum()
@@ -0,0 +1,128 @@
+import gzip
+import json
+import threading
+import urllib.request
+from http import HTTPStatus
+import pytest
+from backend.data_handler import DataHandler
+from backend.query_service import QueryService
+
+@pytest.fixture
+def data_handler(sample_folder):
+    return DataHandler(sample_folder, show_progress=False)
+
+@pytest.fixture
+def service(data_handler):
+    service = QueryService()
+    service.add_dataset("unit", data_handler)
+    return service
+
+def get(service, path, query="", **kwargs):
+    status, headers, body = service.handle(path, query, **kwargs)
+    if headers.get("Content-Encoding") == "gzip":
+        body = gzip.decompress(body)
+    return status, headers, json.loads(body) if body else None
+
+def test_dataset_routes(service, data_handler):
+    status, _, listing = get(service, "/datasets")
+    assert status == HTTPStatus.OK
+    assert [dataset["name"] for dataset in listing["datasets"]] == ["unit"]
+    _, _, info = get(service, "/datasets/unit")
+    assert info["rows"] == {"ecl": len(data_handler.ecl), "ecf": len(data_handler.ecf), "dmp": len(data_handler.dmp)}
+    assert info["files"] == len(data_handler.stats.files)
+    _, _, summary = get(service, "/datasets/unit/summary/ecl")
+    assert summary["total"] == len(data_handler.ecl_freq_summary)
+    assert summary["rows"][0]["Frequency"] == data_handler.ecl_freq_summary["Frequency"].iloc[0]
+    _, _, valves = get(service, "/datasets/unit/summary/dmp")
+    assert valves["columns"] == ["Name", "Value"]
+
+def test_event_filters_and_paging(service, data_handler):
+    _, _, page = get(service, "/datasets/unit/ecl", "description=AXLE3_LOCK&columns=Code(hex),Source File&offset=1&limit=2")
+    expected = data_handler.query("ecl").description("AXLE3_LOCK").collect()
+    assert page["total"] == len(expected)
+    assert (page["offset"], page["limit"], len(page["rows"])) == (1, 2, 2)
+    assert page["columns"] == ["Code(hex)", "Source File"]
+    _, _, capped = get(service, "/datasets/unit/ecl", f"limit={QueryService.MAX_PAGE_SIZE + 1}")
+    assert capped["limit"] == QueryService.MAX_PAGE_SIZE and len(capped["rows"]) == len(data_handler.ecl)
+    _, _, past_end = get(service, "/datasets/unit/ecf", "offset=1000")
+    assert past_end["rows"] == [] and past_end["total"] == len(data_handler.ecf)
+
+def test_dmp_time_slice(service, data_handler):
+    _, _, page = get(service, "/datasets/unit/dmp", "start=0&end=1&columns=FILL_1")
+    assert page["total"] > 0
+    assert "FILL_1" in page["columns"] and "FILL_2" not in page["columns"]
+    assert all(0 <= row["Timeline (s)"] <= 1 for row in page["rows"])
+
+def test_if_none_match_returns_304(service):
+    status, headers, _ = service.handle("/datasets/unit/summary/ecl")
+    status, revalidated, body = service.handle("/datasets/unit/summary/ecl", if_none_match=f'W/{headers["ETag"]}')
+    assert status == HTTPStatus.NOT_MODIFIED and body == b""
+    assert revalidated["ETag"] == headers["ETag"]
+    assert service.handle("/datasets/unit/summary/ecl", if_none_match='"other"')[0] == HTTPStatus.OK
+    assert service.stats()["not_modified"] == 1 and service.stats()["hits"] == 2
+
+def test_gzip_is_a_separate_representation(service):
+    _, plain, body = service.handle("/datasets/unit/ecl")
+    _, zipped, compressed = service.handle("/datasets/unit/ecl", accept_gzip=True)
+    assert len(body) >= QueryService.GZIP_MIN_BYTES
+    assert zipped["Content-Encoding"] == "gzip" and gzip.decompress(compressed) == body
+    assert zipped["ETag"] == plain["ETag"][:-1] + '-gz"'
+    assert service.handle("/datasets/unit/ecl", if_none_match=plain["ETag"], accept_gzip=True)[0] == HTTPStatus.OK
+    small = service.handle("/datasets/unit", accept_gzip=True)[1]
+    assert "Content-Encoding" not in small and not small["ETag"].endswith('-gz"')
+
+def test_add_dataset_invalidates_cached_responses(service, sample_file, tmp_path):
+    _, before, _ = service.handle("/datasets/unit")
+    _, listing, _ = service.handle("/datasets")
+    (tmp_path / "report.csv").write_bytes(open(sample_file("report.csv"), "rb").read())
+    service.add_dataset("unit", DataHandler(str(tmp_path), show_progress=False))
+    _, after, body = service.handle("/datasets/unit")
+    assert after["ETag"] != before["ETag"]
+    assert json.loads(body)["version"] == 2
+    assert service.handle("/datasets")[1]["ETag"] != listing["ETag"]
+    service.remove_dataset("unit")
+    assert service.handle("/datasets/unit")[0] == HTTPStatus.NOT_FOUND
+
+@pytest.mark.parametrize("path, query, status, message", [
+    ("/nowhere", "", HTTPStatus.NOT_FOUND, "Unknown path: /nowhere"),
+    ("/datasets/other", "", HTTPStatus.NOT_FOUND, "Unknown dataset: other"),
+    ("/datasets/unit/summary/bogus", "", HTTPStatus.NOT_FOUND, "Unknown summary: bogus"),
+    ("/datasets/unit/ecl", "limit=ten", HTTPStatus.BAD_REQUEST, "Parameter 'limit' must be a number"),
+    ("/datasets/unit/ecl", "offset=-1", HTTPStatus.BAD_REQUEST, "must not be negative"),
+    ("/datasets/unit/ecl", "columns=Nope", HTTPStatus.BAD_REQUEST, "Unknown ECL column(s): Nope"),
+    ("/datasets/unit/ecl", "from=yesterday", HTTPStatus.BAD_REQUEST, "must be dates"),
+    ("/datasets/unit/dmp", "where=NOPE>1", HTTPStatus.BAD_REQUEST, ""),
+])
+def test_error_bodies(service, path, query, status, message):
+    code, headers, body = get(service, path, query)
+    assert code == status
+    assert body["status"] == int(status) and message in body["error"]
+    assert headers["Cache-Control"] == "no-store"
+    assert service.stats()["errors"] == 1
+
+def test_unexpected_errors_return_500(service, data_handler, monkeypatch):
+    def broken(frame):
+        raise RuntimeError("boom")
+    monkeypatch.setattr(data_handler, "query", broken)
+    code, _, body = get(service, "/datasets/unit/ecl")
+    assert code == HTTPStatus.INTERNAL_SERVER_ERROR
+    assert body == {"error": "Internal error: RuntimeError", "status": 500}
+    assert get(service, "/datasets/unit")[0] == HTTPStatus.OK
+
+def test_head_matches_get_over_http(service):
+    server = service.make_server(port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/datasets/unit/ecl"
+        responses = {}
+        for method in ("GET", "HEAD"):
+            request = urllib.request.Request(url, method=method, headers={"Accept-Encoding": "gzip"})
+            with urllib.request.urlopen(request) as response:
+                responses[method] = (response.headers["ETag"], response.headers["Content-Encoding"],
+                                     response.headers["Content-Length"], response.read())
+        assert responses["HEAD"][:3] == responses["GET"][:3]
+        assert responses["GET"][1] == "gzip" and responses["HEAD"][3] == b""
+    finally:
+        server.shutdown()
+        server.server_close()
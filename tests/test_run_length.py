@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+from backend.data_handler import DataHandler
+from backend.data_processors.dmp_processor import DMPProcessor
+from backend.utils.run_length import RunLength
+
+def test_intervals_of_every_channel():
+    active = np.array([
+        [1, 0],
+        [1, 1],
+        [0, 1],
+        [1, 1],
+        [1, 0],
+    ], dtype=bool)
+    channel, start, end = RunLength.intervals(active)
+    assert list(zip(channel, start, end)) == [(0, 0, 1), (0, 3, 4), (1, 1, 3)]
+
+def test_intervals_of_one_channel_and_no_rows():
+    assert [list(a) for a in RunLength.intervals(np.array([0, 1, 1, 0, 1]))] == [[0, 0], [1, 4], [2, 4]]
+    assert all(len(a) == 0 for a in RunLength.intervals(np.zeros((0, 3))))
+
+def test_runs_split_at_file_and_clock_restart_boundaries():
+    time = np.array([0.0, 0.1, 0.2, 0.0, 0.1, 0.2, 0.3])
+    sources = np.array([0, 0, 0, 0, 0, 1, 1])
+    boundary = RunLength.boundaries(time, sources)
+    assert boundary.tolist() == [True, False, False, True, False, True, False]
+    channel, start, end = RunLength.intervals(np.ones(7, dtype=bool), boundary)
+    assert list(zip(start, end)) == [(0, 2), (3, 4), (5, 6)]
+
+def test_reduce_and_durations():
+    values = np.array([[1.0, 5.0], [3.0, 2.0], [2.0, 7.0]])
+    channel, start, end = np.array([0, 1, 1]), np.array([0, 0, 2]), np.array([1, 1, 2])
+    assert RunLength.reduce(values, channel, start, end, np.maximum).tolist() == [3.0, 5.0, 7.0]
+    assert RunLength.reduce(values, channel, start, end, np.add).tolist() == [4.0, 7.0, 7.0]
+    time = np.array([0.0, 0.5, 1.0])
+    assert RunLength.durations(time, start, end).tolist() == [1.0, 1.0, 0.5]
+
+def test_covered_time_sums_segments():
+    time = np.array([0.0, 1.0, 2.0, 0.0, 1.0])
+    assert RunLength.covered_time(time, RunLength.boundaries(time)) == 5.0
+    assert RunLength.covered_time(np.array([]), np.array([], dtype=bool)) == 0.0
+
+def test_valve_activation_summary():
+    df = pd.DataFrame(0, index=range(10), columns=DMPProcessor.VALVE_COLUMNS)
+    df["Time"] = np.arange(10, dtype=float)
+    df.loc[1:2, "FILL_1"] = 1
+    df.loc[5:8, "FILL_1"] = 1
+    df.loc[3, "VENT_2"] = 1
+    intervals = DMPProcessor.get_activation_intervals(df)
+    assert intervals[["Channel", "Start Row", "End Row", "Duration (s)"]].astype({"Channel": str}).values.tolist() == [
+        ["FILL_1", 1, 2, 2.0], ["FILL_1", 5, 8, 4.0], ["VENT_2", 3, 3, 1.0],
+    ]
+    summary = DMPProcessor.get_activation_summary(df, intervals=intervals).set_index("Channel")
+    assert summary.loc["FILL_1", ["Activations", "On Time (s)", "Max Duration (s)", "Duty Cycle (%)"]].tolist() == [
+        2, 6.0, 4.0, 60.0,
+    ]
+    assert list(summary.index) == ["FILL_1", "VENT_2"]
+
+def test_sample_logs_match_the_sample_counts(sample_folder):
+    data_handler = DataHandler(sample_folder, show_progress=False)
+    intervals = data_handler.valve_activations
+    on_samples = (intervals["End Row"] - intervals["Start Row"] + 1).groupby(intervals["Channel"], observed=True).sum()
+    expected = (data_handler.dmp[DMPProcessor.VALVE_COLUMNS] != 0).sum()
+    assert on_samples.to_dict() == expected[expected > 0].to_dict()
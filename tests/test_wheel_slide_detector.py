@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backend.data_handler import DataHandler
+from backend.data_processors.wheel_slide_detector import WheelSlideDetector
+
+def speed_log(rows=100, period=0.1, ref_speed=100.0):
+    """DMP speed channels of a train running steadily, sampled every `period` seconds."""
+    df = pd.DataFrame({"Time": np.round(np.arange(rows) * period, 3), "MOD_TICK": np.arange(rows) * 10,
+                       "REF_SPEED": ref_speed})
+    for axle in range(1, 5):
+        df[f"SPEED_{axle}"] = ref_speed
+        df[f"ACC_{axle}"] = 0.0
+    return df
+
+def test_slide_and_lock_are_detected_per_axle():
+    df = speed_log()
+    df.loc[10:19, "SPEED_2"] = 70.0   # 30% slip for 1 s
+    df.loc[30:39, "SPEED_4"] = 0.0    # wheel stopped for 1 s
+    events = WheelSlideDetector.detect(df)
+    assert events["Description"].tolist() == ["AXLE2_SLIDE", "AXLE4_LOCK"]
+    assert events["Start MOD_TICK"].tolist() == [100, 300]
+    assert events["Duration (s)"].tolist() == [1.0, 1.0]
+    assert events["Max Slip"].tolist() == [0.3, 1.0]
+    assert events["Min Wheel Speed"].tolist() == [70.0, 0.0]
+
+def test_short_slides_and_slow_running_are_ignored():
+    df = speed_log()
+    df.loc[10:11, "SPEED_1"] = 50.0   # 0.2 s, shorter than min_duration
+    df.loc[50:70, "REF_SPEED"] = 20.0
+    df.loc[50:70, "SPEED_3"] = 0.0    # below min_speed
+    assert WheelSlideDetector.detect(df).empty
+    assert len(WheelSlideDetector.detect(df, min_duration=0.2)) == 1
+
+def test_hard_deceleration_counts_as_sliding_but_glitches_do_not():
+    df = speed_log()
+    df.loc[20:29, "ACC_1"] = -80.0
+    df.loc[60:69, "ACC_2"] = -5000.0  # above max_abs_acc
+    events = WheelSlideDetector.detect(df)
+    assert events["Description"].tolist() == ["AXLE1_SLIDE"]
+    assert events["Max Decel"].tolist() == [80.0]
+
+def test_slides_do_not_span_files():
+    df = pd.concat([speed_log(20), speed_log(20)], ignore_index=True)
+    df["Source File"] = ["a.csv"] * 20 + ["b.csv"] * 20
+    df.loc[16:23, "SPEED_1"] = 0.0    # 0.4 s at the end of a, 0.4 s at the start of b
+    events = WheelSlideDetector.detect(df, source_column="Source File")
+    assert events["Source File"].tolist() == ["a.csv", "b.csv"]
+    assert events["Duration (s)"].tolist() == [0.4, 0.4]
+
+def test_controller_flag_is_reported():
+    df = speed_log()
+    df["SD_TR_SLIDE"] = 0
+    df.loc[10:19, "SPEED_1"] = 0.0
+    df.loc[30:39, "SPEED_2"] = 0.0
+    df.loc[15, "SD_TR_SLIDE"] = 1
+    assert WheelSlideDetector.detect(df)["Controller Slide"].tolist() == [True, False]
+
+def test_summarize():
+    df = speed_log()
+    df.loc[10:19, "SPEED_1"] = 0.0
+    df.loc[40:44, "SPEED_1"] = 0.0
+    df.loc[60:64, "SPEED_3"] = 70.0
+    summary = WheelSlideDetector.summarize(WheelSlideDetector.detect(df))
+    assert summary.to_dict("list") == {
+        "Description": ["AXLE1_LOCK", "AXLE3_SLIDE"], "Frequency": [2, 1], "Total Duration (s)": [1.5, 0.5],
+    }
+
+def test_missing_columns_and_unknown_thresholds():
+    assert WheelSlideDetector.detect(speed_log().drop(columns="ACC_3")).empty
+    assert list(WheelSlideDetector.detect(pd.DataFrame()).columns) == WheelSlideDetector.EVENT_COLUMNS
+    with pytest.raises(ValueError, match="slip"):
+        WheelSlideDetector.detect(speed_log(), slip=0.2)
+
+def test_sample_logs(sample_folder):
+    events = DataHandler(sample_folder, show_progress=False).detect_wheel_slide()
+    assert list(events.columns) == WheelSlideDetector.EVENT_COLUMNS
+    assert (events["Duration (s)"] >= WheelSlideDetector.DEFAULTS["min_duration"]).all()